@@ -0,0 +1,123 @@
+import numpy as np
+
+# Nombre d'or : réduction de l'intervalle à chaque itération de la recherche des extrema
+_GOLDEN = (np.sqrt(5) - 1) / 2
+
+
+def refine_profile(function, start, stop, tolerance=1e-3, initial_samples=33, initial_points=None, max_depth=20):
+    """
+    Échantillonne adaptativement une fonction 1D : les intervalles sont subdivisés tant que la
+    valeur au milieu s'écarte de l'interpolation linéaire de plus de la tolérance.
+
+    Chaque niveau de subdivision est évalué en un seul appel vectorisé. L'échantillonnage initial
+    doit résoudre les structures les plus larges ; initial_points permet d'y ajouter des points
+    connus (par exemple les maxima principaux étroits d'un réseau).
+
+    :param function: Fonction vectorisée x -> f(x).
+    :param start: Début de l'intervalle.
+    :param stop: Fin de l'intervalle.
+    :param tolerance: Erreur d'interpolation linéaire tolérée.
+    :param initial_samples: Nombre d'échantillons uniformes initiaux.
+    :param initial_points: Points supplémentaires évalués dès le départ (optionnel).
+    :param max_depth: Nombre maximal de subdivisions d'un intervalle.
+    :return: Tuple (positions triées, valeurs, nombre d'évaluations).
+    """
+    positions = np.linspace(start, stop, initial_samples)
+    if initial_points is not None:
+        extra = np.asarray(initial_points, dtype=np.float64)
+        positions = np.union1d(positions, extra[(extra > start) & (extra < stop)])
+    values = function(positions)
+    samples_x = [positions]
+    samples_y = [values]
+    evaluations = len(positions)
+
+    left, right = positions[:-1], positions[1:]
+    left_values, right_values = values[:-1], values[1:]
+    for _ in range(max_depth):
+        if len(left) == 0:
+            break
+        middle = (left + right) / 2
+        middle_values = function(middle)
+        evaluations += len(middle)
+        samples_x.append(middle)
+        samples_y.append(middle_values)
+
+        # Les intervalles dont le milieu est mal prédit sont coupés en deux
+        refine = np.abs(middle_values - (left_values + right_values) / 2) > tolerance
+        left = np.concatenate([left[refine], middle[refine]])
+        right = np.concatenate([middle[refine], right[refine]])
+        left_values, right_values = (
+            np.concatenate([left_values[refine], middle_values[refine]]),
+            np.concatenate([middle_values[refine], right_values[refine]]),
+        )
+
+    positions = np.concatenate(samples_x)
+    order = np.argsort(positions)
+    return positions[order], np.concatenate(samples_y)[order], evaluations
+
+
+def locate_extrema(function, positions, values, position_tolerance):
+    """
+    Localise précisément les minima et maxima locaux d'une fonction à partir d'un échantillonnage.
+
+    Chaque extremum échantillonné est encadré par ses voisins puis affiné par recherche du nombre
+    d'or, toutes les recherches étant menées ensemble (une évaluation vectorisée par itération).
+
+    :param function: Fonction vectorisée x -> f(x).
+    :param positions: Positions échantillonnées, triées.
+    :param values: Valeurs aux positions échantillonnées.
+    :param position_tolerance: Précision souhaitée sur la position des extrema.
+    :return: Tuple ((positions, valeurs) des minima, (positions, valeurs) des maxima, nombre d'évaluations).
+    """
+    interior = np.arange(1, len(values) - 1)
+    previous, current, following = values[interior - 1], values[interior], values[interior + 1]
+    minima = interior[(current <= previous) & (current < following)]
+    maxima = interior[(current >= previous) & (current > following)]
+
+    evaluations = 0
+    results = []
+    for indices, sign in ((minima, 1.0), (maxima, -1.0)):
+        lower, upper = positions[indices - 1], positions[indices + 1]
+        inner_left = upper - _GOLDEN * (upper - lower)
+        inner_right = lower + _GOLDEN * (upper - lower)
+        value_left = sign * function(inner_left)
+        value_right = sign * function(inner_right)
+        evaluations += 2 * len(indices)
+
+        while len(indices) and np.max(upper - lower) > position_tolerance:
+            # On garde le côté du plus petit des deux points intérieurs ; un seul nouveau point par intervalle
+            keep_left = value_left < value_right
+            upper = np.where(keep_left, inner_right, upper)
+            lower = np.where(keep_left, lower, inner_left)
+            new_point = np.where(keep_left, upper - _GOLDEN * (upper - lower), lower + _GOLDEN * (upper - lower))
+            new_value = sign * function(new_point)
+            evaluations += len(indices)
+            inner_left, inner_right, value_left, value_right = (
+                np.where(keep_left, new_point, inner_right),
+                np.where(keep_left, inner_left, new_point),
+                np.where(keep_left, new_value, value_right),
+                np.where(keep_left, value_left, new_value),
+            )
+
+        location = np.where(value_left < value_right, inner_left, inner_right)
+        results.append((location, sign * np.minimum(value_left, value_right)))
+    return results[0], results[1], evaluations
+
+
+def render_profile(positions, values, grid):
+    """
+    Interpole un échantillonnage non uniforme sur une grille régulière (pour l'affichage).
+
+    :param positions: Positions échantillonnées, triées.
+    :param values: Valeurs aux positions échantillonnées.
+    :param grid: Positions de la grille d'affichage.
+    :return: Valeurs interpolées linéairement sur la grille.
+    """
+    return np.interp(grid, positions, values)
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     function = lambda x: np.sinc(x) ** 2
+#     positions, values, evaluations = refine_profile(function, -10, 10, tolerance=1e-4)
+#     (minima, _), (maxima, _), _ = locate_extrema(function, positions, values, position_tolerance=1e-9)
+#     print("Évaluations:", evaluations, "Premiers zéros:", minima[:3])
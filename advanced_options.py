@@ -10,22 +10,26 @@ class AdvancedOptions:
         self.multi_slit_enabled = False
         self.slit_spacing = 0.001  # Distance entre les fentes (en mètres)
         self.num_slits = 2
+        self.slit_width = 0.0002  # Largeur de chaque fente (en mètres)
         self.coherence_enabled = False
         self.phase_shift = 0.0  # Déphasage initial (en radians)
 
-    def enable_multi_slit(self, enabled, slit_spacing=None, num_slits=None):
+    def enable_multi_slit(self, enabled, slit_spacing=None, num_slits=None, slit_width=None):
         """
         Active ou désactive la diffraction multiple et configure ses paramètres.
 
         :param enabled: Booléen pour activer/désactiver la diffraction multiple.
         :param slit_spacing: Distance entre les fentes (en mètres).
         :param num_slits: Nombre de fentes.
+        :param slit_width: Largeur de chaque fente (en mètres).
         """
         self.multi_slit_enabled = enabled
         if slit_spacing is not None:
             self.slit_spacing = slit_spacing
         if num_slits is not None:
             self.num_slits = num_slits
+        if slit_width is not None:
+            self.slit_width = slit_width
 
     def enable_coherence(self, enabled):
         """
@@ -53,10 +57,22 @@ class AdvancedOptions:
             "multi_slit_enabled": self.multi_slit_enabled,
             "slit_spacing": self.slit_spacing,
             "num_slits": self.num_slits,
+            "slit_width": self.slit_width,
             "coherence_enabled": self.coherence_enabled,
             "phase_shift": self.phase_shift,
         }
 
+    def apply_settings(self, settings):
+        """
+        Applique des paramètres avancés au format retourné par get_advanced_settings.
+
+        :param settings: Dictionnaire (partiel ou complet) des options avancées.
+        """
+        for key, value in settings.items():
+            if key not in self.get_advanced_settings():
+                raise ValueError(f"Option avancée inconnue : {key}.")
+            setattr(self, key, value)
+
 # Exemple d'utilisation
 # if __name__ == "__main__":
 #     options = AdvancedOptions()
@@ -0,0 +1,212 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Pic de mémoire de accumulate_intensity par point de grille et par longueur d'onde d'un bloc (en octets) :
+# fonction de transfert (16), produit par le spectre (16), sortie de la FFT inverse (16) et copie de travail
+# de la FFT (16) ; la construction de la fonction de transfert (49) et le calcul de |E|² (16) restent en deçà
+BYTES_PER_SAMPLE = 64
+
+
+class TransferFunctionCache:
+    """
+    Cache LRU borné en mémoire des fonctions de transfert H(fx, fy; λ, z) du spectre angulaire.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        Initialise une instance de la classe TransferFunctionCache.
+
+        :param max_bytes: Mémoire maximale occupée par les tableaux mis en cache (en octets).
+        """
+        if max_bytes <= 0:
+            raise ValueError("La capacité du cache doit être positive.")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Retourne le tableau associé à la clé, ou None s'il n'est pas en cache.
+
+        :param key: Clé (forme de la grille, pas, longueur d'onde, distance).
+        :return: Tableau mis en cache ou None.
+        """
+        array = self._entries.get(key)
+        if array is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return array
+
+    def put(self, key, array):
+        """
+        Ajoute un tableau au cache en évinçant les entrées les moins récemment utilisées si nécessaire.
+
+        :param key: Clé (forme de la grille, pas, longueur d'onde, distance).
+        :param array: Tableau à mettre en cache.
+        """
+        if array.nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key).nbytes
+
+        while self._entries and self.current_bytes + array.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+        self._entries[key] = array
+        self.current_bytes += array.nbytes
+
+    def clear(self):
+        """
+        Vide le cache et remet les compteurs à zéro.
+        """
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Retourne les statistiques d'utilisation du cache.
+
+        :return: Dictionnaire (hits, misses, entries, current_bytes, max_bytes).
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Cache partagé par tous les propagateurs, conservé entre deux simulations
+transfer_function_cache = TransferFunctionCache()
+
+
+class AngularSpectrumPropagator:
+    """
+    Propage un champ complexe en champ proche par la méthode du spectre angulaire.
+    """
+
+    def __init__(self, cache=None):
+        """
+        Initialise une instance de la classe AngularSpectrumPropagator.
+
+        :param cache: Instance de TransferFunctionCache (par défaut, le cache partagé du module).
+        """
+        self.cache = cache if cache is not None else transfer_function_cache
+
+    def transfer_function(self, shape, pitch, wavelength, distance):
+        """
+        Retourne la fonction de transfert H(fx, fy) pour la grille et la propagation données.
+
+        Les ondes évanescentes (fx² + fy² > 1/λ²) sont supprimées.
+
+        :param shape: Forme (lignes, colonnes) de la grille.
+        :param pitch: Pas d'échantillonnage (en mètres).
+        :param wavelength: Longueur d'onde (en mètres).
+        :param distance: Distance de propagation (en mètres).
+        :return: Tableau complexe en lecture seule, dans l'ordre des fréquences de la FFT.
+        """
+        key = (tuple(shape), pitch, wavelength, distance)
+        transfer = self.cache.get(key)
+        if transfer is None:
+            transfer = self._build_transfer(shape, pitch, np.float64(wavelength), distance)
+            self.cache.put(key, transfer)
+        return transfer
+
+    def transfer_functions(self, shape, pitch, wavelengths, distance, cache=True):
+        """
+        Retourne la pile des fonctions de transfert pour un bloc de longueurs d'onde, calculée en une seule opération.
+
+        :param shape: Forme (lignes, colonnes) de la grille.
+        :param pitch: Pas d'échantillonnage (en mètres).
+        :param wavelengths: Tableau des K longueurs d'onde du bloc (en mètres).
+        :param distance: Distance de propagation (en mètres).
+        :param cache: Conserve la pile dans le cache (sinon, elle est libérée après usage).
+        :return: Tableau complexe (K, lignes, colonnes) en lecture seule.
+        """
+        wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        key = (tuple(shape), pitch, tuple(wavelengths.tolist()), distance)
+        transfer = self.cache.get(key) if cache else None
+        if transfer is None:
+            transfer = self._build_transfer(shape, pitch, wavelengths[:, None, None], distance)
+            if cache:
+                self.cache.put(key, transfer)
+        return transfer
+
+    @staticmethod
+    def _build_transfer(shape, pitch, wavelength, distance):
+        """
+        Construit H = exp(i 2π z √(1/λ² - fx² - fy²)), nul pour les ondes évanescentes.
+        """
+        fy = np.fft.fftfreq(shape[0], d=pitch)
+        fx = np.fft.fftfreq(shape[1], d=pitch)
+        argument = 1.0 / wavelength ** 2 - fy[:, None] ** 2 - fx[None, :] ** 2
+        propagating = argument > 0
+        kz = 2 * np.pi * np.sqrt(np.where(propagating, argument, 0.0))
+        transfer = np.where(propagating, np.exp(1j * kz * distance), 0.0)
+        transfer.setflags(write=False)
+        return transfer
+
+    def propagate(self, field, pitch, wavelength, distance):
+        """
+        Propage un champ complexe sur une distance donnée.
+
+        :param field: Tableau 2D du champ complexe dans le plan de départ.
+        :param pitch: Pas d'échantillonnage (en mètres).
+        :param wavelength: Longueur d'onde (en mètres).
+        :param distance: Distance de propagation (en mètres).
+        :return: Tableau 2D du champ complexe dans le plan d'arrivée.
+        """
+        spectrum = np.fft.fft2(field)
+        spectrum *= self.transfer_function(field.shape, pitch, wavelength, distance)
+        return np.fft.ifft2(spectrum)
+
+    def accumulate_intensity(self, intensity, field, pitch, wavelengths, weights, distance, chunk_length=None):
+        """
+        Ajoute à intensity (sur place) la somme pondérée des intensités du champ propagé à plusieurs longueurs d'onde.
+
+        Le spectre du champ n'est calculé qu'une fois ; les longueurs d'onde sont propagées par blocs
+        de chunk_length en une seule FFT batchée (BYTES_PER_SAMPLE octets par point et par longueur d'onde).
+        Les piles de fonctions de transfert ne sont mises en cache que si tout le spectre tient dans un
+        bloc : sinon, le cache retiendrait toutes les piles et la mémoire ne serait plus bornée par le bloc.
+
+        :param intensity: Tableau réel de la forme du champ, complété sur place.
+        :param field: Tableau 2D du champ complexe dans le plan de départ.
+        :param pitch: Pas d'échantillonnage (en mètres).
+        :param wavelengths: Tableau des longueurs d'onde (en mètres).
+        :param weights: Poids des longueurs d'onde.
+        :param distance: Distance de propagation (en mètres).
+        :param chunk_length: Nombre de longueurs d'onde par bloc (par défaut, toutes).
+        :return: intensity.
+        """
+        spectrum = np.fft.fft2(field)
+        chunk_length = chunk_length or len(wavelengths)
+        cache = chunk_length >= len(wavelengths)
+        for start in range(0, len(wavelengths), chunk_length):
+            stop = start + chunk_length
+            transfer = self.transfer_functions(field.shape, pitch, wavelengths[start:stop], distance, cache)
+            fields = np.fft.ifft2(transfer * spectrum, axes=(-2, -1))
+            del transfer
+            power = np.square(fields.real)
+            power += np.square(fields.imag)
+            del fields
+            intensity += np.tensordot(weights[start:stop], power, axes=1)
+        return intensity
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     propagator = AngularSpectrumPropagator()
+#     field = np.zeros((512, 512), dtype=complex)
+#     field[192:320, 192:320] = 1.0
+
+#     near_field = propagator.propagate(field, pitch=20e-6, wavelength=550e-9, distance=0.05)
+#     propagator.propagate(field, pitch=20e-6, wavelength=550e-9, distance=0.05)
+#     print("Statistiques du cache:", propagator.cache.stats())
@@ -0,0 +1,231 @@
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from exporter import Exporter
+from result_cache import ResultCache
+from simulation import Simulation
+
+# Données de la simulation conservées par défaut dans les résultats d'un lot (les fronts d'onde sont omis)
+DEFAULT_FIELDS = ("lens_profile", "light_source", "diffraction_pattern", "field_statistics")
+
+
+def iter_jobs(file_path):
+    """
+    Lit un fichier de tâches JSON Lines ligne par ligne, sans le charger en mémoire.
+
+    Les lignes vides sont ignorées ; les tâches sont numérotées dans l'ordre du fichier (à partir de 0).
+
+    :param file_path: Chemin du fichier de tâches (une configuration au format de default_config.json par ligne).
+    :return: Générateur de tuples (numéro de la tâche, texte de la ligne).
+    """
+    with open(file_path, "r", encoding="utf-8") as jobs_file:
+        index = 0
+        for line in jobs_file:
+            line = line.strip()
+            if line:
+                yield index, line
+                index += 1
+
+
+def run_job(index, line, engine=None, grid_size=None, padding=None, fields=DEFAULT_FIELDS, cache_directory=None):
+    """
+    Exécute une tâche (éventuellement dans un processus fils) et retourne son enregistrement de résultat.
+
+    Une tâche en échec ne fait pas échouer le lot : l'enregistrement contient alors l'erreur, quelle qu'elle soit.
+
+    :param index: Numéro de la tâche.
+    :param line: Configuration JSON (format de default_config.json, avec une clé "id" optionnelle).
+    :param engine: Moteur de calcul (optionnel, prioritaire sur la configuration).
+    :param grid_size: Taille de grille (optionnel, prioritaire sur la configuration).
+    :param padding: Facteur de bourrage (optionnel, prioritaire sur la configuration).
+    :param fields: Clés de Simulation.export_data conservées dans le résultat.
+    :param cache_directory: Répertoire du cache des résultats (optionnel).
+    :return: Dictionnaire (job, id éventuel, puis les données demandées ou error).
+    """
+    record = {"job": index}
+    try:
+        config = json.loads(line)
+        if "id" in config:
+            record["id"] = config["id"]
+        simulation = Simulation.from_config(config, engine=engine, grid_size=grid_size, padding=padding)
+        if cache_directory:
+            simulation.result_cache = ResultCache(cache_directory)
+        simulation.start_simulation()
+        data = simulation.export_data()
+        record.update((key, data[key]) for key in fields)
+    except Exception as e:
+        # Configuration invalide (par exemple "advanced_options": null) ou erreur de calcul
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+class BatchCheckpoint:
+    """
+    Point de reprise d'un lot : tâches terminées et taille du fichier de résultats correspondante.
+
+    Les tâches terminées sont résumées par un seuil (toutes les tâches de numéro inférieur sont terminées)
+    et l'ensemble des tâches terminées au-delà, dont la taille est bornée par les tâches en cours : le point
+    de reprise reste petit quelle que soit la longueur du lot. Il est réécrit de manière atomique.
+    """
+
+    def __init__(self, file_path):
+        """
+        Initialise une instance de la classe BatchCheckpoint, en relisant le point de reprise s'il existe.
+
+        :param file_path: Chemin du fichier de point de reprise.
+        """
+        self.file_path = file_path
+        self.watermark = 0
+        self.done = set()
+        self.results_offset = 0
+        if os.path.exists(file_path):
+            with open(file_path, "r") as checkpoint_file:
+                state = json.load(checkpoint_file)
+            self.watermark = state["watermark"]
+            self.done = set(state["done"])
+            self.results_offset = state["results_offset"]
+
+    def is_done(self, index):
+        """
+        Indique si une tâche est déjà terminée.
+
+        :param index: Numéro de la tâche.
+        :return: True si son résultat est déjà enregistré.
+        """
+        return index < self.watermark or index in self.done
+
+    def mark_done(self, index, results_offset):
+        """
+        Enregistre la fin d'une tâche dont le résultat a été écrit jusqu'à results_offset.
+
+        :param index: Numéro de la tâche.
+        :param results_offset: Taille du fichier de résultats après l'écriture de son résultat.
+        """
+        self.done.add(index)
+        self.results_offset = results_offset
+        while self.watermark in self.done:
+            self.done.discard(self.watermark)
+            self.watermark += 1
+        self.save()
+
+    def save(self):
+        """
+        Écrit le point de reprise dans un fichier temporaire, puis le renomme (remplacement atomique).
+        """
+        temporary = f"{self.file_path}.tmp"
+        with open(temporary, "w") as checkpoint_file:
+            json.dump(
+                {"watermark": self.watermark, "done": sorted(self.done), "results_offset": self.results_offset},
+                checkpoint_file,
+            )
+        os.replace(temporary, self.file_path)
+
+
+def run_batch(jobs_path, results_path, max_workers=None, max_in_flight=None, checkpoint_path=None, engine=None,
+              grid_size=None, padding=None, fields=DEFAULT_FIELDS, cache_directory=None):
+    """
+    Exécute un fichier de tâches JSON Lines en flux et ajoute chaque résultat au fichier JSON Lines de sortie.
+
+    Les tâches sont lues à la demande et au plus max_in_flight sont soumises à la fois : la mémoire ne
+    dépend pas de la longueur du lot. Les résultats sont écrits dans l'ordre où les tâches se terminent.
+    Un lot interrompu reprend là où il s'était arrêté : le fichier de résultats est ramené à la taille
+    enregistrée dans le point de reprise et les tâches terminées ne sont pas relancées. Un processus
+    de calcul interrompu (mémoire épuisée, signal) rend le pool inutilisable : les tâches qu'il avait
+    en cours sont enregistrées en erreur, les résultats déjà obtenus sont conservés, et un nouveau
+    pool exécute les tâches suivantes.
+
+    :param jobs_path: Fichier de tâches (une configuration par ligne).
+    :param results_path: Fichier de résultats JSON Lines (un enregistrement par tâche, voir run_job).
+    :param max_workers: Nombre de processus (None : nombre de cœurs ; 1 : exécution dans le processus courant).
+    :param max_in_flight: Nombre maximal de tâches soumises et non terminées (par défaut, 2 × max_workers).
+    :param checkpoint_path: Fichier du point de reprise (par défaut, <results_path>.checkpoint).
+    :param engine: Moteur de calcul (optionnel, prioritaire sur les configurations).
+    :param grid_size: Taille de grille (optionnel, prioritaire sur les configurations).
+    :param padding: Facteur de bourrage (optionnel, prioritaire sur les configurations).
+    :param fields: Clés de Simulation.export_data conservées dans les résultats.
+    :param cache_directory: Répertoire du cache des résultats partagé par les processus (optionnel).
+    :return: Dictionnaire (completed, failed, skipped).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or 2 * max_workers)
+    checkpoint = BatchCheckpoint(checkpoint_path or f"{results_path}.checkpoint")
+    job = partial(
+        run_job, engine=engine, grid_size=grid_size, padding=padding, fields=fields, cache_directory=cache_directory
+    )
+    summary = {"completed": 0, "failed": 0, "skipped": 0}
+
+    # Les résultats écrits après le dernier point de reprise (ligne incomplète, tâche non enregistrée) sont retirés
+    if os.path.exists(results_path):
+        os.truncate(results_path, checkpoint.results_offset)
+
+    def pending_jobs():
+        for index, line in iter_jobs(jobs_path):
+            if checkpoint.is_done(index):
+                summary["skipped"] += 1
+            else:
+                yield index, line
+
+    with open(results_path, "a", encoding="utf-8") as results_file:
+
+        def record_result(record):
+            offset = Exporter.append_data_as_jsonl(record, results_file)
+            checkpoint.mark_done(record["job"], offset)
+            summary["failed" if "error" in record else "completed"] += 1
+
+        if max_workers <= 1:
+            for index, line in pending_jobs():
+                record_result(job(index, line))
+            return summary
+
+        in_flight = {}  # Tâches soumises : future -> numéro de la tâche
+
+        def collect(futures):
+            broken = False
+            for future in futures:
+                index = in_flight.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {"job": index, "error": f"{type(e).__name__}: {e}"}
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                record_result(record)
+            return broken
+
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+
+        def replace_pool():
+            # Les autres tâches du pool interrompu échouent aussi : elles sont enregistrées avant de le remplacer
+            nonlocal executor
+            collect(wait(list(in_flight)).done)
+            executor.shutdown()
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+
+        try:
+            for index, line in pending_jobs():
+                if len(in_flight) >= max_in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    if collect(finished):
+                        replace_pool()
+                try:
+                    future = executor.submit(job, index, line)
+                except BrokenProcessPool:
+                    replace_pool()
+                    future = executor.submit(job, index, line)
+                in_flight[future] = index
+            collect(wait(list(in_flight)).done)
+        finally:
+            executor.shutdown()
+    return summary
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     with open("default_config.json") as file:
+#         config = json.load(file)
+#     with open("jobs.jsonl", "w") as jobs_file:
+#         for wavelength in range(400, 701, 10):
+#             config["light_source"]["wavelength"] = wavelength * 1e-9
+#             jobs_file.write(json.dumps(dict(config, id=f"lambda-{wavelength}")) + "\n")
+#     print(run_batch("jobs.jsonl", "results.jsonl", max_workers=4))
@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Tailles de problème de chaque banc d'essai
+SIZES = {
+    "calculate_pattern_fft": (128, 256, 512),
+    "calculate_pattern_angular_spectrum": (64, 128, 256),
+    "wavefront_propagate": (1_000, 100_000, 1_000_000),
+    "start_simulation": (128, 256, 512),
+    "export_json": (128, 512),
+    "export_csv": (128, 512),
+    "export_npz": (128, 512),
+    "canvas_paint": (400, 800, 1600),
+    "calculate_grating": (2, 10_000, 100_000),  # Nombre de fentes
+}
+
+# Seuil de régression par défaut : 20 % plus lent que la référence
+DEFAULT_THRESHOLD = 0.2
+
+# Ralentissement maximal toléré du profil d'un réseau entre le plus petit et le plus grand nombre de fentes
+GRATING_SCALING_LIMIT = 3.0
+
+# Application Qt des bancs de rendu (créée à la demande, une seule par processus)
+_application = None
+
+
+def _make_simulation(grid_size, engine="fft"):
+    """
+    Crée une simulation de référence (ouverture de 1 mm à 1 m, 550 nm) pour les bancs d'essai.
+    """
+    from lens import Lens
+    from light_source import LightSource
+    from simulation import Simulation
+
+    simulation = Simulation()
+    simulation.configure_components(
+        Lens(focal_length=0.05, curvature_radius=0.01, refractive_index=1.5, aperture=1e-3),
+        LightSource(wavelength=550e-9),
+        screen_distance=1.0,
+        engine=engine,
+        grid_size=grid_size,
+    )
+    return simulation
+
+
+def bench_calculate_pattern(size, engine):
+    """
+    Calcul complet du motif de diffraction sur une grille size×size.
+    """
+    simulation = _make_simulation(size, engine)
+    pattern = simulation.diffraction_pattern
+    return lambda: pattern.calculate_pattern(simulation.light_source, simulation.lens, simulation.advanced_options)
+
+
+def bench_calculate_grating(num_slits):
+    """
+    Profil d'un réseau de num_slits fentes (grille 256, bourrage 2) : le coût ne doit pas dépendre du nombre de fentes.
+    """
+    from advanced_options import AdvancedOptions
+
+    simulation = _make_simulation(256)
+    options = AdvancedOptions()
+    options.enable_multi_slit(True, slit_spacing=1e-3, num_slits=num_slits, slit_width=2e-4)
+    pattern = simulation.diffraction_pattern
+
+    def calculate():
+        # Sans reprise du niveau précédent : chaque appel évalue le profil entier
+        pattern._grating_level = None
+        pattern.calculate_grating(simulation.light_source, options)
+
+    return calculate
+
+
+def bench_wavefront_propagate(size):
+    """
+    Propagation d'un front d'onde sur size pas.
+    """
+    from wave_front import Wavefront
+
+    wavefront = Wavefront(origin=(0.0, 0.0), angle=0.1)
+    return lambda: wavefront.propagate(size * 0.01, step_size=0.01)
+
+
+def bench_start_simulation(size):
+    """
+    Simulation complète (motif et fronts d'onde) sur une grille size×size.
+    """
+    simulation = _make_simulation(size)
+    return simulation.start_simulation
+
+
+def bench_export(size, extension, directory):
+    """
+    Exportation des résultats d'une simulation sur une grille size×size.
+    """
+    from exporter import Exporter
+
+    simulation = _make_simulation(size)
+    simulation.start_simulation()
+    data = simulation.export_data(include_field=extension == ".npz")
+    file_path = os.path.join(directory, f"benchmark_{size}{extension}")
+    return lambda: Exporter.export_data(data, file_path)
+
+
+def bench_canvas_paint(size):
+    """
+    Rendu hors écran (paintEvent) d'un canvas de size×size pixels.
+    """
+    global _application
+    # Rendu hors écran : aucun serveur d'affichage n'est nécessaire
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    from canvas import Canvas
+
+    _application = QApplication.instance() or QApplication([])
+    simulation = _make_simulation(256)
+    simulation.start_simulation()
+
+    canvas = Canvas()
+    canvas.resize(size, size)
+    canvas.set_simulation_data(
+        simulation.lens, simulation.light_source, simulation.diffraction_pattern, simulation.wavefronts
+    )
+    return canvas.grab
+
+
+def build_benchmark(name, size, directory):
+    """
+    Prépare un banc d'essai : la préparation n'est pas chronométrée.
+
+    :param name: Nom du banc d'essai (voir SIZES).
+    :param size: Taille du problème.
+    :param directory: Répertoire temporaire pour les fichiers exportés.
+    :return: Fonction sans argument à chronométrer.
+    """
+    if name == "calculate_pattern_fft":
+        return bench_calculate_pattern(size, "fft")
+    if name == "calculate_pattern_angular_spectrum":
+        return bench_calculate_pattern(size, "angular_spectrum")
+    if name == "wavefront_propagate":
+        return bench_wavefront_propagate(size)
+    if name == "start_simulation":
+        return bench_start_simulation(size)
+    if name.startswith("export_"):
+        return bench_export(size, "." + name[len("export_"):], directory)
+    if name == "canvas_paint":
+        return bench_canvas_paint(size)
+    if name == "calculate_grating":
+        return bench_calculate_grating(size)
+    raise ValueError(f"Banc d'essai inconnu : {name}.")
+
+
+def time_callable(function, repeat=5, min_time=0.05):
+    """
+    Chronomètre une fonction : chaque mesure répète l'appel jusqu'à durer au moins min_time.
+
+    :param function: Fonction sans argument.
+    :param repeat: Nombre de mesures.
+    :param min_time: Durée minimale d'une mesure (en secondes).
+    :return: Dictionnaire (best_s, median_s, calls) des durées par appel.
+    """
+    # Premier appel hors mesure (caches, plans FFT, allocations)
+    start = time.perf_counter()
+    function()
+    calls = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        timings.append((time.perf_counter() - start) / calls)
+    timings.sort()
+    return {"best_s": timings[0], "median_s": timings[len(timings) // 2], "calls": calls}
+
+
+def run_benchmarks(names=None, repeat=5, log=None):
+    """
+    Exécute les bancs d'essai à toutes leurs tailles.
+
+    Les bancs dont une dépendance est absente (PyQt5 pour le rendu) sont ignorés.
+
+    :param names: Noms des bancs à exécuter (par défaut, tous).
+    :param repeat: Nombre de mesures par banc.
+    :param log: Fonction appelée avec une ligne de texte après chaque mesure (optionnel).
+    :return: Dictionnaire (environment, results), results étant indexé par "nom[taille]".
+    """
+    names = list(SIZES) if not names else names
+    results = {}
+    directory = tempfile.mkdtemp(prefix="tungafract_benchmark_")
+    try:
+        for name in names:
+            if name not in SIZES:
+                raise ValueError(f"Banc d'essai inconnu : {name}.")
+            for size in SIZES[name]:
+                key = f"{name}[{size}]"
+                try:
+                    function = build_benchmark(name, size, directory)
+                except ImportError as e:
+                    if log:
+                        log(f"{key:45s} ignoré ({e})")
+                    break
+                results[key] = time_callable(function, repeat)
+                if log:
+                    log(f"{key:45s} {results[key]['median_s'] * 1000:10.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare des résultats à une référence et signale les régressions.
+
+    :param current: Résultats de run_benchmarks.
+    :param baseline: Résultats de référence (même format).
+    :param threshold: Ralentissement relatif toléré (0.2 pour 20 %).
+    :return: Liste de tuples (nom, durée de référence, durée actuelle, ratio) des régressions, triée par ratio.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        ratio = result["median_s"] / reference["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append((key, reference["median_s"], result["median_s"], ratio))
+    return sorted(regressions, key=lambda regression: regression[3], reverse=True)
+
+
+def check_grating_scaling(current, limit=GRATING_SCALING_LIMIT):
+    """
+    Calcule le rapport des durées du profil d'un réseau entre le plus grand et le plus petit nombre de fentes.
+
+    :param current: Résultats de run_benchmarks.
+    :param limit: Rapport de durées maximal toléré.
+    :return: Rapport des durées (plus grand / plus petit nombre de fentes), ou None si le banc n'a pas été exécuté.
+    """
+    sizes = SIZES["calculate_grating"]
+    smallest = current["results"].get(f"calculate_grating[{sizes[0]}]")
+    largest = current["results"].get(f"calculate_grating[{sizes[-1]}]")
+    if smallest is None or largest is None:
+        return None
+    return largest["median_s"] / smallest["median_s"]
+
+
+def main(argv=None):
+    """
+    Point d'entrée des bancs d'essai.
+
+    :param argv: Arguments (par défaut, ceux de sys.argv).
+    :return: Code de sortie (1 si une régression est détectée).
+    """
+    parser = argparse.ArgumentParser(description="Bancs d'essai des calculs, de l'exportation et du rendu.")
+    parser.add_argument("--only", nargs="+", choices=list(SIZES), help="Bancs d'essai à exécuter.")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de mesures par banc.")
+    parser.add_argument("--save", metavar="FICHIER", help="Enregistre les résultats comme référence JSON.")
+    parser.add_argument("--compare", metavar="FICHIER", help="Compare les résultats à une référence JSON.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Ralentissement toléré (0.2 pour 20 %%)."
+    )
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.only, args.repeat, log=print)
+
+    status = 0
+    scaling = check_grating_scaling(current)
+    if scaling is not None and scaling > GRATING_SCALING_LIMIT:
+        sizes = SIZES["calculate_grating"]
+        print(f"RÉGRESSION calculate_grating : {sizes[-1]} fentes {scaling:.1f} fois plus lent que {sizes[0]}")
+        status = 1
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(current, file, indent=4)
+        print(f"Référence enregistrée dans {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for key, reference, duration, ratio in regressions:
+            print(f"RÉGRESSION {key} : {reference * 1000:.3f} ms -> {duration * 1000:.3f} ms (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"Aucune régression au-delà de {args.threshold:.0%}.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,69 @@
+import numpy as np
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QPen
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen, QPixmap, QPolygonF
+from PyQt5.QtCore import QRect, Qt, QTimer
+
+from instrumentation import instrumentation
+
+
+def build_colormap_lut(size=256):
+    """
+    Construit une table de couleurs noir -> vert -> blanc au format ARGB32 (0xAARRGGBB).
+
+    :param size: Nombre d'entrées de la table (256 pour des intensités uint8, 65536 pour uint16).
+    :return: Tableau uint32 de taille size.
+    """
+    level = np.linspace(0.0, 1.0, size)
+    red = np.clip(2 * level - 1, 0, 1)
+    green = np.clip(2 * level, 0, 1)
+    blue = np.clip(2 * level - 1, 0, 1)
+    channels = [np.round(channel * 255).astype(np.uint32) for channel in (red, green, blue)]
+    return np.uint32(0xFF000000) | (channels[0] << 16) | (channels[1] << 8) | channels[2]
+
+
+def build_field_lut(size=256):
+    """
+    Construit une table de couleurs divergente bleu -> noir -> rouge au format ARGB32, pour un champ signé
+    quantifié (valeur nulle au milieu de la table).
+
+    :param size: Nombre d'entrées de la table.
+    :return: Tableau uint32 de taille size.
+    """
+    level = np.linspace(-1.0, 1.0, size)
+    red = np.clip(level, 0, 1)
+    blue = np.clip(-level, 0, 1)
+    channels = [np.round(channel * 255).astype(np.uint32) for channel in (red, np.zeros(size), blue)]
+    return np.uint32(0xFF000000) | (channels[0] << 16) | (channels[1] << 8) | channels[2]
+
+
+def intensity_to_image(buffer, lut):
+    """
+    Applique une table de couleurs à un tampon d'intensité uint8/uint16 et l'enveloppe dans un QImage sans copie.
+
+    :param buffer: Tableau 2D uint8 ou uint16 des intensités quantifiées.
+    :param lut: Table de couleurs ARGB32 de 256 (uint8) ou 65536 (uint16) entrées.
+    :return: Tuple (QImage, tableau ARGB32) ; le tableau doit rester vivant tant que l'image est utilisée.
+    """
+    if buffer.dtype not in (np.uint8, np.uint16) or buffer.ndim != 2:
+        raise ValueError("Le tampon d'intensité doit être un tableau 2D uint8 ou uint16.")
+    pixels = np.ascontiguousarray(lut[buffer])
+    height, width = pixels.shape
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGB32)
+    return image, pixels
+
+
+def polygon_from_array(points):
+    """
+    Crée un QPolygonF en écrivant directement les coordonnées d'un tableau (n, 2) dans sa mémoire.
+
+    :param points: Tableau (n, 2) des coordonnées en pixels.
+    :return: Instance de QPolygonF.
+    """
+    polygon = QPolygonF(len(points))
+    pointer = polygon.data()
+    pointer.setsize(len(points) * 2 * np.dtype(np.float64).itemsize)
+    np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
 
 
 class Canvas(QWidget):
@@ -14,6 +77,19 @@ class Canvas(QWidget):
         self.light_source = None
         self.diffraction_pattern = None
         self.wavefronts = []
+        self.colormap_lut = build_colormap_lut()
+        self.field_lut = build_field_lut()
+        self.show_stats = False  # Affiche les mesures par étape en surimpression
+
+        # Image du motif (tampon numpy partagé) et sa version mise à l'échelle de la zone d'affichage
+        self._pattern_image = None
+        self._pattern_pixels = None
+        self._scaled_pattern = None
+
+        # Animation de phase : les trames remplacent l'image du motif tant qu'elle est active
+        self.animation = None
+        self._animation_timer = QTimer(self)
+        self._animation_timer.timeout.connect(self.advance_animation)
 
     def set_simulation_data(self, lens, light_source, diffraction_pattern, wavefronts):
         """
@@ -22,32 +98,133 @@ class Canvas(QWidget):
         :param lens: Instance de la classe Lens.
         :param light_source: Instance de la classe LightSource.
         :param diffraction_pattern: Instance de la classe DiffractionPattern.
-        :param wavefronts: Liste des instances de Wavefront.
+        :param wavefronts: Liste des instances de Wavefront ou WavefrontBundle.
         """
+        self.stop_animation()
         self.lens = lens
         self.light_source = light_source
         self.diffraction_pattern = diffraction_pattern
         self.wavefronts = wavefronts
+        self.update_pattern_image()
+        self.update()
+
+    def start_animation(self, animation, fps=60):
+        """
+        Lance la lecture en boucle d'une animation de phase ; les fronts d'onde avancent avec la phase.
+
+        :param animation: Instance de PhaseAnimation.
+        :param fps: Nombre de trames par seconde.
+        """
+        self.animation = animation
+        self._animation_timer.start(max(1, round(1000 / fps)))
+        self.advance_animation()
+
+    def stop_animation(self):
+        """
+        Arrête l'animation de phase et réaffiche l'intensité du motif.
+        """
+        if self.animation is None:
+            return
+        self._animation_timer.stop()
+        self.animation = None
+        self.update_pattern_image()
         self.update()
 
+    def advance_animation(self):
+        """
+        Affiche la trame suivante de l'animation (lue depuis son tampon circulaire, sans copie).
+        """
+        if self.animation is None:
+            return
+        frame = self.animation.next_frame()
+        self._pattern_image, self._pattern_pixels = intensity_to_image(frame, self.field_lut)
+        self._scaled_pattern = None
+        for wavefront in self.wavefronts:
+            wavefront.update_phase(self.animation.phase_step)
+        self.update()
+
+    def update_pattern_image(self):
+        """
+        Quantifie l'intensité 2D du motif en uint8 et prépare l'image affichée (sans copie du tampon coloré).
+        """
+        self._pattern_image = None
+        self._pattern_pixels = None
+        self._scaled_pattern = None
+
+        intensity = getattr(self.diffraction_pattern, "intensity_map", None)
+        if intensity is None:
+            return
+
+        peak = intensity.max()
+        scale = 255.0 / peak if peak > 0 else 0.0
+        quantized = np.empty(intensity.shape, dtype=np.uint8)
+        np.multiply(intensity, scale, out=quantized, casting="unsafe")
+        self._pattern_image, self._pattern_pixels = intensity_to_image(quantized, self.colormap_lut)
+
+    def pattern_rect(self):
+        """
+        Retourne la zone du canvas où est affiché l'écran d'observation (carré en haut à droite).
+        """
+        side = min(self.width(), self.height()) // 3
+        return QRect(self.width() - side - 10, 10, side, side)
+
     def paintEvent(self, event):
         """
         Gère le rendu des éléments graphiques sur le canvas.
         """
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        with instrumentation.stage("canvas.paint"):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.Antialiasing)
+
+            if self.lens:
+                self.draw_lens(painter)
+
+            if self.light_source:
+                self.draw_light_source(painter)
+
+            if self.diffraction_pattern:
+                self.draw_diffraction_pattern(painter)
+
+            if self.wavefronts:
+                self.draw_wavefronts(painter)
+
+            if self.show_stats:
+                self.draw_stats(painter)
+
+    def set_stats_overlay(self, enabled):
+        """
+        Active ou désactive l'affichage des mesures par étape (active aussi l'instrumentation).
 
-        if self.lens:
-            self.draw_lens(painter)
+        :param enabled: True pour afficher les mesures.
+        """
+        self.show_stats = enabled
+        if enabled and not instrumentation.enabled:
+            instrumentation.enable()
+        self.update()
 
-        if self.light_source:
-            self.draw_light_source(painter)
+    def draw_stats(self, painter):
+        """
+        Affiche en bas à gauche la durée moyenne, le nombre d'appels et le pic mémoire de chaque étape mesurée.
+        """
+        lines = []
+        for name, record in sorted(instrumentation.stats().items()):
+            text = f"{name}  {record['mean_s'] * 1000:.2f} ms  x{record['calls']}"
+            if record["peak_bytes"] is not None:
+                text += f"  {record['peak_bytes'] / 1024 ** 2:.1f} Mo"
+            lines.append(text)
+        if not lines:
+            return
 
-        if self.diffraction_pattern:
-            self.draw_diffraction_pattern(painter)
+        # Fond semi-transparent pour rester lisible quel que soit le contenu du canvas
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        width = max(metrics.horizontalAdvance(text) for text in lines) + 10
+        top = self.height() - 10 - line_height * len(lines)
+        painter.fillRect(5, top - 5, width, line_height * len(lines) + 10, QColor(0, 0, 0, 160))
 
-        if self.wavefronts:
-            self.draw_wavefronts(painter)
+        painter.setPen(QPen(Qt.white, 1))
+        for index, text in enumerate(lines):
+            painter.drawText(10, top + line_height * index + metrics.ascent(), text)
 
     def draw_lens(self, painter):
         """
@@ -73,43 +250,58 @@ class Canvas(QWidget):
         """
         Dessine le motif de diffraction sur le canvas.
         """
-        if not self.diffraction_pattern or not self.diffraction_pattern.spots:
+        if self._pattern_image is not None:
+            self.draw_intensity_map(painter)
+            return
+
+        if not self.diffraction_pattern or len(self.diffraction_pattern.spots) == 0:
             return
 
         pen = QPen(Qt.green, 1)
         painter.setPen(pen)
+        painter.setBrush(Qt.green)
         width = self.width()
         height = self.height()
         center_x = width // 2
         center_y = height - 50  # Position de base des spots
 
-        for spot in self.diffraction_pattern.spots:
-            # Convertir la position en pixels
-            x = center_x + int(spot["position"] * (width / self.diffraction_pattern.screen_distance))
-            y = center_y
-            intensity = min(255, int(spot["intensity"] * 255))  # Limiter à 255
+        # Convertir les positions en pixels et les intensités en tailles, pour toute la table à la fois
+        spots = self.diffraction_pattern.spots
+        xs = center_x + (spots["position"] * (width / self.diffraction_pattern.screen_distance)).astype(int)
+        intensities = np.minimum(255, (spots["intensity"] * 255).astype(int))  # Limiter à 255
+        sizes = np.maximum(3, intensities // 50)  # Taille dépend de l'intensité
 
-            # Dessiner un cercle proportionnel à l'intensité
-            size = max(3, intensity // 50)  # Taille dépend de l'intensité
-            painter.setBrush(Qt.green)
-            painter.drawEllipse(x - size // 2, y - size // 2, size, size)
+        # Dessiner un cercle proportionnel à l'intensité
+        for x, size in zip(xs.tolist(), sizes.tolist()):
+            painter.drawEllipse(x - size // 2, center_y - size // 2, size, size)
 
+    def draw_intensity_map(self, painter):
+        """
+        Affiche l'intensité 2D du motif sous forme d'image ; la mise à l'échelle n'est refaite qu'au redimensionnement.
+        """
+        rect = self.pattern_rect()
+        if self._scaled_pattern is None or self._scaled_pattern.size() != rect.size():
+            self._scaled_pattern = QPixmap.fromImage(
+                self._pattern_image.scaled(rect.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            )
+        painter.drawPixmap(rect.topLeft(), self._scaled_pattern)
 
     def draw_wavefronts(self, painter):
         """
         Dessine les fronts d'onde sur le canvas.
         """
         pen = QPen(Qt.yellow, 1, Qt.DashLine)
-        painter.setPen(pen)
+        scale = np.array([self.width(), self.height()])
         for wavefront in self.wavefronts:
-            points = wavefront.draw()
-            for i in range(len(points) - 1):
-                x1, y1 = points[i]
-                x2, y2 = points[i + 1]
-                painter.drawLine(
-                    int(x1 * self.width()), int(y1 * self.height()),
-                    int(x2 * self.width()), int(y2 * self.height())
-                )
+            # Les tirets (motif de 6 unités) défilent avec la phase du front d'onde
+            pen.setDashOffset(-6 * wavefront.phase / (2 * np.pi))
+            painter.setPen(pen)
+            # Un Wavefront fournit un chemin (n, 2), un WavefrontBundle un tableau (rayons, n, 2)
+            paths = np.asarray(wavefront.draw())
+            if paths.ndim == 2:
+                paths = paths[np.newaxis]
+            for path in paths * scale:
+                painter.drawPolyline(polygon_from_array(path))
 
 # Exemple d'utilisation avec PyQt (nécessite un main.py pour un fonctionnement complet)
 # if __name__ == "__main__":
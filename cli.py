@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Modules de calcul importés par le mode sans interface
+PHYSICS_MODULES = ("simulation", "lens", "light_source", "diffraction_pattern", "exporter")
+
+# Dépendances lourdes qui ne doivent pas être chargées par ces modules
+FORBIDDEN_MODULES = ("PyQt5", "matplotlib", "scipy")
+
+
+def measure_startup(repeat=5):
+    """
+    Mesure le démarrage à froid : lancement d'un interpréteur neuf et import des modules de calcul.
+
+    :param repeat: Nombre de mesures (la meilleure et la médiane sont retournées).
+    :return: Dictionnaire (best_ms, median_ms, forbidden_modules).
+    """
+    code = (
+        f"import sys; import {', '.join(PHYSICS_MODULES)}; "
+        f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & {set(FORBIDDEN_MODULES)!r})))"
+    )
+    directory = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    loaded = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        loaded = result.stdout.strip()
+
+    timings.sort()
+    return {
+        "best_ms": timings[0],
+        "median_ms": timings[len(timings) // 2],
+        "forbidden_modules": loaded.split(",") if loaded else [],
+    }
+
+
+def run(config_path, output_path, engine=None, grid_size=None, padding=None, frames_directory=None, num_frames=60,
+        cache_directory=None, processes=None):
+    """
+    Exécute une simulation à partir d'un fichier de configuration et exporte ses résultats.
+
+    :param config_path: Chemin du fichier de configuration (format de default_config.json).
+    :param output_path: Chemin du fichier de sortie ; le format est déduit de l'extension.
+    :param engine: Moteur de calcul (optionnel, prioritaire sur la configuration).
+    :param grid_size: Taille de grille (optionnel, prioritaire sur la configuration).
+    :param padding: Facteur de bourrage (optionnel, prioritaire sur la configuration).
+    :param frames_directory: Répertoire où exporter l'animation de phase en images PNG (optionnel).
+    :param num_frames: Nombre de trames de l'animation de phase.
+    :param cache_directory: Répertoire du cache des résultats (optionnel ; aucun cache sinon).
+    :param processes: Nombre de processus (mémoire partagée) propageant le champ proche (optionnel).
+    :return: Instance de Simulation calculée.
+    """
+    from exporter import Exporter
+    from simulation import Simulation
+
+    with open(config_path, "r") as file:
+        config = json.load(file)
+
+    simulation = Simulation.from_config(
+        config, engine=engine, grid_size=grid_size, padding=padding, workers=processes,
+        backend="processes" if processes else None,
+    )
+    if cache_directory:
+        from result_cache import ResultCache
+
+        simulation.result_cache = ResultCache(cache_directory)
+    simulation.start_simulation()
+    # Les formats binaires (.npz ou répertoire de .npy) embarquent aussi la carte d'intensité
+    include_field = os.path.splitext(output_path)[1].lower() in (".npz", "")
+    Exporter.export_data(simulation.export_data(include_field=include_field), output_path)
+    if frames_directory:
+        # Les trames sont calculées et écrites une à une : une seule est en mémoire à la fois
+        animation = simulation.phase_animation(num_frames, capacity=1)
+        Exporter.export_frame_sequence(animation.iter_frames(), frames_directory)
+    return simulation
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la ligne de commande.
+
+    :param argv: Arguments (par défaut, ceux de sys.argv).
+    :return: Code de sortie.
+    """
+    parser = argparse.ArgumentParser(description="Simulation de diffraction sans interface graphique.")
+    parser.add_argument("config", nargs="?", default="default_config.json", help="Fichier de configuration JSON.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="simulation_results.json",
+        help="Fichier de sortie (.json, .csv, .npz, ou chemin sans extension pour un répertoire de fichiers .npy).",
+    )
+    parser.add_argument("--engine", choices=("analytic", "fft", "angular_spectrum", "hankel", "auto"), help="Moteur de calcul.")
+    parser.add_argument("--grid-size", type=int, help="Nombre d'échantillons de la pupille par côté.")
+    parser.add_argument("--padding", type=int, help="Facteur de bourrage de zéros.")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Traite config comme un fichier de tâches JSON Lines (une configuration par ligne) ; "
+             "les résultats sont ajoutés au fichier de sortie JSON Lines et le lot reprend là où il s'était arrêté.",
+    )
+    parser.add_argument(
+        "--processes", type=int, help="Propage le champ proche sur ce nombre de processus (pool en mémoire partagée)."
+    )
+    parser.add_argument("--workers", type=int, help="Nombre de processus du lot (par défaut, le nombre de cœurs).")
+    parser.add_argument("--max-in-flight", type=int, help="Nombre maximal de tâches du lot en cours à la fois.")
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        help="Réutilise les résultats déjà calculés, mis en cache dans ce répertoire (par défaut, le cache de l'utilisateur).",
+    )
+    parser.add_argument("--frames", help="Répertoire où exporter l'animation de phase du champ (images PNG numérotées).")
+    parser.add_argument("--num-frames", type=int, default=60, help="Nombre de trames de l'animation de phase.")
+    parser.add_argument(
+        "--photons",
+        type=float,
+        help="Contrôle Monte-Carlo : tire jusqu'à ce nombre de photons (avec --workers processus) et compare au moteur.",
+    )
+    parser.add_argument(
+        "--target-noise", type=float, help="Avec --photons, arrête le tirage dès que le bruit passe sous ce seuil."
+    )
+    parser.add_argument("--stats", action="store_true", help="Affiche la durée de chaque étape du calcul.")
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Avec --stats, mesure aussi le pic mémoire de chaque étape."
+    )
+    parser.add_argument(
+        "--measure-startup", action="store_true", help="Mesure le démarrage à froid des modules de calcul et quitte."
+    )
+    args = parser.parse_args(argv)
+
+    if args.measure_startup:
+        startup = measure_startup()
+        print(f"Démarrage à froid : {startup['best_ms']:.1f} ms (médiane {startup['median_ms']:.1f} ms)")
+        if startup["forbidden_modules"]:
+            print(f"Modules lourds chargés : {', '.join(startup['forbidden_modules'])}")
+            return 1
+        return 0
+
+    if args.stats:
+        from instrumentation import instrumentation
+
+        instrumentation.enable(trace_memory=args.trace_memory)
+
+    start = time.perf_counter()
+    try:
+        cache_directory = None
+        if args.cache is not None:
+            from result_cache import default_cache_directory
+
+            cache_directory = args.cache or default_cache_directory()
+        if args.batch:
+            from batch_runner import run_batch
+
+            summary = run_batch(
+                args.config, args.output, args.workers, args.max_in_flight, engine=args.engine,
+                grid_size=args.grid_size, padding=args.padding, cache_directory=cache_directory,
+            )
+            print(
+                f"Lot exporté vers {args.output} : {summary['completed']} terminées, {summary['failed']} en erreur, "
+                f"{summary['skipped']} déjà faites"
+            )
+            return 0
+        simulation = run(
+            args.config, args.output, args.engine, args.grid_size, args.padding, args.frames, args.num_frames,
+            cache_directory, args.processes,
+        )
+        photons = None
+        if args.photons:
+            photons = simulation.sample_photons(args.photons, args.target_noise, max_workers=args.workers or 1)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        # RuntimeError couvre BrokenProcessPool : un processus de calcul a été arrêté brutalement
+        print(f"Erreur lors de la simulation : {e}", file=sys.stderr)
+        return 1
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Simulation ({simulation.diffraction_pattern.active_engine}) exportée vers {args.output} en {elapsed:.1f} ms")
+    if photons is not None:
+        line = f"Monte-Carlo : {photons['photons']} photons, bruit {photons['noise']:.2g}"
+        reference = simulation.diffraction_pattern.intensity_map
+        if reference is not None and reference.shape == photons["intensity"].shape:
+            line += f", écart maximal au moteur {abs(photons['intensity'] - reference).max():.2g}"
+        print(line)
+    if args.stats:
+        for name, record in sorted(simulation.stats().items()):
+            line = f"  {name:22s} {record['total_s'] * 1000:9.2f} ms  x{record['calls']}"
+            if record["peak_bytes"] is not None:
+                line += f"  pic {record['peak_bytes'] / 1024 ** 2:.1f} Mo"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+from functools import lru_cache
+
+import threading
+
+import numpy as np
+
+
+@lru_cache(maxsize=16)
+def _gaussian_correlation_modes(num_samples, width_in_samples):
+    """
+    Décompose le degré de cohérence gaussien 1D μ(x1 - x2) échantillonné sur num_samples points.
+
+    :param num_samples: Nombre d'échantillons de la grille 1D.
+    :param width_in_samples: Largeur de cohérence exprimée en pas d'échantillonnage.
+    :return: Tuple (valeurs propres décroissantes, vecteurs propres en colonnes), en lecture seule.
+    """
+    index = np.arange(num_samples)
+    kernel = np.exp(-((index[:, None] - index[None, :]) ** 2) / (2 * width_in_samples ** 2))
+    eigenvalues, eigenvectors = np.linalg.eigh(kernel)
+    eigenvalues = np.clip(eigenvalues[::-1], 0.0, None)
+    eigenvectors = np.ascontiguousarray(eigenvectors[:, ::-1])
+    eigenvalues.setflags(write=False)
+    eigenvectors.setflags(write=False)
+    return eigenvalues, eigenvectors
+
+
+class CoherentModeDecomposition:
+    """
+    Décompose l'éclairement partiellement cohérent de la pupille (modèle de Schell gaussien) en modes cohérents.
+
+    La pupille est éclairée uniformément avec un degré de cohérence μ(Δx, Δy) gaussien et séparable ;
+    les modes 2D sont les produits des modes propres 1D, pondérés par le produit de leurs valeurs propres.
+    """
+
+    def __init__(self, coherence_width, energy_threshold=0.99, max_modes=256):
+        """
+        Initialise une instance de la classe CoherentModeDecomposition.
+
+        :param coherence_width: Largeur de cohérence dans le plan de la pupille (en mètres).
+        :param energy_threshold: Fraction de l'énergie à conserver pour choisir le nombre de modes (de 0 à 1).
+        :param max_modes: Nombre maximal de modes conservés.
+        """
+        if coherence_width <= 0:
+            raise ValueError("La largeur de cohérence doit être positive.")
+        if not (0 < energy_threshold <= 1):
+            raise ValueError("Le seuil d'énergie doit être compris entre 0 et 1.")
+        self.coherence_width = coherence_width
+        self.energy_threshold = energy_threshold
+        self.max_modes = max_modes
+        self.captured_energy = None  # Fraction de l'énergie portée par les modes retenus
+
+    @classmethod
+    def from_light_source(cls, light_source, lens, energy_threshold=0.99, max_modes=256):
+        """
+        Crée la décomposition correspondant au degré de cohérence d'une source.
+
+        La largeur de cohérence vaut D * c / (1 - c), D étant l'ouverture et c le degré de cohérence :
+        c = 1 correspond à une source totalement cohérente (None est alors retourné).
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param energy_threshold: Fraction de l'énergie à conserver.
+        :param max_modes: Nombre maximal de modes conservés.
+        :return: Instance de CoherentModeDecomposition, ou None si la source est cohérente.
+        """
+        coherence = min(max(light_source.coherence, 1e-3), 1.0)
+        if coherence >= 1.0:
+            return None
+        return cls(lens.aperture * coherence / (1 - coherence), energy_threshold, max_modes)
+
+    def select_modes(self, num_samples, pitch):
+        """
+        Sélectionne les modes 2D de plus fortes valeurs propres jusqu'à atteindre le seuil d'énergie.
+
+        :param num_samples: Nombre d'échantillons de la pupille par côté.
+        :param pitch: Pas d'échantillonnage de la pupille (en mètres).
+        :return: Tuple (indices des modes en y, indices des modes en x, poids), triés par poids décroissant.
+        """
+        eigenvalues, _ = _gaussian_correlation_modes(num_samples, self.coherence_width / pitch)
+        total = eigenvalues.sum() ** 2
+
+        # Seuls les modes 1D significatifs peuvent contribuer aux modes 2D retenus
+        significant = int(np.searchsorted(-eigenvalues, -eigenvalues[0] * 1e-12)) or 1
+        weights = np.outer(eigenvalues[:significant], eigenvalues[:significant]).ravel()
+        order = np.argsort(weights)[::-1]
+        energy = np.cumsum(weights[order]) / total
+
+        count = int(np.searchsorted(energy, self.energy_threshold)) + 1
+        count = min(count, self.max_modes, len(order))
+        self.captured_energy = float(energy[count - 1])
+
+        selected = order[:count]
+        return selected // significant, selected % significant, weights[selected] / total
+
+    def mode_basis(self, num_samples, pitch):
+        """
+        Retourne les vecteurs propres 1D et les modes 2D retenus (voir select_modes).
+
+        :param num_samples: Nombre d'échantillons de la pupille par côté.
+        :param pitch: Pas d'échantillonnage de la pupille (en mètres).
+        :return: Tuple (vecteurs propres en colonnes, indices des modes en y, indices des modes en x, poids).
+        """
+        _, eigenvectors = _gaussian_correlation_modes(num_samples, self.coherence_width / pitch)
+        return (eigenvectors,) + self.select_modes(num_samples, pitch)
+
+    def iter_mode_chunks(self, pupil, pitch, chunk_size=8):
+        """
+        Génère les champs des modes sur la pupille par blocs, sans matérialiser tous les modes à la fois.
+
+        :param pupil: Tableau N×N de la pupille.
+        :param pitch: Pas d'échantillonnage de la pupille (en mètres).
+        :param chunk_size: Nombre de modes par bloc.
+        :return: Générateur de tuples (champs (k, N, N), poids (k,)).
+        """
+        eigenvectors, mode_y, mode_x, weights = self.mode_basis(pupil.shape[0], pitch)
+        for start in range(0, len(weights), chunk_size):
+            stop = start + chunk_size
+            yield mode_fields(eigenvectors, mode_y[start:stop], mode_x[start:stop], pupil), weights[start:stop]
+
+
+def mode_fields(eigenvectors, mode_y, mode_x, pupil):
+    """
+    Construit les champs de modes 2D sur la pupille, produits de modes propres 1D.
+
+    Les poids des modes sont des fractions d'énergie (λi λj / N²) : les vecteurs propres normés sont
+    remis à l'échelle par N pour que l'intensité incidente Σ poids * |mode|² vaille 1 sur la pupille.
+
+    :param eigenvectors: Vecteurs propres 1D en colonnes (N×N).
+    :param mode_y: Indices des modes en y.
+    :param mode_x: Indices des modes en x.
+    :param pupil: Tableau N×N de la pupille.
+    :return: Tableau (k, N, N) des champs.
+    """
+    fields = eigenvectors[:, mode_y].T[:, :, None] * eigenvectors[:, mode_x].T[:, None, :]
+    fields *= pupil * len(pupil)
+    return fields
+
+def sum_over_modes(chunks, compute_chunk, workers=1):
+    """
+    Somme les contributions de blocs de modes, en répartissant les blocs sur plusieurs threads.
+
+    Chaque thread tire ses blocs du générateur partagé et accumule sa propre somme partielle :
+    seuls `workers` blocs sont matérialisés à la fois. Les FFT de numpy libèrent le GIL.
+
+    :param chunks: Itérable de tuples (champs, poids).
+    :param compute_chunk: Fonction (champs, poids) -> tableau de la contribution pondérée du bloc.
+    :param workers: Nombre de threads.
+    :return: Somme des contributions de tous les blocs.
+    """
+    chunks = iter(chunks)
+    if workers <= 1:
+        total = None
+        for fields, weights in chunks:
+            contribution = compute_chunk(fields, weights)
+            total = contribution if total is None else total + contribution
+        return total
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    lock = threading.Lock()
+
+    def worker():
+        partial_sum = None
+        while True:
+            with lock:
+                chunk = next(chunks, None)
+            if chunk is None:
+                return partial_sum
+            contribution = compute_chunk(*chunk)
+            partial_sum = contribution if partial_sum is None else partial_sum + contribution
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        partial_sums = [future.result() for future in [executor.submit(worker) for _ in range(workers)]]
+    partial_sums = [partial_sum for partial_sum in partial_sums if partial_sum is not None]
+    return sum(partial_sums[1:], partial_sums[0]) if partial_sums else None
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     from lens import Lens
+#     from light_source import LightSource
+
+#     lens = Lens(focal_length=0.1, curvature_radius=0.01, refractive_index=1.5)
+#     light_source = LightSource(wavelength=550e-9, coherence=0.5)
+#     decomposition = CoherentModeDecomposition.from_light_source(light_source, lens)
+
+#     mode_y, mode_x, weights = decomposition.select_modes(num_samples=256, pitch=lens.aperture / 256)
+#     print("Modes retenus:", len(weights), "Énergie conservée:", decomposition.captured_energy)
@@ -43,6 +43,8 @@ class ControlPanel(QWidget):
         # Boutons
         self.apply_button = QPushButton("Apply")
         self.reset_button = QPushButton("Reset")
+        self.animate_button = QPushButton("Animate Phase")
+        self.animate_button.setCheckable(True)
 
         # Organisation
         self.layout.addWidget(QLabel("Lens Parameters"))
@@ -51,6 +53,7 @@ class ControlPanel(QWidget):
         self.layout.addLayout(self.light_controls)
         self.layout.addWidget(self.apply_button)
         self.layout.addWidget(self.reset_button)
+        self.layout.addWidget(self.animate_button)
 
     def get_lens_parameters(self):
         """
@@ -76,15 +79,18 @@ class ControlPanel(QWidget):
             "intensity": self.light_intensity.value() / 100.0,  # Normalisé entre 0 et 1
         }
 
-    def connect_signals(self, apply_callback, reset_callback):
+    def connect_signals(self, apply_callback, reset_callback, animate_callback=None):
         """
         Connecte les boutons aux fonctions de rappel.
 
         :param apply_callback: Fonction appelée lors du clic sur "Apply".
         :param reset_callback: Fonction appelée lors du clic sur "Reset".
+        :param animate_callback: Fonction appelée avec l'état du bouton "Animate Phase" (optionnel).
         """
         self.apply_button.clicked.connect(apply_callback)
         self.reset_button.clicked.connect(reset_callback)
+        if animate_callback is not None:
+            self.animate_button.toggled.connect(animate_callback)
 
     def set_parameters(self, lens_params, light_params):
         """
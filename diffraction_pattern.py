@@ -1,54 +1,910 @@
 import numpy as np
 
+from adaptive_sampling import locate_extrema, refine_profile, render_profile
+from angular_spectrum import BYTES_PER_SAMPLE, AngularSpectrumPropagator
+from coherence import CoherentModeDecomposition, sum_over_modes
+from diffraction_spot import SPOT_DTYPE, calculate_intensities, make_spot_table
+from fraunhofer_engine import FraunhoferEngine
+from grating import grating_intensity, grating_pixel_intensity
+from hankel_engine import HankelEngine
+from instrumentation import instrumentation
+from parallel_propagation import propagate_near_field
+from photon_sampling import PhotonSampler, run_photon_sampling
+
+# Ordres de diffraction calculés analytiquement (-10 à +10)
+DEFAULT_ORDERS = np.arange(-10, 11)
+
+# Version des moteurs de calcul : à incrémenter lorsqu'une modification change leurs résultats
+# (les résultats mis en cache par une version précédente sont alors invalidés)
+ENGINE_VERSION = 1
+
+# Moteurs FFT partagés entre les motifs, afin de réutiliser leurs tampons d'un calcul à l'autre
+_fraunhofer_engines = {}
+
+# Moteurs de Hankel partagés, indexés par nombre d'échantillons radiaux
+_hankel_engines = {}
+
+
+def get_fraunhofer_engine(grid_size, padding):
+    """
+    Retourne le moteur de Fraunhofer partagé pour une taille de grille et un bourrage donnés.
+
+    :param grid_size: Nombre d'échantillons de la pupille par côté.
+    :param padding: Facteur de bourrage de zéros.
+    :return: Instance de FraunhoferEngine.
+    """
+    key = (grid_size, padding)
+    if key not in _fraunhofer_engines:
+        _fraunhofer_engines[key] = FraunhoferEngine(grid_size, padding)
+    return _fraunhofer_engines[key]
+
+
+def get_hankel_engine(num_samples):
+    """
+    Retourne le moteur de Hankel partagé pour un nombre d'échantillons radiaux donné.
+
+    :param num_samples: Nombre d'échantillons radiaux.
+    :return: Instance de HankelEngine.
+    """
+    if num_samples not in _hankel_engines:
+        _hankel_engines[num_samples] = HankelEngine(num_samples)
+    return _hankel_engines[num_samples]
+
+
+def compute_order_positions(wavelength, aperture, screen_distance, orders=DEFAULT_ORDERS):
+    """
+    Calcule les positions des maxima principaux sin(θ) = mλ / a, par diffusion (broadcasting) numpy.
+
+    Les paramètres peuvent être des scalaires ou des tableaux de formes compatibles ; l'axe des ordres
+    est ajouté en dernière dimension. Les ordres sans solution (|sin(θ)| > 1) valent NaN.
+
+    :param wavelength: Longueur(s) d'onde (en mètres).
+    :param aperture: Ouverture(s) (en mètres).
+    :param screen_distance: Distance(s) lentille-écran (en mètres).
+    :param orders: Ordres de diffraction.
+    :return: Tableau des positions sur l'écran (en mètres), de forme (..., len(orders)).
+    """
+    wavelength, aperture, screen_distance = np.broadcast_arrays(
+        np.asarray(wavelength, dtype=np.float64),
+        np.asarray(aperture, dtype=np.float64),
+        np.asarray(screen_distance, dtype=np.float64),
+    )
+    sin_theta = np.asarray(orders) * (wavelength / aperture)[..., None]
+    sin_theta = np.where(np.abs(sin_theta) <= 1, sin_theta, np.nan)
+
+    # Conversion en positions sur l'écran : x = L * tan(θ)
+    return screen_distance[..., None] * np.tan(np.arcsin(sin_theta))
+
+
 class DiffractionPattern:
     """
     Représente le motif de diffraction observé après le passage de la lumière à travers une lentille.
     """
 
-    def __init__(self, screen_distance, pattern_type="monochromatic"):
+    ENGINES = ("analytic", "fft", "angular_spectrum", "hankel", "auto")
+
+    # Exécution parallèle : threads (modes cohérents) ou pool de processus en mémoire partagée (champ proche)
+    BACKENDS = ("threads", "processes")
+
+    # Au-delà de ce nombre de Fresnel, l'approximation de Fraunhofer n'est plus valable
+    FRESNEL_NUMBER_LIMIT = 1.0
+
+    # Étapes du calcul, dans l'ordre : chacune ne dépend que des résultats des précédentes
+    STAGES = ("pupil", "field", "intensity", "screen")
+
+    def __init__(self, screen_distance, pattern_type="monochromatic", engine="auto", grid_size=256, padding=2,
+                 max_chunk_bytes=256 * 1024 ** 2, workers=1, backend="threads"):
         """
         Initialise une instance de la classe DiffractionPattern.
 
         :param screen_distance: Distance entre la lentille et l'écran d'observation (en mètres).
         :param pattern_type: Type de motif de diffraction ("monochromatic", "multi-slit", etc.).
+        :param engine: Moteur de calcul du champ ("analytic" pour les ordres seuls, "fft" pour le champ lointain 2D,
+                       "angular_spectrum" pour le champ proche 2D, "hankel" pour le profil radial d'un système
+                       à symétrie de révolution, "auto" pour choisir selon la symétrie et le nombre de Fresnel).
+        :param grid_size: Nombre d'échantillons de la pupille par côté.
+        :param padding: Facteur de bourrage de zéros de la grille de calcul.
+        :param max_chunk_bytes: Mémoire de travail maximale d'un bloc de longueurs d'onde (sources polychromatiques).
+        :param workers: Nombre de threads utilisés pour propager les modes cohérents (sources partiellement cohérentes),
+                        ou de processus avec le backend "processes".
+        :param backend: "threads", ou "processes" pour répartir la propagation du champ proche (longueurs d'onde,
+                        modes cohérents) sur un pool persistant de processus en mémoire partagée.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Moteur de calcul inconnu : {engine}.")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Mode d'exécution parallèle inconnu : {backend}.")
         self.screen_distance = screen_distance
         self.pattern_type = pattern_type
-        self.spots = []  # Liste des spots de diffraction calculés
+        self.engine = engine
+        self.grid_size = grid_size
+        self.padding = padding
+        self.max_chunk_bytes = max_chunk_bytes
+        self.workers = workers
+        self.backend = backend
+        self.active_engine = None  # Moteur effectivement utilisé lors du dernier calcul
+        self.mode_decomposition = None  # Décomposition en modes cohérents utilisée lors du dernier calcul
+        self.spots = np.empty(0, dtype=SPOT_DTYPE)  # Table des spots de diffraction calculés (order, angle, position, intensity)
+        self.intensity_map = None  # Intensité 2D sur l'écran (développée à la demande pour le moteur de Hankel)
+        self.profile = None  # Profil 1D de l'intensité le long de x (réseaux de fentes)
+        self.radial_profile = None  # Intensité en fonction du rayon (moteur de Hankel)
+        self.radial_positions = None  # Rayons sur l'écran associés à radial_profile (en mètres)
+        self.screen_x = None  # Coordonnées de l'écran le long des colonnes (en mètres)
+        self.screen_y = None  # Coordonnées de l'écran le long des lignes (en mètres)
+        self.complex_field = None  # Tuple (champ complexe, positions) de compute_complex_field, jusqu'au calcul suivant
+
+        # Résultats intermédiaires réutilisés par run_stages
+        self.pupil = None  # Tuple (pupille, pas) de l'étape "pupil"
+        self.normalized_intensity = None  # Intensité normalisée (maximum à 1) de l'étape "field"
+        self._screen_axis = None  # Tuple (axe de l'écran, True si angulaire) de l'étape "field"
+        self._radial_axis = None  # Tuple (rayons, True si angulaires) de l'étape "field" (moteur de Hankel)
+        self._distance_dependent = False  # True si le champ de l'étape "field" dépend de la distance de l'écran
+        self._grating_level = None  # Tuple (paramètres, intensité, échantillonnage ponctuel) du dernier profil de réseau
 
-    def calculate_pattern(self, light_source, lens):
+    def calculate_pattern(self, light_source, lens, options=None):
         """
         Calcule le motif de diffraction basé sur la source lumineuse et la lentille.
 
         :param light_source: Instance de LightSource.
         :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        """
+        self.run_stages(light_source, lens, options)
+
+    def run_stages(self, light_source, lens, options=None, start="pupil"):
+        """
+        Recalcule le motif à partir d'une étape, en réutilisant les résultats intermédiaires des étapes précédentes.
+
+        Étapes : "pupil" (échantillonnage de la pupille), "field" (intensité normalisée du moteur),
+        "intensity" (mise à l'échelle par l'intensité de la source), "screen" (axes de l'écran et spots).
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :param start: Première étape à recalculer.
+        """
+        if start not in self.STAGES:
+            raise ValueError(f"Étape de calcul inconnue : {start}.")
+        if lens.aperture == 0 or self.screen_distance == 0:
+            raise ValueError("Les dimensions de l'ouverture ou la distance de l'écran sont invalides.")
+
+        stages = self.STAGES[self.STAGES.index(start):]
+        self.complex_field = None
+        if "pupil" in stages:
+            # La pupille est échantillonnée à la demande par les moteurs qui en ont besoin
+            self.pupil = None
+        if "field" in stages:
+            with instrumentation.stage("pattern.field"):
+                self.compute_field(light_source, lens, options)
+        if "intensity" in stages:
+            with instrumentation.stage("pattern.intensity"):
+                self.apply_intensity(light_source)
+        if "screen" in stages:
+            with instrumentation.stage("pattern.screen"):
+                self.map_to_screen(light_source, lens, options)
+
+    def compute_field(self, light_source, lens, options=None):
+        """
+        Étape "field" : choisit le moteur et calcule l'intensité normalisée (maximum à 1) et l'axe de l'écran associé.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        """
+        if options is not None and options.multi_slit_enabled:
+            self.calculate_grating(light_source, options)
+            return
+
+        # La cohérence partielle n'est prise en compte que si elle est activée dans les options avancées
+        self.mode_decomposition = None
+        if options is not None and options.coherence_enabled:
+            self.mode_decomposition = CoherentModeDecomposition.from_light_source(light_source, lens)
+
+        self.active_engine = self.resolve_engine(light_source, lens)
+        self._radial_axis = None
+        self._distance_dependent = self.active_engine == "angular_spectrum"
+        if self.active_engine == "fft":
+            self.calculate_field(light_source, lens)
+        elif self.active_engine == "angular_spectrum":
+            self.calculate_near_field(light_source, lens)
+        elif self.active_engine == "hankel":
+            self.calculate_radial_field(light_source, lens)
+        else:
+            self.normalized_intensity = None
+            self._screen_axis = None
+
+    def apply_intensity(self, light_source):
+        """
+        Étape "intensity" : met à l'échelle l'intensité normalisée par l'intensité de la source.
+
+        :param light_source: Instance de LightSource.
+        """
+        self.profile = None
+        self.radial_profile = None
+        if self.normalized_intensity is None:
+            self.intensity_map = None
+        elif self.active_engine == "hankel":
+            # L'image 2D n'est développée qu'à la première lecture de intensity_map
+            self.radial_profile = self.normalized_intensity * light_source.intensity
+            self.intensity_map = None
+        elif self.active_engine == "grating":
+            # Les fentes sont invariantes selon y : le champ 2D est une vue diffusée du profil, sans copie
+            self.profile = self.normalized_intensity * light_source.intensity
+            self.intensity_map = np.broadcast_to(self.profile, (len(self.profile), len(self.profile)))
+        else:
+            self.intensity_map = self.normalized_intensity * light_source.intensity
+
+    def map_to_screen(self, light_source, lens, options=None):
+        """
+        Étape "screen" : calcule les coordonnées de l'écran et les spots des ordres de diffraction.
+
+        Les axes des moteurs de champ lointain sont angulaires (tan θ) et sont simplement remis à
+        l'échelle par la distance de l'écran ; l'axe du champ proche est déjà en mètres.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
         """
-        # Exemple simplifié : calcul des positions des maxima principaux (monochromatique, fente unique)
         wavelength = light_source.wavelength
-        aperture_size = lens.curvature_radius  # Supposons que le rayon de courbure est lié à l'ouverture
+        spacing = options.slit_spacing if self.active_engine == "grating" else lens.aperture
+
+        # Calcul des positions des maxima principaux, en ne gardant que les angles valides (|sin(θ)| <= 1)
+        positions = compute_order_positions(wavelength, spacing, self.screen_distance)
+        valid = ~np.isnan(positions)
+        m_values = DEFAULT_ORDERS[valid]
+        sin_theta = m_values * wavelength / spacing
+        if self.active_engine == "grating":
+            # Ordres du réseau : sin(θ) = mλ / d, d'intensité donnée par l'enveloppe de la fente unique
+            intensities = light_source.intensity * np.sinc(options.slit_width * sin_theta / wavelength) ** 2
+        else:
+            intensities = calculate_intensities(light_source.intensity, m_values)
+
+        # Stocker les spots de diffraction dans une table structurée (une ligne par ordre)
+        self.spots = make_spot_table(m_values, np.arcsin(sin_theta), positions[valid], intensities)
+
+        self.radial_positions = None
+        if self._radial_axis is not None:
+            radii, angular = self._radial_axis
+            self.radial_positions = radii * self.screen_distance if angular else radii
+
+        if self._screen_axis is None:
+            self.screen_x = None
+            self.screen_y = None
+            return
+        axis, angular = self._screen_axis
+        positions = axis * self.screen_distance if angular else axis
+        self.screen_x = positions
+        self.screen_y = positions
+
+    @property
+    def intensity_map(self):
+        """
+        Intensité 2D sur l'écran. Pour le moteur de Hankel, elle est développée à partir du profil
+        radial à la première lecture, puis conservée jusqu'au calcul suivant.
+        """
+        if self._intensity_map is None and self.radial_profile is not None and self.screen_x is not None:
+            self._intensity_map = self.expand_radial_profile()
+        return self._intensity_map
+
+    @intensity_map.setter
+    def intensity_map(self, value):
+        self._intensity_map = value
+
+    def expand_radial_profile(self):
+        """
+        Développe le profil radial en image 2D sur la grille de l'écran (interpolation linéaire en r).
+
+        :return: Tableau 2D de l'intensité, nul au-delà du dernier rayon calculé.
+        """
+        radius = np.hypot(self.screen_y[:, None], self.screen_x[None, :])
+        return np.interp(radius, self.radial_positions, self.radial_profile, right=0.0)
+
+    def field_state(self):
+        """
+        Retourne les résultats de l'étape "field", sous une forme sérialisable (tableaux et scalaires).
+
+        Les étapes "intensity" et "screen" se recalculent à partir de ces seuls résultats (voir restore_field_state).
+
+        :return: Dictionnaire des résultats de l'étape "field".
+        """
+        state = {
+            "active_engine": self.active_engine,
+            "pattern_type": self.pattern_type,
+            "distance_dependent": self._distance_dependent,
+            "normalized_intensity": self.normalized_intensity,
+        }
+        for name, axis in (("screen_axis", self._screen_axis), ("radial_axis", self._radial_axis)):
+            state[name] = None if axis is None else axis[0]
+            state[f"{name}_angular"] = None if axis is None else bool(axis[1])
+        return state
+
+    def restore_field_state(self, state, light_source, lens, options=None):
+        """
+        Restaure les résultats de l'étape "field" retournés par field_state (par exemple depuis un cache).
+
+        :param state: Dictionnaire retourné par field_state.
+        :param light_source: Instance de LightSource (pour reconstruire la décomposition en modes cohérents).
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        """
+        self.active_engine = state["active_engine"]
+        self.pattern_type = state["pattern_type"]
+        self._distance_dependent = bool(state["distance_dependent"])
+        self.normalized_intensity = state.get("normalized_intensity")
+        for name in ("screen_axis", "radial_axis"):
+            axis = state.get(name)
+            setattr(self, f"_{name}", None if axis is None else (axis, bool(state[f"{name}_angular"])))
+
+        # La décomposition intervient dans le choix du moteur lors des mises à jour suivantes
+        self.mode_decomposition = None
+        if self.active_engine != "grating" and options is not None and options.coherence_enabled:
+            self.mode_decomposition = CoherentModeDecomposition.from_light_source(light_source, lens)
+
+    def field_depends_on_distance(self, light_source, lens):
+        """
+        Indique si l'étape "field" doit être recalculée lorsque seule la distance de l'écran change.
+
+        C'est le cas du champ proche, ou lorsque le mode "auto" change de moteur avec la nouvelle distance ;
+        en champ lointain, un changement de distance n'est qu'une remise à l'échelle de l'axe de l'écran.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :return: True si le champ dépend de la distance de l'écran.
+        """
+        if self.active_engine == "grating":
+            return False
+        return self._distance_dependent or self.engine_changed(light_source, lens)
+
+    def engine_changed(self, light_source, lens):
+        """
+        Indique si le moteur choisi pour les paramètres actuels diffère de celui du dernier calcul.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :return: True si l'étape "field" doit être recalculée avec un autre moteur.
+        """
+        if self.active_engine in (None, "grating"):
+            return False
+        if self.active_engine == "hankel" and self.resolve_engine(light_source, lens) == "hankel":
+            # Le moteur de Hankel passe lui-même du champ lointain au champ proche selon le nombre de Fresnel
+            near_field = self.fresnel_number(light_source, lens) >= self.FRESNEL_NUMBER_LIMIT
+            return near_field != self._distance_dependent
+        return self.resolve_engine(light_source, lens) != self.active_engine
+
+    def calculate_grating(self, light_source, options):
+        """
+        Calcule le profil d'un réseau de N fentes par la forme fermée sin²(Nφ/2)/sin²(φ/2) × enveloppe de la fente.
+
+        Le profil est évalué sur une grille dense de l'écran couvrant le lobe central de l'enveloppe et
+        le lobe suivant. La grille est uniforme en tan(θ), si bien que le profil ne dépend pas de la
+        distance de l'écran. Les pixels plus larges que les maxima principaux reçoivent l'intensité
+        moyenne sur leur largeur, en forme fermée (voir grating_pixel_intensity) : le coût ne dépend pas
+        du nombre de fentes.
+
+        :param light_source: Instance de LightSource.
+        :param options: Instance de AdvancedOptions (multi_slit_enabled).
+        """
+        self.pattern_type = "multi-slit"
+        self.active_engine = "grating"
+        self.mode_decomposition = None
+        spectrum = light_source.get_spectrum()
+        slit_width, slit_spacing, num_slits = options.slit_width, options.slit_spacing, options.num_slits
+
+        # Grille de l'écran jusqu'au deuxième zéro de l'enveloppe (sin(θ) = 2λ / a), avec un nombre
+        # impair d'échantillons pour que le maximum central soit échantillonné exactement
+        max_sin = min(0.99, 2 * spectrum.wavelengths.max() / slit_width)
+        max_tan = np.tan(np.arcsin(max_sin))
+        tan_screen = np.linspace(-max_tan, max_tan, self.grid_size * self.padding + 1)
+        half_pixel = (tan_screen[1] - tan_screen[0]) / 2
+        sin_lower, sin_upper = (
+            edges / np.hypot(edges, 1.0) for edges in (tan_screen - half_pixel, tan_screen + half_pixel)
+        )
+
+        # Une grille plus grossière dont les intervalles divisent ceux-ci est un sous-ensemble de la grille :
+        # ses valeurs (raffinement progressif) sont reprises et seuls les nouveaux points sont évalués, si
+        # elles ne dépendent pas de la largeur de ses pixels (tous plus étroits que les maxima principaux)
+        key = (spectrum.wavelengths.tobytes(), spectrum.weights.tobytes(), slit_width, slit_spacing, num_slits)
+        intensity = np.empty(len(tan_screen))
+        missing = np.ones(len(tan_screen), dtype=bool)
+        if self._grating_level is not None and self._grating_level[0] == key and self._grating_level[2]:
+            coarse = self._grating_level[1]
+            step, remainder = divmod(len(tan_screen) - 1, len(coarse) - 1)
+            if step >= 1 and remainder == 0:
+                intensity[::step] = coarse
+                missing[::step] = False
+
+        intensity[missing] = np.tensordot(
+            spectrum.weights,
+            grating_pixel_intensity(
+                sin_lower[None, missing], sin_upper[None, missing], spectrum.wavelengths[:, None],
+                slit_width, slit_spacing, num_slits,
+            ),
+            axes=1,
+        )
+        peak_width = spectrum.wavelengths.min() / (num_slits * slit_spacing)
+        point_sampled = peak_width >= (sin_upper - sin_lower).max()
+        self._grating_level = (key, intensity, point_sampled)
+        self.normalized_intensity = intensity
+        self._screen_axis = (tan_screen, True)
+
+    def fresnel_number(self, light_source, lens):
+        """
+        Calcule le nombre de Fresnel N_F = (D/2)² / (λ z) de la configuration.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :return: Nombre de Fresnel.
+        """
+        return (lens.aperture / 2) ** 2 / (light_source.wavelength * self.screen_distance)
+
+    def is_radially_symmetric(self, light_source, lens):
+        """
+        Indique si le système est à symétrie de révolution : lentille circulaire, source sur l'axe et cohérente.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :return: True si le moteur de Hankel s'applique.
+        """
+        # La position est (x le long de l'axe optique, y transverse) : seule l'ordonnée brise la symétrie
+        on_axis = np.ravel(light_source.position)[1] == 0
+        return lens.shape == "circular" and on_axis and self.mode_decomposition is None
+
+    def resolve_engine(self, light_source, lens):
+        """
+        Détermine le moteur à utiliser : en mode "auto", Hankel pour un système à symétrie de révolution,
+        sinon Fraunhofer si N_F < 1 et spectre angulaire au-delà.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :return: Nom du moteur ("analytic", "fft", "angular_spectrum" ou "hankel").
+        """
+        if self.engine == "hankel" and not self.is_radially_symmetric(light_source, lens):
+            raise ValueError("Le moteur de Hankel nécessite une lentille circulaire et une source cohérente sur l'axe.")
+        if self.engine != "auto":
+            return self.engine
+        if self.is_radially_symmetric(light_source, lens):
+            return "hankel"
+        if self.fresnel_number(light_source, lens) < self.FRESNEL_NUMBER_LIMIT:
+            return "fft"
+        return "angular_spectrum"
+
+    def calculate_field(self, light_source, lens):
+        """
+        Calcule l'intensité 2D normalisée par FFT de la pupille échantillonnée (approximation de Fraunhofer).
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        """
+        engine = get_fraunhofer_engine(self.grid_size, self.padding)
+        pupil, pitch = self.sample_pupil(lens)
+        if self.mode_decomposition is None:
+            intensity = engine.compute(pupil)
+        else:
+            intensity = engine.compute_incoherent(self.mode_decomposition.iter_mode_chunks(pupil, pitch), self.workers)
+
+        # Le spectre de la pupille ne dépend pas de λ : chaque longueur d'onde en est une remise à l'échelle
+        spectrum = light_source.get_spectrum()
+        reference = spectrum.mean_wavelength
+        if len(spectrum) > 1:
+            intensity = self._sum_rescaled_intensities(intensity, spectrum, reference)
+
+        # Correspondance paraxiale fréquence spatiale -> position sur l'écran : x = λ z f
+        self.normalized_intensity = intensity
+        self._screen_axis = (engine.frequency_axis(pitch) * reference, True)
+
+    def calculate_near_field(self, light_source, lens):
+        """
+        Calcule l'intensité 2D sur l'écran par propagation du spectre angulaire (champ proche).
+
+        La pupille est centrée dans une grille bourrée de zéros ; l'écran est échantillonné avec le même pas.
+        L'intensité est normalisée par rapport à l'onde plane incidente.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        """
+        pupil, pitch = self.sample_pupil(lens)
+        n = self.grid_size
+        m = n * self.padding
+        offset = (m - n) // 2
+
+        propagator = AngularSpectrumPropagator()
+        spectrum = light_source.get_spectrum()
+        chunk_length = self._chunk_length(m * m * BYTES_PER_SAMPLE)
+
+        def propagate_modes(mode_fields, mode_weights):
+            intensity = np.zeros((m, m))
+            for mode_field, mode_weight in zip(mode_fields, mode_weights):
+                field = np.zeros((m, m), dtype=np.complex128)
+                field[offset:offset + n, offset:offset + n] = mode_field
+                # Somme incohérente sur les longueurs d'onde, par blocs propagés en une seule FFT batchée
+                propagator.accumulate_intensity(
+                    intensity, field, pitch, spectrum.wavelengths, mode_weight * spectrum.weights,
+                    self.screen_distance, chunk_length,
+                )
+            return intensity
+
+        if self.backend == "processes" and self.workers > 1:
+            intensity = propagate_near_field(
+                pupil, pitch, m, spectrum.wavelengths, spectrum.weights, self.screen_distance,
+                self.mode_decomposition, self.workers, chunk_length,
+            )
+        elif self.mode_decomposition is None:
+            intensity = propagate_modes([pupil], [1.0])
+        else:
+            intensity = sum_over_modes(
+                self.mode_decomposition.iter_mode_chunks(pupil, pitch), propagate_modes, self.workers
+            )
+
+        self.normalized_intensity = intensity
+        self._screen_axis = ((np.arange(m) - (offset + (n - 1) / 2)) * pitch, False)
+
+    def calculate_radial_field(self, light_source, lens):
+        """
+        Calcule le profil radial de l'intensité par transformée de Hankel quasi-discrète (symétrie de révolution).
+
+        La grille radiale compte grid_size * padding / 2 points et couvre padding fois le rayon de la pupille,
+        ce qui correspond à la résolution et à l'étendue du moteur FFT pour un coût en N² au lieu de (2N)² log N.
+        En champ lointain (N_F < 1), l'intensité est normalisée à 1 ; en champ proche, le spectre est propagé
+        (fonction de transfert limitée en bande) et l'intensité est relative à l'onde plane incidente.
 
-        if aperture_size == 0 or self.screen_distance == 0:
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        """
+        num_samples = max(1, self.grid_size * self.padding // 2)
+        engine = get_hankel_engine(num_samples)
+        pupil_radius = lens.aperture / 2
+        radius = pupil_radius * self.padding
+        radii, frequencies = engine.grid(radius)
+        field_spectrum = engine.forward((radii <= pupil_radius).astype(np.float64), radius)
+
+        spectrum = light_source.get_spectrum()
+        reference = spectrum.mean_wavelength
+        self._distance_dependent = self.fresnel_number(light_source, lens) >= self.FRESNEL_NUMBER_LIMIT
+        if self._distance_dependent:
+            intensity = np.zeros(num_samples)
+            # Par rayon et longueur d'onde : fonction de transfert et sa construction (49), produit par le
+            # spectre (16), transformée inverse et ses mises à l'échelle (3 × 16), puis |E|² (24)
+            for wavelengths, weights in spectrum.chunks(self._chunk_length(num_samples * 144)):
+                transfer = engine.transfer_functions(frequencies, wavelengths, self.screen_distance, radius)
+                fields = engine.inverse(field_spectrum[:, None] * transfer, radius)
+                intensity += (fields.real ** 2 + fields.imag ** 2) @ weights
+            axis, angular = radii, False
+        else:
+            # La grille radiale ne contient pas l'axe : la valeur sur l'axe, F(0) = π a², est ajoutée
+            frequencies = np.concatenate(([0.0], frequencies))
+            power = np.concatenate(([(np.pi * pupil_radius ** 2) ** 2], field_spectrum ** 2))
+            if len(spectrum) > 1:
+                # À λ, l'intensité au rayon ν (référence) est celle du spectre en ν * (référence / λ)
+                scales = reference / spectrum.wavelengths
+                intensity = np.zeros(len(frequencies))
+                for scale, weight in zip(scales, spectrum.weights):
+                    intensity += weight * scale ** 2 * np.interp(frequencies * scale, frequencies, power, right=0.0)
+            else:
+                intensity = power
+            intensity = intensity / intensity.max()
+
+            # Correspondance paraxiale fréquence radiale -> rayon sur l'écran : ρ = λ z ν
+            axis, angular = frequencies * reference, True
+
+        # Image 2D de grid_size * padding (+1 pour centrer l'axe) points par côté, développée à la demande
+        self.normalized_intensity = intensity
+        self._radial_axis = (axis, angular)
+        size = self.grid_size * self.padding
+        self._screen_axis = (np.linspace(-axis[-1], axis[-1], size + 1 - size % 2), angular)
+
+    def compute_complex_field(self, light_source, lens, options=None):
+        """
+        Calcule le champ complexe 2D sur l'écran à la longueur d'onde moyenne de la source (source cohérente).
+
+        En champ lointain (N_F < 1), le champ est la transformée de Fourier de la pupille, normalisée à
+        une amplitude maximale de 1 ; au-delà, la pupille est propagée par le spectre angulaire et le
+        champ est relatif à l'onde plane incidente. Les réseaux de fentes n'ont pas de pupille 2D et
+        une source partiellement cohérente n'a pas de champ unique : ces cas sont refusés. Le résultat
+        est conservé dans complex_field jusqu'au calcul suivant du motif.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :return: Tuple (champ complexe M×M, coordonnées de l'écran le long des deux axes en mètres).
+        """
+        if options is not None and (options.multi_slit_enabled or options.coherence_enabled):
+            raise ValueError("Le champ complexe n'est disponible que pour une lentille et une source cohérente.")
+        if lens.aperture == 0 or self.screen_distance == 0:
             raise ValueError("Les dimensions de l'ouverture ou la distance de l'écran sont invalides.")
+        if self.complex_field is not None:
+            return self.complex_field
+
+        wavelength = light_source.get_spectrum().mean_wavelength
+        pupil, pitch = self.sample_pupil(lens)
+        with instrumentation.stage("pattern.complex_field"):
+            if self.fresnel_number(light_source, lens) < self.FRESNEL_NUMBER_LIMIT:
+                engine = get_fraunhofer_engine(self.grid_size, self.padding)
+                field = engine.compute_field(pupil)
+                positions = engine.frequency_axis(pitch) * wavelength * self.screen_distance
+            else:
+                n = self.grid_size
+                m = n * self.padding
+                offset = (m - n) // 2
+                aperture_field = np.zeros((m, m), dtype=np.complex128)
+                aperture_field[offset:offset + n, offset:offset + n] = pupil
+                field = AngularSpectrumPropagator().propagate(aperture_field, pitch, wavelength, self.screen_distance)
+                positions = (np.arange(m) - (offset + (n - 1) / 2)) * pitch
+        self.complex_field = (field, positions)
+        return self.complex_field
+
+    def profile_function(self, light_source, lens, options=None):
+        """
+        Construit la fonction d'intensité du champ lointain le long de l'axe x de l'écran (y = 0),
+        évaluable en des positions arbitraires sans passer par une grille.
+
+        - réseau de fentes : forme fermée enveloppe × facteur de réseau ;
+        - lentille circulaire ou elliptique : figure d'Airy (2 J1(u) / u)², u = π D sin(θ) / λ, le profil
+          d'une ellipse le long de son grand axe étant celui du disque de même diamètre ;
+        - masque personnalisé : transformée de Fourier 1D de la projection de la pupille sur l'axe x.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :return: Tuple (fonction position -> intensité normalisée à 1 au centre, largeur caractéristique
+                 d'une frange en sin(θ), sinus des maxima principaux connus).
+        """
+        if options is not None and options.coherence_enabled:
+            raise ValueError("L'échantillonnage adaptatif nécessite une source cohérente.")
+        if self.fresnel_number(light_source, lens) >= self.FRESNEL_NUMBER_LIMIT:
+            raise ValueError("L'échantillonnage adaptatif n'est disponible qu'en champ lointain (N_F < 1).")
+
+        spectrum = light_source.get_spectrum()
+        wavelengths, weights = spectrum.wavelengths[:, None], spectrum.weights
+
+        def sin_theta(positions):
+            tan_theta = np.asarray(positions, dtype=np.float64) / self.screen_distance
+            return tan_theta / np.hypot(tan_theta, 1.0)
+
+        if options is not None and options.multi_slit_enabled:
+            slit_width, slit_spacing, num_slits = options.slit_width, options.slit_spacing, options.num_slits
+
+            def function(positions):
+                sines = sin_theta(positions)[None, :]
+                return weights @ grating_intensity(sines, wavelengths, slit_width, slit_spacing, num_slits)
+
+            peaks = (DEFAULT_ORDERS[None, :] * wavelengths / slit_spacing).ravel()
+            return function, spectrum.wavelengths.min() / slit_spacing, peaks[np.abs(peaks) < 1]
+
+        if lens.shape == "custom":
+            pupil, pitch = self.sample_pupil(lens)
+            projection = pupil.sum(axis=0, dtype=np.float64)
+            coords = (np.arange(len(projection)) - (len(projection) - 1) / 2) * pitch
+            on_axis = projection.sum() ** 2
+
+            def function(positions):
+                # Intensité à λ : |P(sin(θ) / λ)|², P étant la transformée de la projection de la pupille
+                frequencies = sin_theta(positions)[None, :, None] / wavelengths[:, :, None]
+                field = np.exp(-2j * np.pi * frequencies * coords) @ projection
+                return weights @ (field.real ** 2 + field.imag ** 2) / on_axis
+        else:
+            from scipy.special import j1
 
-        # Calcul des angles des maxima principaux : sin(θ) = mλ / a
-        m_values = np.arange(-10, 11)  # Ordres de diffraction (-10 à +10)
-        angles = m_values * wavelength / aperture_size
-        
-        # Filtrer les angles valides (|sin(θ)| <= 1)
-        valid_angles = angles[np.abs(angles) <= 1]
-
-        # Convertir en positions sur l'écran : x = L * tan(θ)
-        positions = self.screen_distance * np.tan(np.arcsin(valid_angles))
-
-        # Stocker les spots de diffraction
-        self.spots = [
-            {
-                "order": m,
-                "position": pos,
-                "intensity": light_source.intensity * (np.cos(np.pi * m) ** 2),  # Exemple d'intensité
+            def function(positions):
+                u = np.pi * lens.aperture * sin_theta(positions)[None, :] / wavelengths
+                safe = np.where(u == 0, 1.0, u)
+                return weights @ np.where(u == 0, 1.0, (2 * j1(safe) / safe) ** 2)
+
+        return function, spectrum.wavelengths.min() / lens.aperture, np.zeros(1)
+
+    def sample_adaptive(self, light_source, lens, options=None, tolerance=1e-3, position_tolerance=None,
+                        max_sin=None):
+        """
+        Échantillonne adaptativement le profil d'intensité le long de l'axe x de l'écran (champ lointain).
+
+        L'échantillonnage part d'une grille grossière (quatre points par frange) et ne raffine que les
+        intervalles mal interpolés ; les minima et maxima des franges sont ensuite localisés à
+        position_tolerance près. Le profil est aussi interpolé sur une grille régulière de
+        grid_size * padding + 1 points pour l'affichage.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :param tolerance: Erreur d'interpolation tolérée sur l'intensité normalisée.
+        :param position_tolerance: Précision sur la position des extrema (en mètres, par défaut 1e-6 de l'étendue).
+        :param max_sin: Sinus de l'angle maximal échantillonné (par défaut, dix franges ou deux lobes de l'enveloppe).
+        :return: Dictionnaire (positions, intensities, minima, maxima, maxima_intensities, screen_x, profile, evaluations).
+        """
+        if lens.aperture == 0 or self.screen_distance == 0:
+            raise ValueError("Les dimensions de l'ouverture ou la distance de l'écran sont invalides.")
+        function, fringe, peaks = self.profile_function(light_source, lens, options)
+
+        if max_sin is None:
+            if options is not None and options.multi_slit_enabled:
+                max_sin = 2 * light_source.get_spectrum().wavelengths.max() / options.slit_width
+            else:
+                max_sin = 10 * light_source.get_spectrum().wavelengths.max() / lens.aperture
+        max_sin = min(0.99, max_sin)
+        extent = self.screen_distance * np.tan(np.arcsin(max_sin))
+        if position_tolerance is None:
+            position_tolerance = 1e-6 * extent
+
+        # Quatre échantillons initiaux par frange, plus les maxima principaux connus (étroits pour un réseau)
+        initial_samples = max(33, 2 * int(4 * max_sin / fringe) + 1)
+        known_points = self.screen_distance * np.tan(np.arcsin(peaks))
+        scaled = lambda positions: light_source.intensity * function(positions)
+        with instrumentation.stage("pattern.adaptive"):
+            positions, intensities, evaluations = refine_profile(
+                scaled, -extent, extent, tolerance * light_source.intensity, initial_samples, known_points
+            )
+            (minima, _), (maxima, maxima_intensities), extrema_evaluations = locate_extrema(
+                scaled, positions, intensities, position_tolerance
+            )
+
+        size = self.grid_size * self.padding + 1
+        screen_x = np.linspace(-extent, extent, size)
+        return {
+            "positions": positions,
+            "intensities": intensities,
+            "minima": minima,
+            "maxima": maxima,
+            "maxima_intensities": maxima_intensities,
+            "screen_x": screen_x,
+            "profile": render_profile(positions, intensities, screen_x),
+            "evaluations": evaluations + extrema_evaluations,
+        }
+
+    def photon_sampler(self, light_source, lens, options=None, source_distance=None):
+        """
+        Prépare le tirage Monte-Carlo de photons à travers la pupille (voir PhotonSampler), en champ lointain.
+
+        Le noyau de diffraction est l'intensité du spectre de la pupille calculée par le moteur FFT ; une
+        source partiellement cohérente (si la cohérence est activée dans les options avancées) est traitée
+        comme une source étendue incohérente.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :param source_distance: Distance entre la source et la lentille (en mètres ; par défaut, la moitié de screen_distance).
+        :return: Instance de PhotonSampler.
+        """
+        if options is not None and options.multi_slit_enabled:
+            raise ValueError("Le tirage de photons n'est disponible que pour une lentille (pas pour un réseau de fentes).")
+        if lens.aperture == 0 or self.screen_distance == 0:
+            raise ValueError("Les dimensions de l'ouverture ou la distance de l'écran sont invalides.")
+        if self.fresnel_number(light_source, lens) >= self.FRESNEL_NUMBER_LIMIT:
+            raise ValueError("Le tirage de photons n'est disponible qu'en champ lointain (N_F < 1).")
+
+        coherence_width = None
+        if options is not None and options.coherence_enabled:
+            decomposition = CoherentModeDecomposition.from_light_source(light_source, lens)
+            coherence_width = decomposition.coherence_width if decomposition is not None else None
+
+        engine = get_fraunhofer_engine(self.grid_size, self.padding)
+        pupil, pitch = self.sample_pupil(lens)
+        spectrum = light_source.get_spectrum()
+        return PhotonSampler(
+            engine.compute(pupil),
+            engine.frequency_axis(pitch),
+            spectrum.wavelengths,
+            spectrum.weights,
+            self.screen_distance,
+            coherence_width,
+            source_distance if source_distance is not None else self.screen_distance / 2,
+        )
+
+    def sample_photons(self, light_source, lens, options=None, source_distance=None, **sampling_options):
+        """
+        Calcule l'intensité sur l'écran par tirage Monte-Carlo de photons, pour contrôler les moteurs de champ.
+
+        L'histogramme est défini sur la grille de l'écran du moteur FFT et son intensité est normalisée
+        au pic, puis mise à l'échelle par l'intensité de la source, comme intensity_map.
+
+        :param light_source: Instance de LightSource.
+        :param lens: Instance de Lens.
+        :param options: Instance de AdvancedOptions (optionnel).
+        :param source_distance: Distance entre la source et la lentille (en mètres, optionnel).
+        :param sampling_options: Options de run_photon_sampling (max_photons, target_noise, seed, max_workers, ...).
+        :return: Dictionnaire retourné par run_photon_sampling.
+        """
+        sampler = self.photon_sampler(light_source, lens, options, source_distance)
+        with instrumentation.stage("pattern.photons"):
+            result = run_photon_sampling(sampler, **sampling_options)
+        result["intensity"] *= light_source.intensity
+        return result
+
+    def sample_pupil(self, lens):
+        """
+        Retourne la pupille échantillonnée, mise en cache jusqu'à la prochaine exécution de l'étape "pupil".
+
+        :param lens: Instance de Lens.
+        :return: Tuple (pupille, pas d'échantillonnage en mètres).
+        """
+        if self.pupil is None or self.pupil[0].shape != (self.grid_size, self.grid_size):
+            self.pupil = get_fraunhofer_engine(self.grid_size, self.padding).sample_pupil(lens)
+        return self.pupil
+
+    def _chunk_length(self, bytes_per_wavelength):
+        """
+        Retourne le nombre de longueurs d'onde traitées par bloc pour respecter max_chunk_bytes.
+        """
+        return max(1, self.max_chunk_bytes // bytes_per_wavelength)
+
+    def _sum_rescaled_intensities(self, intensity, spectrum, reference):
+        """
+        Somme incohérente des intensités de Fraunhofer de chaque longueur d'onde, par blocs vectorisés.
+
+        Sur la grille de l'écran définie pour la longueur d'onde de référence, l'intensité à λ est celle
+        du spectre de la pupille échantillonné en f * (référence / λ), pondérée par (référence / λ)².
+        L'échantillonnage est bilinéaire et séparable (lignes puis colonnes).
+
+        :param intensity: Intensité normalisée du spectre de la pupille (M×M, centrée).
+        :param spectrum: Instance de Spectrum.
+        :param reference: Longueur d'onde de référence de la grille de l'écran (en mètres).
+        :return: Intensité M×M sommée, normalisée à 1 au maximum.
+        """
+        size = intensity.shape[0]
+        center = size // 2
+        index = np.arange(size) - center
+        total = np.zeros_like(intensity)
+
+        # Par point et par longueur d'onde : lignes interpolées (8), colonnes interpolées (8), puis une lecture
+        # décalée (8) et son produit par les poids (8) vivants en même temps
+        for wavelengths, weights in spectrum.chunks(self._chunk_length(size * size * 32)):
+            scales = reference / wavelengths
+            coords = center + index[None, :] * scales[:, None]
+            inside = (coords >= 0) & (coords <= size - 1)
+            lower = np.clip(np.floor(coords).astype(np.intp), 0, size - 2)
+            fraction = np.where(inside, coords - lower, 0.0)
+            row_weights = np.where(inside, 1.0, 0.0)
+
+            # Interpolation le long des lignes : (K, M, M)
+            rows = intensity[lower] * ((1 - fraction) * row_weights)[:, :, None]
+            rows += intensity[lower + 1] * (fraction * row_weights)[:, :, None]
+
+            # Interpolation le long des colonnes, puis pondération spectrale
+            columns = np.take_along_axis(rows, lower[:, None, :], axis=2)
+            columns *= ((1 - fraction) * row_weights)[:, None, :]
+            columns += np.take_along_axis(rows, lower[:, None, :] + 1, axis=2) * (fraction * row_weights)[:, None, :]
+            total += np.tensordot(weights * scales ** 2, columns, axes=1)
+
+        peak = total.max()
+        if peak > 0:
+            total /= peak
+        return total
+
+    def field_statistics(self):
+        """
+        Retourne des statistiques résumées de l'intensité 2D calculée.
+
+        Pour le moteur de Hankel, les statistiques sont calculées sur le profil radial, sans développer l'image 2D.
+
+        :return: Dictionnaire (peak, power, central_radius), ou None si aucun champ n'a été calculé.
+        """
+        if self.radial_profile is not None and self.radial_positions is not None:
+            profile, radii = self.radial_profile, self.radial_positions
+            rising = np.nonzero(np.diff(profile) > 0)[0]
+
+            # Puissance : intégrale de I(r) sur les anneaux de surface π (r2² - r1²)
+            ring_areas = np.pi * np.diff(radii ** 2, prepend=0.0)
+            power = np.sum(ring_areas * (profile + np.concatenate(([profile[0]], profile[:-1]))) / 2)
+            return {
+                "peak": float(profile.max()),
+                "power": float(power),
+                "central_radius": float(radii[rising[0]]) if len(rising) else np.nan,
             }
-            for m, pos in zip(m_values[:len(positions)], positions)
-        ]
+
+        if self.intensity_map is None:
+            return None
+
+        pitch = self.screen_x[1] - self.screen_x[0]
+        center_row = self.intensity_map.shape[0] // 2
+        center_col = int(np.argmin(np.abs(self.screen_x)))
+        profile = self.intensity_map[center_row, center_col:]
+
+        # Rayon du lobe central : premier point où l'intensité cesse de décroître
+        rising = np.nonzero(np.diff(profile) > 0)[0]
+        central_radius = rising[0] * pitch if len(rising) else np.nan
+
+        return {
+            "peak": float(self.intensity_map.max()),
+            "power": float(self.intensity_map.sum() * pitch ** 2),
+            "central_radius": float(central_radius),
+        }
 
     def update_pattern(self):
         """
@@ -61,7 +917,7 @@ class DiffractionPattern:
         """
         Retourne une représentation textuelle ou graphique du motif de diffraction.
 
-        :return: Liste des positions et intensités des spots de diffraction.
+        :return: Table structurée des spots de diffraction (order, angle, position, intensity).
         """
         return self.spots
 
@@ -1,30 +1,134 @@
+import numpy as np
+
+# Type structuré d'une table de spots : une ligne par ordre de diffraction
+SPOT_DTYPE = np.dtype([
+    ("order", np.int64),
+    ("angle", np.float64),
+    ("position", np.float64),
+    ("intensity", np.float64),
+])
+
+
+def make_spot_table(orders, angles, positions, intensities):
+    """
+    Construit une table de spots (tableau structuré numpy) à partir de colonnes de même longueur.
+
+    :param orders: Ordres de diffraction.
+    :param angles: Angles de diffraction (en radians).
+    :param positions: Positions sur l'écran (en mètres).
+    :param intensities: Intensités relatives.
+    :return: Tableau structuré de type SPOT_DTYPE.
+    """
+    orders = np.asarray(orders)
+    table = np.empty(len(orders), dtype=SPOT_DTYPE)
+    table["order"] = orders
+    table["angle"] = angles
+    table["position"] = positions
+    table["intensity"] = intensities
+    return table
+
+
+def calculate_intensities(base_intensity, orders):
+    """
+    Calcule l'intensité de tous les spots d'une table en une opération vectorisée (modèle cos²).
+
+    :param base_intensity: Intensité lumineuse de la source (échelle de 0 à 1).
+    :param orders: Ordres de diffraction (tableau d'entiers).
+    :return: Tableau des intensités.
+    """
+    # Exemple : modèle simple basé sur une modulation cos²
+    return base_intensity * (np.cos(np.pi * np.asarray(orders)) ** 2)
+
+
 class DiffractionSpot:
     """
     Représente un spot de diffraction particulier sur l'écran d'observation.
+
+    Le spot est une vue sur une ligne d'une table de spots (voir SPOT_DTYPE) : lire ou modifier
+    ses attributs lit ou modifie directement la table, sans copie.
     """
 
-    def __init__(self, position, angle, intensity):
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, position, angle, intensity, order=0):
         """
-        Initialise une instance de la classe DiffractionSpot.
+        Initialise une instance de la classe DiffractionSpot, avec sa propre table d'une ligne.
 
         :param position: Position du spot sur l'écran (en mètres).
         :param angle: Angle de diffraction associé au spot (en radians).
         :param intensity: Intensité lumineuse du spot (échelle relative de 0 à 1).
+        :param order: Ordre de diffraction du spot.
+        """
+        self._table = make_spot_table([order], [angle], [position], [intensity])
+        self._index = 0
+
+    @classmethod
+    def view(cls, table, index):
         """
-        self.position = position
-        self.angle = angle
-        self.intensity = intensity
+        Crée un spot partageant la ligne index d'une table existante.
+
+        :param table: Tableau structuré de type SPOT_DTYPE.
+        :param index: Indice de la ligne.
+        :return: Instance de DiffractionSpot.
+        """
+        spot = cls.__new__(cls)
+        spot._table = table
+        spot._index = index
+        return spot
+
+    @staticmethod
+    def iter_table(table):
+        """
+        Itère sur les spots d'une table sous forme de vues.
+
+        :param table: Tableau structuré de type SPOT_DTYPE.
+        :return: Générateur d'instances de DiffractionSpot.
+        """
+        return (DiffractionSpot.view(table, index) for index in range(len(table)))
+
+    @property
+    def order(self):
+        return int(self._table["order"][self._index])
+
+    @order.setter
+    def order(self, value):
+        self._table["order"][self._index] = value
+
+    @property
+    def angle(self):
+        return float(self._table["angle"][self._index])
+
+    @angle.setter
+    def angle(self, value):
+        self._table["angle"][self._index] = value
+
+    @property
+    def position(self):
+        return float(self._table["position"][self._index])
+
+    @position.setter
+    def position(self, value):
+        self._table["position"][self._index] = value
+
+    @property
+    def intensity(self):
+        return float(self._table["intensity"][self._index])
+
+    @intensity.setter
+    def intensity(self, value):
+        self._table["intensity"][self._index] = value
 
     def calculate_intensity(self, base_intensity, order):
         """
         Calcule l'intensité lumineuse du spot basé sur son ordre et une intensité de base.
 
+        Pour une table entière, utiliser calculate_intensities.
+
         :param base_intensity: Intensité lumineuse de la source (échelle de 0 à 1).
         :param order: Ordre de diffraction (entier positif ou négatif).
         :return: Intensité calculée.
         """
-        # Exemple : modèle simple basé sur une modulation cos²
-        self.intensity = base_intensity * (np.cos(np.pi * order) ** 2)
+        self.intensity = calculate_intensities(base_intensity, order)
         return self.intensity
 
     def display(self):
@@ -41,8 +145,6 @@ class DiffractionSpot:
 
 # Exemple d'utilisation
 # if __name__ == "__main__":
-#     import numpy as np
-
 #     # Création d'un spot de diffraction
 #     spot = DiffractionSpot(position=0.01, angle=np.pi / 6, intensity=0.5)
 
@@ -53,3 +155,8 @@ class DiffractionSpot:
 
 #     # Affichage des détails du spot
 #     print(spot.display())
+
+#     # Table de spots : intensités calculées en une seule opération
+#     orders = np.arange(-10, 11)
+#     table = make_spot_table(orders, np.zeros(len(orders)), np.zeros(len(orders)), calculate_intensities(1.0, orders))
+#     print([spot.display() for spot in DiffractionSpot.iter_table(table)][:3])
@@ -1,12 +1,133 @@
 import json
 import csv
 import os
+import struct
+import zlib
+
+import numpy as np
+
+from instrumentation import instrumentation
+
+def _to_serializable(value):
+    """
+    Convertit les scalaires et tableaux numpy en types JSON natifs (utilisé comme `default` de json.dump).
+    """
+    if isinstance(value, np.ndarray) and value.dtype.names is not None:
+        # Table structurée : une ligne par enregistrement, sous forme de dictionnaire
+        return [dict(zip(value.dtype.names, row)) for row in value.tolist()]
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type non sérialisable en JSON : {type(value).__name__}")
+
+
+def _is_table(value):
+    """
+    Indique si une valeur est une table de lignes (liste de dictionnaires ou tableau structuré numpy).
+    """
+    if isinstance(value, np.ndarray):
+        return value.dtype.names is not None
+    return isinstance(value, list) and len(value) > 0 and isinstance(value[0], dict)
+
+
+def _table_columns(table):
+    """
+    Retourne les noms de colonnes d'une table de lignes.
+    """
+    if isinstance(table, np.ndarray):
+        return list(table.dtype.names)
+    return list(table[0].keys())
+
+
+def _table_to_array(table):
+    """
+    Convertit une table de lignes en tableau structuré numpy (une colonne par champ).
+    """
+    if isinstance(table, np.ndarray):
+        return table
+    columns = _table_columns(table)
+    return np.rec.fromrecords([tuple(row[column] for column in columns) for row in table], names=columns).view(np.ndarray)
+
+
+def _split_data(data):
+    """
+    Sépare les données d'une simulation en tableaux (exportés en binaire) et en métadonnées (exportées en JSON).
+
+    Les tables deviennent des tableaux structurés ; les listes de tableaux (fronts d'onde) sont numérotées.
+
+    :return: Tuple (dictionnaire nom -> tableau, dictionnaire des métadonnées).
+    """
+    arrays = {}
+    metadata = {}
+    for key, value in data.items():
+        if _is_table(value):
+            arrays[key] = _table_to_array(value)
+        elif isinstance(value, np.ndarray):
+            arrays[key] = value
+        elif isinstance(value, list) and value and all(isinstance(item, np.ndarray) for item in value):
+            for index, item in enumerate(value):
+                arrays[f"{key}_{index}"] = item
+        else:
+            metadata[key] = value
+    return arrays, metadata
+
+
+def _write_png(file_path, pixels, compression=6):
+    """
+    Écrit une image PNG 8 bits (niveaux de gris pour un tableau 2D, RVB pour un tableau (H, W, 3)) sans dépendance.
+    """
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    color_type = 0 if pixels.ndim == 2 else 2
+
+    # Chaque ligne est précédée de son type de filtre (0 : aucun)
+    rows = np.empty((height, pixels[0].size + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    with open(file_path, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n")
+        png_file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)))
+        png_file.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), compression)))
+        png_file.write(chunk(b"IEND", b""))
+
+
+def _sidecar_path(file_path):
+    """
+    Retourne le chemin du fichier de métadonnées associé à un fichier exporté.
+    """
+    return os.path.splitext(file_path)[0] + ".meta.json"
+
 
 class Exporter:
     """
     Gère l'exportation des résultats de la simulation sous différents formats.
     """
 
+    @staticmethod
+    def export_data(data, file_path):
+        """
+        Exporte les données de la simulation dans le format déduit de l'extension du fichier.
+
+        Un chemin sans extension désigne un répertoire de fichiers .npy.
+
+        :param data: Dictionnaire contenant les données de simulation.
+        :param file_path: Chemin du fichier de sortie (.csv, .json, .npz ou répertoire).
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        exporters = {
+            ".csv": Exporter.export_data_as_csv,
+            ".json": Exporter.export_data_as_json,
+            ".npz": Exporter.export_data_as_npz,
+            "": Exporter.export_data_as_npy,
+        }
+        if extension not in exporters:
+            raise ValueError(f"Format d'exportation non pris en charge : {extension}.")
+        with instrumentation.stage(f"exporter{extension or '.npy'}"):
+            exporters[extension](data, file_path)
+
     @staticmethod
     def export_pattern_as_image(canvas, file_path):
         """
@@ -22,38 +143,162 @@ class Exporter:
         pixmap.save(file_path)
 
     @staticmethod
-    def export_data_as_csv(data, file_path):
+    def export_data_as_csv(data, file_path, table_key="diffraction_pattern"):
         """
-        Exporte les données de la simulation en fichier CSV.
+        Exporte les données de la simulation en fichier CSV, écrit ligne par ligne.
+
+        La table des spots est écrite dans le fichier principal (une colonne par champ). Les chemins
+        des fronts d'onde sont écrits dans <nom>_wavefronts.csv (une ligne par point) et les autres
+        données dans le fichier de métadonnées <nom>.meta.json.
 
         :param data: Dictionnaire contenant les données de simulation.
         :param file_path: Chemin du fichier CSV de sortie.
+        :param table_key: Clé de la table écrite dans le fichier principal.
+        """
+        if not file_path.lower().endswith('.csv'):
+            raise ValueError("Le fichier doit avoir une extension .csv.")
+
+        metadata = {key: value for key, value in data.items() if key not in (table_key, "wavefronts")}
+        table = data.get(table_key)
+        Exporter.export_spots_as_csv(table if table is not None else [], file_path)
+
+        wavefronts = data.get("wavefronts")
+        if wavefronts:
+            wavefronts_path = os.path.splitext(file_path)[0] + "_wavefronts.csv"
+            with open(wavefronts_path, mode='w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["wavefront", "x", "y"])
+                for index, path in enumerate(wavefronts):
+                    points = np.asarray(path).reshape(-1, 2)
+                    writer.writerows((index, x, y) for x, y in points.tolist())
+
+        with open(_sidecar_path(file_path), 'w') as json_file:
+            json.dump(metadata, json_file, default=_to_serializable)
+
+    @staticmethod
+    def export_spots_as_csv(spots, file_path):
+        """
+        Exporte une table de spots (liste de dictionnaires ou tableau structuré) en CSV, ligne par ligne.
+
+        :param spots: Table des spots de diffraction.
+        :param file_path: Chemin du fichier CSV de sortie.
         """
         if not file_path.lower().endswith('.csv'):
             raise ValueError("Le fichier doit avoir une extension .csv.")
 
         with open(file_path, mode='w', newline='') as csv_file:
             writer = csv.writer(csv_file)
-            writer.writerow(["Key", "Value"])
-            for key, value in data.items():
-                if isinstance(value, list):
-                    writer.writerow([key, json.dumps(value)])
-                else:
-                    writer.writerow([key, value])
+            if len(spots) == 0:
+                return
+            columns = _table_columns(spots)
+            writer.writerow(columns)
+            for spot in spots:
+                writer.writerow([_to_serializable(spot[column]) if hasattr(spot[column], "tolist") else spot[column]
+                                 for column in columns])
 
     @staticmethod
-    def export_data_as_json(data, file_path):
+    def export_data_as_json(data, file_path, indent=None):
         """
-        Exporte les données de la simulation en fichier JSON.
+        Exporte les données de la simulation en fichier JSON (compact par défaut).
 
         :param data: Dictionnaire contenant les données de simulation.
         :param file_path: Chemin du fichier JSON de sortie.
+        :param indent: Indentation du JSON (None pour une sortie compacte).
         """
         if not file_path.lower().endswith('.json'):
             raise ValueError("Le fichier doit avoir une extension .json.")
 
+        separators = (',', ':') if indent is None else None
+        with open(file_path, 'w') as json_file:
+            json.dump(data, json_file, indent=indent, separators=separators, default=_to_serializable)
+
+    @staticmethod
+    def append_data_as_jsonl(data, json_file):
+        """
+        Ajoute les données d'une simulation en une ligne JSON compacte à un fichier JSON Lines ouvert.
+
+        :param data: Dictionnaire contenant les données de simulation.
+        :param json_file: Fichier texte ouvert en ajout.
+        :return: Position dans le fichier après l'écriture (en octets), le tampon étant vidé.
+        """
+        json_file.write(json.dumps(data, separators=(',', ':'), default=_to_serializable))
+        json_file.write("\n")
+        json_file.flush()
+        return json_file.tell()
+
+    @staticmethod
+    def export_data_as_npz(data, file_path, metadata=None):
+        """
+        Exporte les tableaux de la simulation dans une archive .npz non compressée, avec un fichier de métadonnées.
+
+        :param data: Dictionnaire contenant les données de simulation (tableaux et métadonnées).
+        :param file_path: Chemin du fichier .npz de sortie.
+        :param metadata: Métadonnées supplémentaires à écrire dans <nom>.meta.json.
+        """
+        if not file_path.lower().endswith('.npz'):
+            raise ValueError("Le fichier doit avoir une extension .npz.")
+
+        arrays, data_metadata = _split_data(data)
+        np.savez(file_path, **arrays)
+        Exporter._write_array_metadata(_sidecar_path(file_path), arrays, data_metadata, metadata)
+
+    @staticmethod
+    def export_data_as_npy(data, directory, metadata=None):
+        """
+        Exporte chaque tableau de la simulation dans un fichier .npy, utilisable avec np.load(..., mmap_mode='r').
+
+        Les métadonnées et la liste des tableaux (forme, type) sont écrites dans <répertoire>/metadata.json.
+
+        :param data: Dictionnaire contenant les données de simulation (tableaux et métadonnées).
+        :param directory: Répertoire de sortie (créé si nécessaire).
+        :param metadata: Métadonnées supplémentaires.
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays, data_metadata = _split_data(data)
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+        Exporter._write_array_metadata(os.path.join(directory, "metadata.json"), arrays, data_metadata, metadata)
+
+    @staticmethod
+    def export_frame_sequence(frames, directory, prefix="frame", lut=None):
+        """
+        Exporte une suite de trames en images PNG numérotées (<prefix>_0000.png, ...), écrites au fil de l'eau.
+
+        Les trames sont consommées une à une depuis l'itérable : aucune n'est conservée en mémoire.
+
+        :param frames: Itérable de trames uint8 2D (par exemple PhaseAnimation.iter_frames()).
+        :param directory: Répertoire de sortie (créé si nécessaire).
+        :param prefix: Préfixe des noms de fichiers.
+        :param lut: Table de couleurs ARGB32 de 256 entrées (optionnel ; niveaux de gris sinon).
+        :return: Nombre d'images écrites.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if lut is not None:
+            # Composantes R, V, B de chaque entrée de la table
+            lut = np.stack([(lut >> shift) & 0xFF for shift in (16, 8, 0)], axis=-1).astype(np.uint8)
+
+        count = 0
+        with instrumentation.stage("exporter.frames"):
+            for index, frame in enumerate(frames):
+                pixels = frame if lut is None else lut[frame]
+                _write_png(os.path.join(directory, f"{prefix}_{index:04d}.png"), pixels)
+                count += 1
+        return count
+
+    @staticmethod
+    def _write_array_metadata(file_path, arrays, data_metadata, metadata):
+        """
+        Écrit le fichier de métadonnées d'un export binaire : métadonnées et description des tableaux.
+        """
+        sidecar = dict(data_metadata)
+        if metadata:
+            sidecar.update(metadata)
+        sidecar["arrays"] = {
+            name: {"shape": list(array.shape), "dtype": array.dtype.descr if array.dtype.names else array.dtype.str}
+            for name, array in arrays.items()
+        }
         with open(file_path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+            json.dump(sidecar, json_file, default=_to_serializable)
 
 # Exemple d'utilisation
 # if __name__ == "__main__":
@@ -81,5 +326,8 @@ class Exporter:
 #     # Export CSV
 #     Exporter.export_data_as_csv(example_data, "simulation_results.csv")
 
+#     # Export binaire (un fichier .npy par tableau, relisible avec np.load(..., mmap_mode='r'))
+#     Exporter.export_data_as_npy(example_data, "simulation_results")
+
 #     # Export Image (nécessite un objet Canvas)
 #     # Exporter.export_pattern_as_image(canvas, "simulation_canvas.png")
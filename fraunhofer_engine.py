@@ -0,0 +1,193 @@
+import numpy as np
+
+from coherence import sum_over_modes
+from pupil_mask import pupil_mask
+
+
+class FraunhoferEngine:
+    """
+    Calcule le champ lointain (diffraction de Fraunhofer) d'une pupille échantillonnée sur une grille N×N par FFT.
+    """
+
+    def __init__(self, grid_size=512, padding=2):
+        """
+        Initialise une instance de la classe FraunhoferEngine.
+
+        :param grid_size: Nombre d'échantillons de la pupille par côté (N).
+        :param padding: Facteur de bourrage de zéros (taille de la FFT = N * padding).
+        """
+        if grid_size <= 0 or padding < 1:
+            raise ValueError("La taille de grille doit être positive et le facteur de bourrage supérieur ou égal à 1.")
+        self.grid_size = int(grid_size)
+        self.padding = int(padding)
+
+        # Tampons réutilisés d'un appel à l'autre (les plans FFT sont mis en cache par numpy)
+        self._real_buffer = None
+        self._complex_buffer = None
+        self._half_power = None
+        self._full_power = None
+        self._frequency_cache = {}
+
+    @property
+    def fft_size(self):
+        """
+        Taille de la FFT (toujours paire pour pouvoir centrer le spectre).
+        """
+        size = self.grid_size * self.padding
+        return size + size % 2
+
+    def sample_pupil(self, lens):
+        """
+        Échantillonne la pupille de la lentille sur la grille N×N, selon sa forme (voir pupil_mask).
+
+        :param lens: Instance de Lens.
+        :return: Tuple (pupille booléenne en lecture seule, pas d'échantillonnage en mètres).
+        """
+        aperture = lens.aperture
+        if aperture <= 0:
+            raise ValueError("L'ouverture de la lentille doit être positive.")
+
+        pitch = aperture / self.grid_size
+        return pupil_mask(lens, self.grid_size, pitch), pitch
+
+    def frequency_axis(self, pitch):
+        """
+        Retourne l'axe des fréquences spatiales (centré) associé à la FFT.
+
+        :param pitch: Pas d'échantillonnage de la pupille (en mètres).
+        :return: Tableau des fréquences spatiales (en cycles par mètre).
+        """
+        key = (self.fft_size, pitch)
+        if key not in self._frequency_cache:
+            self._frequency_cache[key] = np.fft.fftshift(np.fft.fftfreq(self.fft_size, d=pitch))
+        return self._frequency_cache[key]
+
+    def compute(self, pupil):
+        """
+        Calcule l'intensité en champ lointain de la pupille, normalisée à 1 au maximum.
+
+        Une pupille réelle passe par une FFT réelle (rfft2) et le demi-spectre est complété
+        par symétrie hermitienne ; une pupille complexe passe par une FFT complète.
+
+        :param pupil: Tableau N×N (réel ou complexe) représentant la pupille.
+        :return: Tableau M×M de l'intensité centrée sur l'ordre zéro.
+        """
+        n = self.grid_size
+        if pupil.shape != (n, n):
+            raise ValueError("La pupille doit avoir la taille de la grille du moteur.")
+
+        m = self.fft_size
+        if np.iscomplexobj(pupil):
+            buffer = self._buffer("_complex_buffer", (m, m), np.complex128)
+            buffer[:n, :n] = pupil
+            spectrum = np.fft.fft2(buffer)
+            power = self._buffer("_full_power", (m, m), np.float64)
+            np.multiply(spectrum.real, spectrum.real, out=power)
+            power += spectrum.imag ** 2
+            return self._normalize(np.fft.fftshift(power))
+
+        buffer = self._buffer("_real_buffer", (m, m), np.float64)
+        buffer[:n, :n] = pupil
+        spectrum = np.fft.rfft2(buffer)
+        half = self._buffer("_half_power", spectrum.shape, np.float64)
+        np.multiply(spectrum.real, spectrum.real, out=half)
+        half += spectrum.imag ** 2
+        return self._complete_half_spectrum(half)
+
+    def compute_field(self, pupil):
+        """
+        Calcule le champ complexe en champ lointain de la pupille, centré et normalisé à une amplitude maximale de 1.
+
+        La pupille est centrée dans la grille bourrée de zéros et la phase est corrigée du décalage
+        d'un demi-pixel éventuel : le champ d'une pupille symétrique est réel.
+
+        :param pupil: Tableau N×N (réel ou complexe) représentant la pupille.
+        :return: Tableau M×M complexe centré sur l'ordre zéro.
+        """
+        n = self.grid_size
+        if pupil.shape != (n, n):
+            raise ValueError("La pupille doit avoir la taille de la grille du moteur.")
+
+        m = self.fft_size
+        offset = (m - n) // 2
+        buffer = np.zeros((m, m), dtype=np.complex128)
+        buffer[offset:offset + n, offset:offset + n] = pupil
+        field = np.fft.fftshift(np.fft.fft2(np.fft.ifftshift(buffer)))
+
+        # Centre de la pupille à (offset + (N - 1) / 2) au lieu de M / 2 : rampe de phase séparable à compenser
+        shift = offset + (n - 1) / 2 - m // 2
+        ramp = np.exp(2j * np.pi * np.fft.fftshift(np.fft.fftfreq(m)) * shift)
+        field *= ramp[:, None] * ramp[None, :]
+
+        peak = np.abs(field).max()
+        if peak > 0:
+            field /= peak
+        return field
+
+    def compute_incoherent(self, chunks, workers=1):
+        """
+        Calcule la somme incohérente des intensités en champ lointain de plusieurs champs réels (modes cohérents).
+
+        Chaque bloc de champs est transformé par une seule rfft2 batchée ; les blocs sont répartis sur des threads.
+
+        :param chunks: Itérable de tuples (champs réels (k, N, N), poids (k,)).
+        :param workers: Nombre de threads.
+        :return: Tableau M×M de l'intensité centrée, normalisée à 1 au maximum.
+        """
+        n = self.grid_size
+        m = self.fft_size
+
+        def accumulate(fields, weights):
+            buffer = np.zeros((len(fields), m, m))
+            buffer[:, :n, :n] = fields
+            spectrum = np.fft.rfft2(buffer)
+            return np.tensordot(weights, spectrum.real ** 2 + spectrum.imag ** 2, axes=1)
+
+        return self._complete_half_spectrum(sum_over_modes(chunks, accumulate, workers))
+
+    def _complete_half_spectrum(self, half):
+        """
+        Reconstruit l'intensité M×M centrée à partir du demi-spectre d'une entrée réelle, normalisée à 1.
+
+        :param half: Puissance du demi-spectre (M, M // 2 + 1) renvoyé par rfft2.
+        :return: Tableau M×M de l'intensité centrée.
+        """
+        # Symétrie hermitienne : I(-fx, -fy) = I(fx, fy)
+        m = self.fft_size
+        h = m // 2
+        power = self._buffer("_full_power", (m, m), np.float64)
+        power[:, :h + 1] = half
+        negative_rows = (-np.arange(m)) % m
+        power[:, h + 1:] = half[negative_rows, h - 1:0:-1]
+        return self._normalize(np.fft.fftshift(power))
+
+    @staticmethod
+    def _normalize(intensity):
+        """
+        Normalise une intensité à 1 au maximum (sur place).
+        """
+        peak = intensity.max()
+        if peak > 0:
+            intensity /= peak
+        return intensity
+
+    def _buffer(self, name, shape, dtype):
+        """
+        Retourne un tampon de travail réutilisable, réalloué uniquement si sa taille change.
+        """
+        buffer = getattr(self, name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.zeros(shape, dtype=dtype)
+            setattr(self, name, buffer)
+        return buffer
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     from lens import Lens
+
+#     lens = Lens(focal_length=0.1, curvature_radius=0.01, refractive_index=1.5)
+#     engine = FraunhoferEngine(grid_size=1024, padding=2)
+
+#     pupil, pitch = engine.sample_pupil(lens)
+#     intensity = engine.compute(pupil)
+#     print("Taille du champ:", intensity.shape, "Fréquence max:", engine.frequency_axis(pitch)[-1])
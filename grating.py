@@ -0,0 +1,98 @@
+import numpy as np
+
+
+def array_factor(phase_difference, num_slits):
+    """
+    Calcule le facteur de réseau normalisé sin²(Nφ/2) / (N² sin²(φ/2)), vectorisé et sans sommation par fente.
+
+    La phase est d'abord ramenée autour du multiple de 2π le plus proche (φ/2 = kπ + δ), ce qui
+    préserve la précision pour N grand ; la limite 0/0 (δ = 0, maxima principaux) vaut 1.
+
+    :param phase_difference: Déphasage φ entre deux fentes voisines (en radians), scalaire ou tableau.
+    :param num_slits: Nombre de fentes N.
+    :return: Tableau du facteur de réseau normalisé (de 0 à 1).
+    """
+    if num_slits < 1:
+        raise ValueError("Le nombre de fentes doit être supérieur ou égal à 1.")
+    half_phase = np.asarray(phase_difference, dtype=np.float64) / 2
+    delta = half_phase - np.pi * np.round(half_phase / np.pi)
+
+    sin_delta = np.sin(delta)
+    near_peak = sin_delta == 0
+    safe_sin = np.where(near_peak, 1.0, sin_delta)
+    ratio = np.sin(num_slits * delta) / (num_slits * safe_sin)
+    return np.where(near_peak, 1.0, ratio ** 2)
+
+
+def grating_intensity(sin_theta, wavelength, slit_width, slit_spacing, num_slits):
+    """
+    Calcule l'intensité normalisée d'un réseau de N fentes : enveloppe de la fente unique × facteur de réseau.
+
+    Les longueurs d'onde et les sinus des angles sont combinés par diffusion numpy.
+
+    :param sin_theta: Sinus des angles de diffraction.
+    :param wavelength: Longueur(s) d'onde (en mètres).
+    :param slit_width: Largeur d'une fente (en mètres).
+    :param slit_spacing: Distance entre les fentes (en mètres).
+    :param num_slits: Nombre de fentes.
+    :return: Tableau de l'intensité normalisée (1 au centre).
+    """
+    if slit_width <= 0 or slit_spacing <= 0:
+        raise ValueError("La largeur et l'espacement des fentes doivent être positifs.")
+    sin_theta = np.asarray(sin_theta, dtype=np.float64)
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+
+    # np.sinc(u) = sin(πu) / (πu), avec u = a sin(θ) / λ
+    envelope = np.sinc(slit_width * sin_theta / wavelength) ** 2
+    phase_difference = 2 * np.pi * slit_spacing * sin_theta / wavelength
+    return envelope * array_factor(phase_difference, num_slits)
+
+
+def grating_pixel_intensity(sin_lower, sin_upper, wavelength, slit_width, slit_spacing, num_slits):
+    """
+    Calcule l'intensité normalisée d'un réseau de N fentes moyennée sur des pixels [sin_lower, sin_upper),
+    en forme fermée : le coût par pixel ne dépend pas du nombre de fentes.
+
+    Un pixel plus large que les maxima principaux (largeur λ / (N d) en sin(θ)) reçoit l'aire de
+    chaque maximum qu'il contient (λ / (N d), le facteur de réseau étant normalisé à 1), pondérée par
+    l'enveloppe au maximum et divisée par sa largeur ; ailleurs, le facteur de réseau est remplacé par
+    le niveau moyen des lobes secondaires, 1 / (2 N² sin²(φ/2)). Un pixel plus étroit que les maxima
+    principaux est simplement échantillonné en son centre (voir grating_intensity).
+
+    :param sin_lower: Sinus des bords inférieurs des pixels.
+    :param sin_upper: Sinus des bords supérieurs des pixels.
+    :param wavelength: Longueur(s) d'onde (en mètres).
+    :param slit_width: Largeur d'une fente (en mètres).
+    :param slit_spacing: Distance entre les fentes (en mètres).
+    :param num_slits: Nombre de fentes.
+    :return: Tableau de l'intensité moyenne de chaque pixel (1 au centre d'un pixel étroit).
+    """
+    sin_lower = np.asarray(sin_lower, dtype=np.float64)
+    sin_upper = np.asarray(sin_upper, dtype=np.float64)
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    center = (sin_lower + sin_upper) / 2
+    width = sin_upper - sin_lower
+    peak_width = wavelength / (num_slits * slit_spacing)
+    point = grating_intensity(center, wavelength, slit_width, slit_spacing, num_slits)
+
+    # Maxima principaux k λ / d contenus dans le pixel ; l'enveloppe est prise au maximum s'il est seul
+    period = wavelength / slit_spacing
+    first_order = np.ceil(sin_lower / period)
+    num_peaks = np.ceil(sin_upper / period) - first_order
+    peak_sin = np.where(num_peaks == 1, first_order * period, center)
+    envelope = np.sinc(slit_width * peak_sin / wavelength) ** 2
+
+    half_phase = np.pi * slit_spacing * center / wavelength
+    sin_delta = np.sin(half_phase - np.pi * np.round(half_phase / np.pi))
+    sidelobes = 1 / (2 * num_slits ** 2 * np.where(num_peaks > 0, 1.0, sin_delta ** 2))
+    averaged = envelope * np.where(num_peaks > 0, num_peaks * peak_width / width, sidelobes)
+    return np.where(width > peak_width, averaged, point)
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     sin_theta = np.linspace(-0.01, 0.01, 100001)
+#     intensity = grating_intensity(sin_theta, wavelength=550e-9, slit_width=2e-5, slit_spacing=1e-4, num_slits=100000)
+#     print("Intensité maximale:", intensity.max())
+#     edges = np.linspace(-0.01, 0.01, 514)
+#     averaged = grating_pixel_intensity(edges[:-1], edges[1:], 550e-9, 2e-5, 1e-4, 100000)
+#     print("Intensité moyenne:", averaged.mean())
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=3)
+def _hankel_kernel(num_samples):
+    """
+    Précalcule la matrice de la transformée de Hankel quasi-discrète d'ordre 0 (Guizar-Sicairos et Gutiérrez-Vega).
+
+    La matrice ne dépend que du nombre d'échantillons : le rayon de la grille n'intervient que
+    dans des facteurs d'échelle. scipy.special n'est importé qu'au premier calcul.
+
+    :param num_samples: Nombre d'échantillons radiaux (N).
+    :return: Tuple (zéros j_1..j_N de J0, zéro j_{N+1}, |J1(j_n)|, matrice N×N), en lecture seule.
+    """
+    from scipy.special import j0, j1, jn_zeros
+
+    zeros = jn_zeros(0, num_samples + 1)
+    roots, span = zeros[:-1], zeros[-1]
+    j1_abs = np.abs(j1(roots))
+    kernel = 2 * j0(np.outer(roots, roots) / span) / (np.outer(j1_abs, j1_abs) * span)
+    for array in (roots, j1_abs, kernel):
+        array.setflags(write=False)
+    return roots, span, j1_abs, kernel
+
+
+class HankelEngine:
+    """
+    Transformée de Hankel quasi-discrète d'ordre 0, pour les systèmes à symétrie de révolution.
+
+    Un champ radial f(r) échantillonné en N points remplace une grille 2D : la transformée coûte
+    un produit matrice-vecteur N×N au lieu d'une FFT 2D sur 2N×2N points.
+    """
+
+    def __init__(self, num_samples=256):
+        """
+        Initialise une instance de la classe HankelEngine.
+
+        :param num_samples: Nombre d'échantillons radiaux (N).
+        """
+        if num_samples <= 0:
+            raise ValueError("Le nombre d'échantillons radiaux doit être positif.")
+        self.num_samples = int(num_samples)
+
+    def grid(self, radius):
+        """
+        Retourne les grilles radiales du plan de départ et du plan des fréquences.
+
+        :param radius: Rayon de la grille du plan de départ (en mètres) ; le champ doit y être nul au-delà.
+        :return: Tuple (rayons r_n en mètres, fréquences radiales ν_n en cycles par mètre).
+        """
+        roots, span, _, _ = _hankel_kernel(self.num_samples)
+        return roots * radius / span, roots / (2 * np.pi * radius)
+
+    def forward(self, field, radius):
+        """
+        Calcule F(ν) = 2π ∫ f(r) J0(2πνr) r dr aux fréquences de la grille.
+
+        :param field: Champ radial échantillonné aux rayons de grid(radius), de forme (N,) ou (N, K).
+        :param radius: Rayon de la grille (en mètres).
+        :return: Transformée aux fréquences de grid(radius), de même forme que field.
+        """
+        _, span, j1_abs, kernel = _hankel_kernel(self.num_samples)
+        bandwidth = span / (2 * np.pi * radius)
+        scale = (radius / j1_abs) if np.ndim(field) == 1 else (radius / j1_abs)[:, None]
+        return kernel @ (field * scale) / scale * (radius / bandwidth)
+
+    def inverse(self, spectrum, radius):
+        """
+        Calcule la transformée inverse f(r) = 2π ∫ F(ν) J0(2πνr) ν dν aux rayons de la grille.
+
+        :param spectrum: Transformée échantillonnée aux fréquences de grid(radius), de forme (N,) ou (N, K).
+        :param radius: Rayon de la grille (en mètres).
+        :return: Champ radial aux rayons de grid(radius), de même forme que spectrum.
+        """
+        _, span, j1_abs, kernel = _hankel_kernel(self.num_samples)
+        bandwidth = span / (2 * np.pi * radius)
+        scale = (bandwidth / j1_abs) if np.ndim(spectrum) == 1 else (bandwidth / j1_abs)[:, None]
+        return kernel @ (spectrum * scale) / scale * (bandwidth / radius)
+
+    @staticmethod
+    def transfer_functions(frequencies, wavelengths, distance, radius=None):
+        """
+        Construit H = exp(i 2π z √(1/λ² - ν²)) pour plusieurs longueurs d'onde, nul pour les ondes évanescentes.
+
+        Si le rayon de la grille est donné, H est aussi limité en bande (ν < 1 / (λ √((z/R)² + 1))) :
+        les fréquences qui sortiraient de la grille ne sont pas réfléchies vers l'axe par la transformée.
+
+        :param frequencies: Fréquences radiales (en cycles par mètre), de forme (N,).
+        :param wavelengths: Longueurs d'onde (en mètres), de forme (K,).
+        :param distance: Distance de propagation (en mètres).
+        :param radius: Rayon de la grille (en mètres), optionnel.
+        :return: Tableau complexe (N, K).
+        """
+        wavelengths = np.asarray(wavelengths)[None, :]
+        argument = 1.0 / wavelengths ** 2 - frequencies[:, None] ** 2
+        propagating = argument > 0
+        if radius is not None:
+            propagating &= frequencies[:, None] < 1.0 / (wavelengths * np.hypot(distance / radius, 1.0))
+        kz = 2 * np.pi * np.sqrt(np.where(propagating, argument, 0.0))
+        return np.where(propagating, np.exp(1j * kz * distance), 0.0)
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     engine = HankelEngine(num_samples=2048)
+#     aperture_radius = 0.5e-3
+#     r, nu = engine.grid(radius=4 * aperture_radius)
+#     spectrum = engine.forward((r <= aperture_radius).astype(float), radius=4 * aperture_radius)
+#     print("Intensité sur l'axe (champ lointain):", abs(spectrum[0]) ** 2)
@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# Contexte vide partagé, retourné lorsque l'instrumentation est désactivée
+_NULL_STAGE = nullcontext()
+
+
+class Instrumentation:
+    """
+    Registre des mesures par étape : durée, nombre d'appels et pic d'allocation mémoire (optionnel).
+
+    Désactivé par défaut : stage() retourne alors un contexte vide partagé, sans mesure ni allocation.
+    """
+
+    def __init__(self):
+        """
+        Initialise une instance de la classe Instrumentation.
+        """
+        self.enabled = False
+        self.trace_memory = False
+        self._owns_tracemalloc = False  # True si tracemalloc a été démarré par enable()
+        self._records = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Pile des étapes en cours, par thread (suivi mémoire)
+
+    def enable(self, trace_memory=False):
+        """
+        Active les mesures.
+
+        :param trace_memory: Mesure aussi le pic d'allocation de chaque étape avec tracemalloc (plus coûteux).
+        """
+        if trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+        self.trace_memory = trace_memory
+        self.enabled = True
+
+    def disable(self):
+        """
+        Désactive les mesures (les mesures déjà enregistrées sont conservées).
+
+        tracemalloc n'est arrêté que s'il a été démarré par enable() : un suivi lancé par l'appelant continue.
+        """
+        self.enabled = False
+        self.trace_memory = False
+        if self._owns_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def reset(self):
+        """
+        Efface les mesures enregistrées.
+        """
+        with self._lock:
+            self._records.clear()
+
+    def stage(self, name):
+        """
+        Retourne un gestionnaire de contexte mesurant une étape.
+
+        :param name: Nom de l'étape (par exemple "pattern.field").
+        :return: Gestionnaire de contexte.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        tracemalloc = None
+        if self.trace_memory:
+            import tracemalloc
+
+            # Les étapes imbriquées remettent le pic à zéro : chaque étape transmet son pic à l'étape parente
+            stack = self._local.__dict__.setdefault("stack", [])
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            frame = [0]
+            stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak_bytes = None
+            if tracemalloc is not None:
+                stack.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], frame[0])
+                peak_bytes = peak - start_memory
+                if stack:
+                    stack[-1][0] = max(stack[-1][0], peak)
+            self._record(name, elapsed, peak_bytes)
+
+    def _record(self, name, elapsed, peak_bytes):
+        with self._lock:
+            record = self._records.get(name)
+            if record is None:
+                record = self._records[name] = {"calls": 0, "total_s": 0.0, "max_s": 0.0, "peak_bytes": None}
+            record["calls"] += 1
+            record["total_s"] += elapsed
+            record["max_s"] = max(record["max_s"], elapsed)
+            if peak_bytes is not None:
+                record["peak_bytes"] = max(record["peak_bytes"] or 0, peak_bytes)
+
+    def stats(self):
+        """
+        Retourne une copie des mesures enregistrées.
+
+        :return: Dictionnaire nom -> (calls, total_s, mean_s, max_s, peak_bytes), peak_bytes valant None sans suivi mémoire.
+        """
+        with self._lock:
+            return {
+                name: dict(record, mean_s=record["total_s"] / record["calls"])
+                for name, record in self._records.items()
+            }
+
+
+# Registre partagé par la simulation, l'exportateur et le canvas
+instrumentation = Instrumentation()
+
+
+def instrumented(name):
+    """
+    Décorateur mesurant chaque appel de la fonction décorée comme une étape du registre partagé.
+
+    :param name: Nom de l'étape.
+    :return: Décorateur.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            with instrumentation._measure(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     instrumentation.enable(trace_memory=True)
+#     with instrumentation.stage("exemple"):
+#         data = [0] * 1_000_000
+#     print(instrumentation.stats())
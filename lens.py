@@ -1,9 +1,13 @@
+import numpy as np
+
+
 class Lens:
     """
     Représente une lentille avec des propriétés physiques ajustables.
     """
 
-    def __init__(self, focal_length, curvature_radius, refractive_index, shape="circular"):
+    def __init__(self, focal_length, curvature_radius, refractive_index, shape="circular", aperture=None,
+                 aspect_ratio=1.0, mask_file=None):
         """
         Initialise une instance de la classe Lens.
 
@@ -11,22 +15,45 @@ class Lens:
         :param curvature_radius: Rayon de courbure de la lentille (en mètres).
         :param refractive_index: Indice de réfraction du matériau de la lentille.
         :param shape: Forme de la lentille ("circular", "elliptical", ou "custom").
+        :param aperture: Diamètre d'ouverture de la lentille (en mètres). Par défaut, le rayon de courbure.
+        :param aspect_ratio: Rapport hauteur / largeur de l'ouverture d'une lentille elliptique (de 0 à 1).
+        :param mask_file: Fichier du masque d'une lentille personnalisée (tableau .npy/.npz ou image).
         """
         self.focal_length = focal_length
         self.curvature_radius = curvature_radius
         self.refractive_index = refractive_index
         self.shape = shape
+        self.aperture = aperture if aperture is not None else curvature_radius
+        self.aspect_ratio = aspect_ratio
+        self.mask_file = mask_file
+
+    def ray_transfer_matrix(self):
+        """
+        Retourne la matrice de transfert de rayon (ABCD) de la lentille mince, pour des rayons (hauteur, pente).
+
+        :return: Tableau 2×2 [[1, 0], [-1/f, 1]].
+        """
+        if self.focal_length == 0:
+            raise ValueError("La longueur focale de la lentille doit être non nulle.")
+        return np.array([[1.0, 0.0], [-1.0 / self.focal_length, 1.0]])
+
+    def clear_radius(self):
+        """
+        Retourne la demi-ouverture de la lentille dans le plan des rayons (plan méridien, selon y).
+
+        :return: Demi-hauteur transmise (en mètres).
+        """
+        aspect_ratio = self.aspect_ratio if self.shape == "elliptical" else 1.0
+        return self.aperture * aspect_ratio / 2
 
-    def refract(self, light_source):
+    def refract(self, rays):
         """
-        Calcule le comportement de la lumière après passage à travers la lentille.
+        Calcule les rayons après passage à travers la lentille mince (approximation paraxiale).
 
-        :param light_source: Instance de LightSource représentant la source lumineuse incidente.
-        :return: Coordonnées du point focal ou données de propagation selon la configuration.
+        :param rays: Tableau (N, 2) des rayons incidents (hauteur sur la lentille en mètres, pente dy/dx).
+        :return: Tableau (N, 2) des rayons réfractés : même hauteur, pente diminuée de hauteur / f.
         """
-        # Placeholder pour le calcul réel basé sur les équations optiques.
-        focal_point = self.calculate_focal_point()
-        return focal_point
+        return np.asarray(rays, dtype=np.float64) @ self.ray_transfer_matrix().T
 
     def calculate_focal_point(self):
         """
@@ -50,6 +77,9 @@ class Lens:
             "curvature_radius": self.curvature_radius,
             "refractive_index": self.refractive_index,
             "shape": self.shape,
+            "aperture": self.aperture,
+            "aspect_ratio": self.aspect_ratio,
+            "mask_file": self.mask_file,
         }
 
 # Exemple d'utilisation
@@ -1,9 +1,12 @@
+from spectrum import Spectrum
+
+
 class LightSource:
     """
     Représente une source lumineuse avec des propriétés configurables.
     """
 
-    def __init__(self, position=(0, 0), wavelength=550e-9, intensity=1.0, coherence=1.0):
+    def __init__(self, position=(0, 0), wavelength=550e-9, intensity=1.0, coherence=1.0, spectrum=None):
         """
         Initialise une instance de la classe LightSource.
 
@@ -11,11 +14,16 @@ class LightSource:
         :param wavelength: Longueur d'onde de la lumière (en mètres).
         :param intensity: Intensité de la lumière (échelle relative de 0 à 1).
         :param coherence: Degré de cohérence de la lumière (de 0 à 1).
+        :param spectrum: Spectre de la source (instance de Spectrum ou dictionnaire) pour une source polychromatique.
+                         La longueur d'onde devient alors la moyenne pondérée du spectre.
         """
         self.position = position
         self.wavelength = wavelength
         self.intensity = intensity
         self.coherence = coherence
+        self.spectrum = None
+        if spectrum is not None:
+            self.set_spectrum(spectrum)
 
     def set_position(self, x, y):
         """
@@ -35,6 +43,28 @@ class LightSource:
         if wavelength <= 0:
             raise ValueError("La longueur d'onde doit être positive.")
         self.wavelength = wavelength
+        self.spectrum = None
+
+    def set_spectrum(self, spectrum):
+        """
+        Définit un spectre pour une source polychromatique.
+
+        :param spectrum: Instance de Spectrum ou dictionnaire accepté par Spectrum.from_dict.
+        """
+        if isinstance(spectrum, dict):
+            spectrum = Spectrum.from_dict(spectrum)
+        self.spectrum = spectrum
+        self.wavelength = spectrum.mean_wavelength
+
+    def get_spectrum(self):
+        """
+        Retourne le spectre de la source (une seule longueur d'onde pour une source monochromatique).
+
+        :return: Instance de Spectrum.
+        """
+        if self.spectrum is None:
+            return Spectrum.monochromatic(self.wavelength)
+        return self.spectrum
 
     def set_intensity(self, intensity):
         """
@@ -57,6 +87,7 @@ class LightSource:
             "wavelength": self.wavelength,
             "intensity": self.intensity,
             "coherence": self.coherence,
+            "spectrum": self.spectrum.to_dict() if self.spectrum is not None else None,
         }
 
 # Exemple d'utilisation
@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
 from canvas import Canvas
 from control_panel import ControlPanel
 from simulation import Simulation
+from simulation_worker import SimulationWorker
+from result_cache import ResultCache
 
 
 class MainWindow(QMainWindow):
@@ -18,8 +20,30 @@ class MainWindow(QMainWindow):
         self.resize(1200, 800)
 
         self.simulation = Simulation()
+
+        # Les calculs sont exécutés hors du thread de l'interface ; seul le dernier résultat est affiché,
+        # précédé de ses niveaux grossiers (raffinement progressif)
+        # Les résultats sont conservés d'une session à l'autre dans le cache disque de l'utilisateur
+        self.worker = SimulationWorker(result_cache=self.open_result_cache(), parent=self)
+        self.worker.result_ready.connect(self.on_simulation_ready)
+        self.worker.partial_ready.connect(self.on_simulation_ready)
+        self.worker.error.connect(self.on_simulation_error)
+
         self.init_ui()
 
+    @staticmethod
+    def open_result_cache():
+        """
+        Ouvre le cache disque des résultats, ou retourne None s'il n'est pas accessible en écriture.
+
+        :return: Instance de ResultCache ou None.
+        """
+        try:
+            return ResultCache()
+        except OSError as e:
+            print(f"Cache des résultats désactivé : {e}")
+            return None
+
     def init_ui(self):
         """
         Initialise l'interface utilisateur principale.
@@ -37,7 +61,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.control_panel)
 
         # Connecter les signaux
-        self.control_panel.connect_signals(self.apply_settings, self.reset_simulation)
+        self.control_panel.connect_signals(self.apply_settings, self.reset_simulation, self.toggle_animation)
 
         # Charger les paramètres par défaut
         self.load_default_settings()
@@ -62,18 +86,9 @@ class MainWindow(QMainWindow):
             from light_source import LightSource
             light_source = LightSource(**light_params)
 
-            # Configurer la simulation avec les paramètres par défaut
+            # Lancer la simulation avec les paramètres par défaut
             screen_distance = config["simulation"]["screen_distance"]
-            self.simulation.configure_components(lens, light_source, screen_distance)
-
-            # Appliquer les paramètres au canvas
-            self.simulation.start_simulation()
-            self.canvas.set_simulation_data(
-                self.simulation.lens,
-                self.simulation.light_source,
-                self.simulation.diffraction_pattern,
-                self.simulation.wavefronts,
-            )
+            self.worker.request(lens, light_source, screen_distance, self.simulation.advanced_options)
 
             # Mettre à jour le panneau de contrôle
             self.control_panel.set_parameters(lens_params, light_params)
@@ -98,23 +113,66 @@ class MainWindow(QMainWindow):
             lens = Lens(**lens_params)
             light_source = LightSource(**light_params)
 
-            self.simulation.configure_components(lens, light_source, screen_distance=1.0)
-            self.simulation.start_simulation()
-
-            # Mise à jour du canvas
-            self.canvas.set_simulation_data(
-                self.simulation.lens,
-                self.simulation.light_source,
-                self.simulation.diffraction_pattern,
-                self.simulation.wavefronts,
-            )
+            self.worker.request(lens, light_source, 1.0, self.simulation.advanced_options)
         except Exception as e:
             print(f"Erreur lors de l'application des paramètres : {e}")
 
+    def on_simulation_ready(self, simulation):
+        """
+        Reçoit la simulation calculée par le thread de travail (niveau grossier ou final) et met à jour le canvas.
+
+        :param simulation: Instance de Simulation calculée.
+        """
+        self.simulation = simulation
+        self.canvas.set_simulation_data(
+            self.simulation.lens,
+            self.simulation.light_source,
+            self.simulation.diffraction_pattern,
+            self.simulation.wavefronts,
+        )
+        if self.control_panel.animate_button.isChecked():
+            self.toggle_animation(True)
+
+    def toggle_animation(self, enabled):
+        """
+        Lance ou arrête l'animation de phase du champ sur le canvas.
+
+        :param enabled: True pour lancer l'animation.
+        """
+        # Les résultats suivants arrivent avec leur champ complexe, calculé dans le thread de travail
+        self.worker.animate = enabled
+        if not enabled:
+            self.canvas.stop_animation()
+            return
+        try:
+            # Trames à la résolution de l'affichage : le cycle entier tient dans le tampon circulaire
+            side = self.canvas.pattern_rect().width()
+            self.canvas.start_animation(self.simulation.phase_animation(max_side=side))
+        except ValueError as e:
+            print(f"Erreur lors de la préparation de l'animation : {e}")
+            self.control_panel.animate_button.setChecked(False)
+
+    def on_simulation_error(self, message):
+        """
+        Affiche une erreur survenue pendant le calcul de la simulation.
+
+        :param message: Message d'erreur.
+        """
+        print(f"Erreur lors du calcul de la simulation : {message}")
+
+    def closeEvent(self, event):
+        """
+        Annule les calculs en cours avant de fermer la fenêtre.
+        """
+        self.worker.cancel()
+        self.worker.wait()
+        super().closeEvent(event)
+
     def reset_simulation(self):
         """
         Réinitialise la simulation et le panneau de contrôle.
         """
+        self.worker.cancel()
         self.simulation.reset_simulation()
         self.canvas.set_simulation_data(None, None, None, [])
         print("Simulation réinitialisée.")
@@ -0,0 +1,201 @@
+import numpy as np
+
+from lens import Lens
+
+# Tolérance relative sur la hauteur d'un rayon au bord d'une ouverture (erreurs d'arrondi)
+_CLIP_TOLERANCE = 1e-12
+
+
+def free_space_matrix(distance):
+    """
+    Retourne la matrice de transfert de rayon d'une propagation en espace libre.
+
+    :param distance: Distance de propagation (en mètres).
+    :return: Tableau 2×2 [[1, d], [0, 1]].
+    """
+    return np.array([[1.0, distance], [0.0, 1.0]])
+
+
+class FreeSpace:
+    """
+    Intervalle d'espace libre entre deux éléments d'un train optique.
+    """
+
+    def __init__(self, distance):
+        """
+        Initialise une instance de la classe FreeSpace.
+
+        :param distance: Longueur de l'intervalle (en mètres).
+        """
+        if distance < 0:
+            raise ValueError("La longueur d'un intervalle d'espace libre doit être positive ou nulle.")
+        self.distance = distance
+
+    def ray_transfer_matrix(self):
+        return free_space_matrix(self.distance)
+
+
+class Aperture:
+    """
+    Diaphragme d'épaisseur nulle : arrête les rayons dont la hauteur dépasse son rayon.
+    """
+
+    def __init__(self, diameter):
+        """
+        Initialise une instance de la classe Aperture.
+
+        :param diameter: Diamètre de l'ouverture (en mètres).
+        """
+        if diameter <= 0:
+            raise ValueError("Le diamètre d'un diaphragme doit être positif.")
+        self.diameter = diameter
+
+    def ray_transfer_matrix(self):
+        return np.eye(2)
+
+    def clear_radius(self):
+        return self.diameter / 2
+
+
+class OpticalTrain:
+    """
+    Suite d'éléments optiques (lentilles minces, intervalles d'espace libre, diaphragmes) traversée par
+    des rayons paraxiaux (hauteur, pente dy/dx), décrits par leurs matrices de transfert 2×2 (ABCD).
+
+    Les matrices sont composées une fois à la construction : la matrice du système, et la matrice cumulée
+    à chaque plan d'élément mince. Un ensemble de rayons est ensuite transformé en un seul produit
+    matriciel, quel que soit le nombre d'éléments ; la propagation du champ n'est pas nécessaire pour les
+    positions focales, les grandissements ou le tracé des rayons.
+    """
+
+    def __init__(self, elements):
+        """
+        Initialise une instance de la classe OpticalTrain.
+
+        :param elements: Éléments dans l'ordre de traversée (Lens, FreeSpace ou Aperture), le premier plan étant z = 0.
+        """
+        self.elements = list(elements)
+        matrix = np.eye(2)
+        z = 0.0
+        plane_z, plane_matrices = [0.0], [matrix]
+        clip_z, clip_rows, clip_radii = [], [], []
+
+        for element in self.elements:
+            if isinstance(element, FreeSpace):
+                z += element.distance
+                matrix = element.ray_transfer_matrix() @ matrix
+                continue
+            if not isinstance(element, (Lens, Aperture)):
+                raise ValueError(f"Élément optique non pris en charge: {type(element).__name__}")
+            # Élément mince : la hauteur y est h = M[0] · rayon, comparée à la demi-ouverture
+            clip_z.append(z)
+            clip_rows.append(matrix[0])
+            clip_radii.append(element.clear_radius())
+            matrix = element.ray_transfer_matrix() @ matrix
+            plane_z.append(z)
+            plane_matrices.append(matrix)
+
+        self.length = z
+        self.system_matrix = matrix
+        self._plane_z = np.array(plane_z)
+        self._plane_matrices = np.array(plane_matrices)
+        self._clip_z = np.array(clip_z)
+        self._clip_rows = np.array(clip_rows).reshape(-1, 2).T  # Tableau (2, plans) : une colonne par diaphragme
+        self._clip_radii = np.array(clip_radii) * (1 + _CLIP_TOLERANCE)
+
+    def _blocked(self, rays):
+        """
+        Retourne le tableau (rayons, diaphragmes) des rayons arrêtés à chaque plan d'élément mince.
+        """
+        return np.abs(rays @ self._clip_rows) > self._clip_radii
+
+    def trace(self, rays):
+        """
+        Trace des rayons jusqu'au plan de sortie du train.
+
+        :param rays: Tableau (N, 2) des rayons au plan d'entrée (hauteur en mètres, pente).
+        :return: Tuple (rayons de sortie (N, 2), masque booléen (N,) des rayons transmis par toutes les ouvertures).
+        """
+        rays = np.asarray(rays, dtype=np.float64)
+        return rays @ self.system_matrix.T, ~self._blocked(rays).any(axis=1)
+
+    def blocking_positions(self, rays):
+        """
+        Retourne la position du diaphragme qui arrête chaque rayon.
+
+        :param rays: Tableau (N, 2) des rayons au plan d'entrée.
+        :return: Tableau (N,) des positions z (en mètres), np.inf pour les rayons transmis.
+        """
+        blocked = self._blocked(np.asarray(rays, dtype=np.float64))
+        if not len(self._clip_z):
+            return np.full(len(blocked), np.inf)
+        return np.where(blocked.any(axis=1), self._clip_z[np.argmax(blocked, axis=1)], np.inf)
+
+    def heights(self, rays, positions):
+        """
+        Calcule la hauteur des rayons à plusieurs positions le long de l'axe, en un seul produit matriciel.
+
+        La matrice du plan z est celle du dernier élément mince précédent, suivie d'un espace libre.
+        Les ouvertures ne sont pas appliquées (voir blocking_positions).
+
+        :param rays: Tableau (N, 2) des rayons au plan d'entrée.
+        :param positions: Positions z le long de l'axe (en mètres), de forme (S,).
+        :return: Tableau (N, S) des hauteurs (en mètres).
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        plane = np.searchsorted(self._plane_z, positions, side="right") - 1
+        matrices = self._plane_matrices[np.maximum(plane, 0)]
+        gaps = positions - self._plane_z[np.maximum(plane, 0)]
+        rows = matrices[:, 0, :] + gaps[:, None] * matrices[:, 1, :]  # Première ligne de S(gap) @ M
+        return np.asarray(rays, dtype=np.float64) @ rows.T
+
+    def effective_focal_length(self):
+        """
+        Retourne la focale effective du train (f = -1 / C).
+
+        :return: Focale (en mètres), np.inf pour un système afocal.
+        """
+        c = self.system_matrix[1, 0]
+        return -1.0 / c if c != 0 else np.inf
+
+    def back_focal_distance(self):
+        """
+        Retourne la distance entre le plan de sortie et le foyer image (-A / C).
+
+        :return: Distance (en mètres), np.inf pour un système afocal.
+        """
+        a, c = self.system_matrix[0, 0], self.system_matrix[1, 0]
+        return -a / c if c != 0 else np.inf
+
+    def _object_matrix(self, object_distance):
+        return self.system_matrix @ free_space_matrix(object_distance)
+
+    def image_distance(self, object_distance):
+        """
+        Retourne la distance entre le plan de sortie et l'image d'un objet placé devant le plan d'entrée.
+
+        :param object_distance: Distance entre l'objet et le plan d'entrée (en mètres).
+        :return: Distance de l'image (en mètres, négative pour une image virtuelle), np.inf à l'infini.
+        """
+        (_, b), (_, d) = self._object_matrix(object_distance)
+        return -b / d if d != 0 else np.inf
+
+    def magnification(self, object_distance):
+        """
+        Retourne le grandissement transversal de l'image d'un objet placé devant le plan d'entrée.
+
+        :param object_distance: Distance entre l'objet et le plan d'entrée (en mètres).
+        :return: Grandissement (négatif pour une image renversée).
+        """
+        (a, _), (c, _) = self._object_matrix(object_distance)
+        return a + self.image_distance(object_distance) * c
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     objective = Lens(focal_length=0.1, curvature_radius=0.1, refractive_index=1.5, aperture=0.02)
+#     eyepiece = Lens(focal_length=0.05, curvature_radius=0.05, refractive_index=1.5, aperture=0.01)
+#     train = OpticalTrain([objective, FreeSpace(0.12), Aperture(0.008), eyepiece])
+#     print("Focale effective:", train.effective_focal_length(), "Foyer image:", train.back_focal_distance())
+#     rays = np.column_stack([np.random.uniform(-0.01, 0.01, 1_000_000), np.zeros(1_000_000)])
+#     exit_rays, transmitted = train.trace(rays)
+#     print("Rayons transmis:", transmitted.mean())
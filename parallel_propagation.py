@@ -0,0 +1,255 @@
+import numpy as np
+
+from angular_spectrum import AngularSpectrumPropagator
+from coherence import mode_fields
+
+# Pools de processus persistants, indexés par nombre de processus (les caches des processus restent chauds)
+_process_pools = {}
+
+# Indice de l'histogramme partiel réservé au processus courant (attribué à son démarrage)
+_worker_slot = None
+
+
+class SharedArray:
+    """
+    Tableau numpy placé dans un segment de mémoire partagée (multiprocessing.shared_memory).
+
+    Seul son descripteur (nom du segment, forme, type) est transmis aux processus de calcul, qui
+    projettent le même segment en mémoire : le tableau n'est jamais copié ni sérialisé.
+    """
+
+    def __init__(self, shape, dtype=np.float64):
+        """
+        Initialise une instance de la classe SharedArray (contenu initialisé à zéro).
+
+        :param shape: Forme du tableau.
+        :param dtype: Type des éléments.
+        """
+        from multiprocessing import shared_memory
+
+        dtype = np.dtype(dtype)
+        shape = tuple(int(length) for length in shape)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        self.array[...] = 0
+        self.handle = (self.memory.name, shape, dtype.str)
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Crée un tableau partagé contenant une copie d'un tableau.
+
+        :param array: Tableau numpy.
+        :return: Instance de SharedArray.
+        """
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    def close(self):
+        """
+        Libère le segment de mémoire partagée (le tableau ne doit plus être utilisé).
+        """
+        self.array = None
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _init_worker(counter):
+    """
+    Initialise un processus de calcul : il se réserve un indice d'histogramme partiel.
+    """
+    global _worker_slot
+    with counter.get_lock():
+        _worker_slot = counter.value
+        counter.value += 1
+
+
+def get_process_pool(workers):
+    """
+    Retourne le pool persistant de processus de calcul pour un nombre de processus donné.
+
+    :param workers: Nombre de processus.
+    :return: Instance de ProcessPoolExecutor.
+    """
+    if workers not in _process_pools:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        counter = multiprocessing.Value("i", 0)
+        _process_pools[workers] = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(counter,)
+        )
+    return _process_pools[workers]
+
+
+def discard_process_pool(workers):
+    """
+    Retire et arrête le pool persistant d'un nombre de processus donné (par exemple après l'arrêt brutal
+    d'un de ses processus, qui le rend inutilisable) ; le prochain appel à get_process_pool en crée un neuf.
+
+    :param workers: Nombre de processus.
+    """
+    pool = _process_pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _call_with_arrays(function, handles, *args):
+    """
+    Exécute une tâche dans un processus de calcul sur des tableaux partagés, projetés le temps de la tâche.
+
+    :param function: Fonction de la tâche, appelée avec les tableaux puis args.
+    :param handles: Descripteurs des tableaux partagés (None pour un tableau absent).
+    :param args: Arguments de la tâche (petits : indices, longueurs d'onde, poids).
+    """
+    from multiprocessing import shared_memory
+
+    memories = [None if handle is None else shared_memory.SharedMemory(name=handle[0]) for handle in handles]
+    try:
+        arrays = [
+            None if memory is None else np.ndarray(handle[1], dtype=handle[2], buffer=memory.buf)
+            for memory, handle in zip(memories, handles)
+        ]
+        function(*arrays, *args)
+    finally:
+        # Les vues doivent être libérées avant de fermer les segments
+        arrays = None
+        for memory in memories:
+            if memory is None:
+                continue
+            try:
+                memory.close()
+            except BufferError:
+                # Une vue est encore référencée par la trace d'une exception : le segment sera libéré avec elle
+                pass
+
+
+def _run_round(pool, function, handles, tasks):
+    """
+    Soumet un tour de tâches au pool et attend qu'elles soient toutes terminées.
+    """
+    futures = [pool.submit(_call_with_arrays, function, handles, *task) for task in tasks]
+    for future in futures:
+        future.result()
+
+
+def _embed(field, size, offset):
+    """
+    Centre un champ N×N dans une grille complexe M×M bourrée de zéros.
+    """
+    n = field.shape[0]
+    embedded = np.zeros((size, size), dtype=np.complex128)
+    embedded[offset:offset + n, offset:offset + n] = field
+    return embedded
+
+
+def _propagate_unit(pupil, eigenvectors, partial_intensities, mode_y, mode_x, mode_weights, wavelengths, weights,
+                    pitch, distance, offset, chunk_length):
+    """
+    Tâche : propage un groupe de modes à un groupe de longueurs d'onde et accumule l'intensité dans
+    l'histogramme partiel du processus courant.
+    """
+    size = partial_intensities.shape[-1]
+    fields = pupil[None] if mode_y is None else mode_fields(eigenvectors, mode_y, mode_x, pupil)
+    propagator = AngularSpectrumPropagator()
+    for field, mode_weight in zip(fields, mode_weights):
+        propagator.accumulate_intensity(
+            partial_intensities[_worker_slot], _embed(field, size, offset), pitch, wavelengths, mode_weight * weights,
+            distance, chunk_length,
+        )
+
+
+def propagate_near_field(pupil, pitch, size, wavelengths, weights, distance, decomposition=None, workers=2,
+                         chunk_length=None):
+    """
+    Calcule l'intensité du champ proche (spectre angulaire) en répartissant le calcul sur un pool de processus.
+
+    La pupille, les modes propres et les intensités sont placés en mémoire partagée ; seuls des
+    descripteurs, des indices et des poids sont échangés. Le travail est découpé en groupes de modes
+    cohérents et en blocs de longueurs d'onde, chaque processus accumulant dans sa propre intensité
+    partielle (sommées sur place à la fin). Lorsqu'il y a moins de couples (mode, longueur d'onde)
+    que de processus, seuls ceux-ci travaillent. Si un processus est arrêté brutalement, le pool est
+    remplacé et le calcul relancé une fois.
+
+    :param pupil: Tableau N×N de la pupille.
+    :param pitch: Pas d'échantillonnage de la pupille (en mètres).
+    :param size: Taille M de la grille de calcul (pupille centrée).
+    :param wavelengths: Longueurs d'onde (en mètres).
+    :param weights: Poids des longueurs d'onde.
+    :param distance: Distance de propagation (en mètres).
+    :param decomposition: Instance de CoherentModeDecomposition (None pour une source cohérente).
+    :param workers: Nombre de processus.
+    :param chunk_length: Nombre de longueurs d'onde propagées par FFT batchée dans une tâche.
+    :return: Tableau M×M de l'intensité.
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    n = pupil.shape[0]
+    offset = (size - n) // 2
+    wavelengths = np.asarray(wavelengths, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    if decomposition is None:
+        eigenvectors, mode_y, mode_x, mode_weights = None, None, None, np.ones(1)
+    else:
+        eigenvectors, mode_y, mode_x, mode_weights = decomposition.mode_basis(n, pitch)
+
+    # Groupes d'au plus 8 modes, ou blocs de longueurs d'onde si les modes ne suffisent pas à occuper les processus
+    num_modes = len(mode_weights)
+    if num_modes >= workers:
+        mode_groups = np.array_split(np.arange(num_modes), max(workers, -(-num_modes // 8)))
+        wavelength_groups = [np.arange(len(wavelengths))]
+    else:
+        mode_groups = np.array_split(np.arange(num_modes), num_modes)
+        wavelength_groups = np.array_split(np.arange(len(wavelengths)), min(len(wavelengths), -(-workers // num_modes)))
+
+    tasks = []
+    for modes in mode_groups:
+        for bins in wavelength_groups:
+            selected_y = None if mode_y is None else mode_y[modes]
+            selected_x = None if mode_x is None else mode_x[modes]
+            tasks.append((
+                selected_y, selected_x, mode_weights[modes], wavelengths[bins], weights[bins], pitch, distance, offset,
+                chunk_length,
+            ))
+
+    with SharedArray.from_array(pupil) as shared_pupil, SharedArray((workers, size, size)) as partial_intensities:
+        shared_eigenvectors = None if eigenvectors is None else SharedArray.from_array(eigenvectors)
+        try:
+            handles = (
+                shared_pupil.handle,
+                None if shared_eigenvectors is None else shared_eigenvectors.handle,
+                partial_intensities.handle,
+            )
+            try:
+                _run_round(get_process_pool(workers), _propagate_unit, handles, tasks)
+            except BrokenProcessPool:
+                # Un processus a été arrêté brutalement : le pool est remplacé et les tâches relancées
+                discard_process_pool(workers)
+                partial_intensities.array[...] = 0
+                try:
+                    _run_round(get_process_pool(workers), _propagate_unit, handles, tasks)
+                except BrokenProcessPool:
+                    discard_process_pool(workers)
+                    raise
+            intensity = np.sum(partial_intensities.array, axis=0)
+        finally:
+            if shared_eigenvectors is not None:
+                shared_eigenvectors.close()
+    return intensity
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     from lens import Lens
+
+#     lens = Lens(focal_length=0.1, curvature_radius=0.01, refractive_index=1.5, aperture=2e-3)
+#     n = 512
+#     pupil = np.hypot(*np.mgrid[-1:1:n * 1j, -1:1:n * 1j]) <= 1
+#     intensity = propagate_near_field(pupil, lens.aperture / n, 2 * n, [550e-9], [1.0], distance=0.05, workers=8)
+#     print("Intensité maximale:", intensity.max())
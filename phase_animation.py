@@ -0,0 +1,178 @@
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Tampon circulaire préalloué d'images de même forme, indexées par leur numéro de trame.
+
+    La trame k occupe l'emplacement k % capacity : une trame plus récente remplace la plus ancienne
+    partageant son emplacement, sans allocation.
+    """
+
+    def __init__(self, capacity, shape, dtype=np.uint8):
+        """
+        Initialise une instance de la classe FrameRingBuffer.
+
+        :param capacity: Nombre maximal de trames conservées.
+        :param shape: Forme d'une trame.
+        :param dtype: Type des pixels.
+        """
+        if capacity <= 0:
+            raise ValueError("La capacité du tampon de trames doit être positive.")
+        self.frames = np.empty((capacity,) + tuple(shape), dtype=dtype)
+        self._keys = np.full(capacity, -1, dtype=np.int64)  # Numéro de la trame de chaque emplacement
+
+    def __len__(self):
+        return int(np.count_nonzero(self._keys >= 0))
+
+    @property
+    def capacity(self):
+        return len(self.frames)
+
+    def get(self, key):
+        """
+        Retourne la trame demandée si elle est encore dans le tampon.
+
+        :param key: Numéro de la trame.
+        :return: Vue sur la trame, ou None si elle a été remplacée ou jamais écrite.
+        """
+        slot = key % self.capacity
+        return self.frames[slot] if self._keys[slot] == key else None
+
+    def slot(self, key):
+        """
+        Réserve l'emplacement d'une trame et le retourne pour y écrire.
+
+        :param key: Numéro de la trame.
+        :return: Vue modifiable sur l'emplacement.
+        """
+        slot = key % self.capacity
+        self._keys[slot] = key
+        return self.frames[slot]
+
+    def clear(self):
+        """
+        Invalide toutes les trames (la mémoire reste allouée).
+        """
+        self._keys[:] = -1
+
+
+class PhaseAnimation:
+    """
+    Animation du champ complexe sur un cycle de phase : la trame de phase φ affiche Re(E e^{iφ}).
+
+    Le champ n'est calculé qu'une fois ; chaque trame n'est qu'une combinaison linéaire de ses parties
+    réelle et imaginaire, quantifiée en uint8 (128 pour un champ nul). Les trames affichées sont
+    conservées dans un tampon circulaire borné pour une lecture fluide.
+    """
+
+    def __init__(self, field, num_frames=60, initial_phase=0.0, capacity=None, max_bytes=256 * 1024 ** 2,
+                 max_side=None):
+        """
+        Initialise une instance de la classe PhaseAnimation.
+
+        Lorsque capacity n'est pas donné, le tampon contient le cycle entier : la lecture en boucle ne
+        recalcule alors aucune trame. Le champ est sous-échantillonné (un point sur s) à max_side points
+        par côté, puis davantage si le cycle ne tient pas dans max_bytes.
+
+        :param field: Champ complexe 2D.
+        :param num_frames: Nombre de trames par cycle de 2π.
+        :param initial_phase: Phase de la première trame (en radians), par exemple AdvancedOptions.phase_shift.
+        :param capacity: Nombre de trames conservées (par défaut, le cycle entier).
+        :param max_bytes: Mémoire maximale du tampon de trames lorsque capacity n'est pas donné.
+        :param max_side: Nombre maximal de points par côté des trames (par exemple la taille d'affichage ; None : pleine résolution).
+        """
+        field = np.asarray(field)
+        if field.ndim != 2:
+            raise ValueError("Le champ animé doit être un tableau 2D.")
+        if num_frames <= 0:
+            raise ValueError("Le nombre de trames doit être positif.")
+        self.num_frames = int(num_frames)
+        self.phase_step = 2 * np.pi / self.num_frames
+        self.phases = initial_phase + self.phase_step * np.arange(self.num_frames)
+        self.position = 0  # Numéro de la prochaine trame lue par next_frame
+
+        stride = 1 if max_side is None else max(1, -(-max(field.shape) // max(1, int(max_side))))
+        if capacity is None:
+            # Le cycle entier doit tenir dans max_bytes : un emplacement k % capacity réutilisé ne sert jamais en boucle
+            frame_bytes = max(1, max_bytes // self.num_frames)
+            while -(-field.shape[0] // stride) * -(-field.shape[1] // stride) > frame_bytes:
+                stride += 1
+            capacity = self.num_frames
+        field = field[::stride, ::stride]
+        self.stride = stride
+
+        # Parties réelle et imaginaire en simple précision : seule donnée conservée du champ
+        self._real = np.ascontiguousarray(field.real, dtype=np.float32)
+        self._imag = np.ascontiguousarray(field.imag, dtype=np.float32)
+        amplitude = float(np.abs(field).max()) if field.size else 0.0
+        self._scale = 127.5 / amplitude if amplitude > 0 else 0.0
+        self._scratch = np.empty(field.shape, dtype=np.float32)
+        self.buffer = FrameRingBuffer(min(capacity, self.num_frames), field.shape)
+
+    @property
+    def shape(self):
+        return self._real.shape
+
+    def render(self, index, out=None):
+        """
+        Calcule la trame d'indice donné, sans passer par le tampon circulaire.
+
+        :param index: Indice de la trame dans le cycle.
+        :param out: Tableau uint8 de destination (optionnel ; un tampon interne réutilisé sinon).
+        :return: Trame uint8.
+        """
+        phase = self.phases[index % self.num_frames]
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        # Re(E e^{iφ}) = Re(E) cos φ - Im(E) sin φ, ramené de [-A, A] à [0, 255]
+        scratch = self._scratch
+        np.multiply(self._real, np.float32(np.cos(phase) * self._scale), out=scratch)
+        scratch -= self._imag * np.float32(np.sin(phase) * self._scale)
+        scratch += np.float32(127.5)
+        np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(out, scratch, casting="unsafe")
+        return out
+
+    def frame(self, index):
+        """
+        Retourne la trame d'indice donné, depuis le tampon circulaire si elle y est encore.
+
+        :param index: Indice de la trame dans le cycle.
+        :return: Trame uint8 (vue sur le tampon, à ne pas modifier).
+        """
+        index %= self.num_frames
+        frame = self.buffer.get(index)
+        if frame is None:
+            frame = self.render(index, out=self.buffer.slot(index))
+        return frame
+
+    def next_frame(self):
+        """
+        Retourne la trame suivante de la lecture en boucle.
+
+        :return: Trame uint8.
+        """
+        frame = self.frame(self.position)
+        self.position = (self.position + 1) % self.num_frames
+        return frame
+
+    def iter_frames(self):
+        """
+        Parcourt un cycle complet en calculant chaque trame dans un même tampon (pour l'exportation en flux).
+
+        Chaque trame produite est écrasée par la suivante : elle doit être consommée (écrite) avant de continuer.
+
+        :return: Générateur de trames uint8.
+        """
+        out = np.empty(self.shape, dtype=np.uint8)
+        for index in range(self.num_frames):
+            yield self.render(index, out=out)
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     y, x = np.mgrid[-1:1:256j, -1:1:256j]
+#     animation = PhaseAnimation(np.exp(1j * 20 * np.hypot(x, y)), num_frames=60, max_side=128)
+#     for _ in range(120):
+#         frame = animation.next_frame()
+#     print("Trames en mémoire:", len(animation.buffer), "Forme:", frame.shape)
@@ -0,0 +1,252 @@
+import numpy as np
+
+# Nombre de photons tirés par bloc vectorisé (environ 100 Mo de mémoire de travail)
+CHUNK_PHOTONS = 1_000_000
+
+# État d'un processus de calcul : (échantillonneur, segment de mémoire partagée, histogrammes partiels)
+_worker_state = None
+
+
+def chunk_generator(seed, index):
+    """
+    Retourne le générateur aléatoire d'un bloc de photons.
+
+    Chaque bloc a sa propre graine, dérivée de la graine du tirage et du numéro du bloc : le résultat
+    ne dépend ni du nombre de processus ni de l'ordre dans lequel les blocs sont traités.
+
+    :param seed: Graine du tirage.
+    :param index: Numéro du bloc.
+    :return: Instance de numpy.random.Generator.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+class PhotonSampler:
+    """
+    Tirage Monte-Carlo de photons à travers la pupille, accumulés dans un histogramme de l'écran (champ lointain).
+
+    Chaque photon reçoit une longueur d'onde tirée selon le spectre, une direction tirée selon le noyau
+    de diffraction |P̂(f)|² de la pupille (sin θ = λ f) et, pour une source partiellement cohérente,
+    un point d'émission tiré sur la source étendue incohérente équivalente au modèle de Schell gaussien
+    (écart type λ z / (2π w), w étant la largeur de cohérence) dont l'écart à l'axe incline son onde
+    incidente. La position sur l'écran est x = L (λ f - x_s / z), dans l'approximation paraxiale des moteurs.
+    """
+
+    def __init__(self, kernel, frequencies, wavelengths, weights, screen_distance, coherence_width=None,
+                 source_distance=None):
+        """
+        Initialise une instance de la classe PhotonSampler.
+
+        :param kernel: Noyau de diffraction M×M (intensité du spectre de la pupille, centrée).
+        :param frequencies: Axe des fréquences spatiales du noyau (centré, en cycles par mètre).
+        :param wavelengths: Longueurs d'onde du spectre (en mètres).
+        :param weights: Poids des longueurs d'onde.
+        :param screen_distance: Distance entre la lentille et l'écran (en mètres).
+        :param coherence_width: Largeur de cohérence dans le plan de la pupille (en mètres ; None pour une source cohérente).
+        :param source_distance: Distance entre la source et la lentille (en mètres), requise si coherence_width est donnée.
+        """
+        if coherence_width is not None and not source_distance:
+            raise ValueError("La distance de la source est nécessaire pour une source partiellement cohérente.")
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        self.screen_distance = screen_distance
+        self.coherence_width = coherence_width
+        self.source_distance = source_distance
+        self._kernel_cdf = np.cumsum(np.asarray(kernel, dtype=np.float64).ravel())
+        self._wavelength_cdf = np.cumsum(np.asarray(weights, dtype=np.float64))
+
+        # Écran : même grille que l'intensité du moteur FFT (à la longueur d'onde moyenne du spectre)
+        reference = float(self.wavelengths @ np.asarray(weights) / self._wavelength_cdf[-1])
+        self.screen_axis = self.frequencies * reference * screen_distance
+        self._bin_width = self.screen_axis[1] - self.screen_axis[0]
+        self._first_edge = self.screen_axis[0] - self._bin_width / 2
+
+    @property
+    def shape(self):
+        return len(self.screen_axis), len(self.screen_axis)
+
+    @staticmethod
+    def _draw(cdf, uniform):
+        """
+        Tire des indices selon une distribution discrète donnée par sa fonction de répartition.
+        """
+        return np.searchsorted(cdf, uniform * cdf[-1], side="right")
+
+    def sample(self, rng, num_photons):
+        """
+        Tire un bloc de photons et retourne leurs positions sur l'écran.
+
+        :param rng: Instance de numpy.random.Generator.
+        :param num_photons: Nombre de photons.
+        :return: Tuple (x, y) des positions sur l'écran (en mètres).
+        """
+        wavelengths = self.wavelengths[self._draw(self._wavelength_cdf, rng.random(num_photons))]
+        rows, columns = np.divmod(self._draw(self._kernel_cdf, rng.random(num_photons)), len(self.frequencies))
+
+        # Direction uniforme dans la cellule du noyau : sin θ = λ f
+        step = self.frequencies[1] - self.frequencies[0]
+        x = wavelengths * (self.frequencies[columns] + step * (rng.random(num_photons) - 0.5))
+        y = wavelengths * (self.frequencies[rows] + step * (rng.random(num_photons) - 0.5))
+
+        if self.coherence_width is not None:
+            # Point d'émission sur la source étendue équivalente ; l'onde incidente est inclinée de -x_s / z
+            spread = wavelengths * self.source_distance / (2 * np.pi * self.coherence_width)
+            x -= rng.standard_normal(num_photons) * spread / self.source_distance
+            y -= rng.standard_normal(num_photons) * spread / self.source_distance
+        return x * self.screen_distance, y * self.screen_distance
+
+    def accumulate(self, counts, rng, num_photons):
+        """
+        Tire un bloc de photons et ajoute leurs impacts à un histogramme, sur place.
+
+        :param counts: Histogramme M×M (lignes selon y, colonnes selon x) à compléter, d'entiers.
+        :param rng: Instance de numpy.random.Generator.
+        :param num_photons: Nombre de photons.
+        """
+        size = len(self.screen_axis)
+        x, y = self.sample(rng, num_photons)
+        columns = np.floor((x - self._first_edge) / self._bin_width).astype(np.intp)
+        rows = np.floor((y - self._first_edge) / self._bin_width).astype(np.intp)
+        inside = (columns >= 0) & (columns < size) & (rows >= 0) & (rows < size)
+        bins = np.bincount(rows[inside] * size + columns[inside], minlength=size * size)
+        counts += bins.reshape(size, size)
+
+
+def _chunk_photons(index, chunk_size, max_photons):
+    """
+    Retourne le nombre de photons du bloc d'indice donné (le dernier bloc est tronqué à max_photons).
+    """
+    return min(chunk_size, max_photons - index * chunk_size)
+
+
+def _sample_chunks(sampler, counts, chunks, chunk_size, seed, max_photons):
+    """
+    Accumule une suite de blocs dans un histogramme partiel.
+    """
+    for index in chunks:
+        sampler.accumulate(counts, chunk_generator(seed, index), _chunk_photons(index, chunk_size, max_photons))
+
+
+def _attach_worker(sampler, memory_name, shape):
+    """
+    Initialise un processus de calcul : l'échantillonneur n'est transmis qu'une fois, les histogrammes
+    partiels sont projetés depuis la mémoire partagée.
+    """
+    from multiprocessing import shared_memory
+
+    global _worker_state
+    memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_state = (sampler, memory, np.ndarray(shape, dtype=np.int64, buffer=memory.buf))
+
+
+def _sample_slot(slot, chunks, chunk_size, seed, max_photons):
+    """
+    Accumule des blocs dans l'histogramme partiel d'indice slot (dans un processus de calcul).
+    """
+    sampler, _, partial_counts = _worker_state
+    _sample_chunks(sampler, partial_counts[slot], chunks, chunk_size, seed, max_photons)
+    return slot
+
+
+def run_photon_sampling(sampler, max_photons=10_000_000, target_noise=None, chunk_size=CHUNK_PHOTONS, seed=0,
+                        max_workers=1, chunks_per_round=1):
+    """
+    Tire des photons par blocs jusqu'à max_photons, ou jusqu'à ce que le bruit passe sous target_noise.
+
+    Les blocs sont tirés par tours : à chaque tour, chaque processus accumule chunks_per_round blocs dans
+    son propre histogramme partiel, placé en mémoire partagée (multiprocessing.shared_memory). Seuls des
+    numéros de blocs sont échangés ; les histogrammes partiels sont sommés sur place entre deux tours,
+    puis le bruit est estimé. Le bruit est l'écart type de Poisson de l'intensité normalisée au pic,
+    1 / √(nombre de photons du pic), qui majore celui de tous les autres points de l'histogramme.
+
+    :param sampler: Instance de PhotonSampler.
+    :param max_photons: Nombre maximal de photons tirés (le dernier bloc est tronqué pour ne pas le dépasser).
+    :param target_noise: Bruit visé sur l'intensité normalisée (optionnel ; arrêt anticipé une fois atteint).
+    :param chunk_size: Nombre de photons par bloc.
+    :param seed: Graine du tirage (les résultats sont reproductibles, quel que soit max_workers).
+    :param max_workers: Nombre de processus (1 : tirage dans le processus courant).
+    :param chunks_per_round: Nombre de blocs tirés par chaque processus entre deux estimations du bruit.
+    :return: Dictionnaire (counts, intensity, screen_x, screen_y, photons, noise, converged, history).
+    """
+    if chunk_size <= 0 or max_photons <= 0:
+        raise ValueError("Le nombre de photons et la taille des blocs doivent être positifs.")
+    max_photons = int(max_photons)
+    num_chunks = -(-max_photons // chunk_size)
+    max_workers = max(1, max_workers or 1)
+    shape = sampler.shape
+    total = np.zeros(shape, dtype=np.int64)
+    history = []  # Tuples (photons tirés, bruit) après chaque tour
+
+    memory = executor = None
+    if max_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+
+        stack_shape = (max_workers,) + shape
+        memory = shared_memory.SharedMemory(create=True, size=int(np.prod(stack_shape)) * 8)
+        partial_counts = np.ndarray(stack_shape, dtype=np.int64, buffer=memory.buf)
+    else:
+        partial_counts = np.zeros((1,) + shape, dtype=np.int64)
+    partial_counts[:] = 0
+
+    next_chunk = 0
+    noise = np.inf
+    try:
+        if memory is not None:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_attach_worker, initargs=(sampler, memory.name, stack_shape)
+            )
+        while next_chunk < num_chunks:
+            assignments = []
+            for slot in range(max_workers):
+                chunks = range(next_chunk, min(next_chunk + chunks_per_round, num_chunks))
+                next_chunk = chunks.stop
+                if len(chunks):
+                    assignments.append((slot, chunks))
+
+            if executor is None:
+                for slot, chunks in assignments:
+                    _sample_chunks(sampler, partial_counts[slot], chunks, chunk_size, seed, max_photons)
+            else:
+                futures = [
+                    executor.submit(_sample_slot, slot, chunks, chunk_size, seed, max_photons)
+                    for slot, chunks in assignments
+                ]
+                for future in futures:
+                    future.result()
+
+            # Fusion sur place des histogrammes partiels, puis estimation du bruit
+            np.sum(partial_counts, axis=0, out=total)
+            peak = total.max()
+            noise = 1 / np.sqrt(peak) if peak > 0 else np.inf
+            history.append((min(next_chunk * chunk_size, max_photons), noise))
+            if target_noise is not None and noise <= target_noise:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if memory is not None:
+            del partial_counts
+            memory.close()
+            memory.unlink()
+
+    peak = total.max()
+    return {
+        "counts": total,
+        "intensity": total / peak if peak > 0 else total.astype(np.float64),
+        "screen_x": sampler.screen_axis,
+        "screen_y": sampler.screen_axis,
+        "photons": min(next_chunk * chunk_size, max_photons),
+        "noise": noise,
+        "converged": target_noise is not None and noise <= target_noise,
+        "history": history,
+    }
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     y, x = np.mgrid[-32:32, -32:32]
+#     kernel = np.abs(np.fft.fftshift(np.fft.fft2(np.hypot(x, y) < 8, s=(128, 128)))) ** 2
+#     frequencies = np.fft.fftshift(np.fft.fftfreq(128, d=1e-4 / 64))
+#     sampler = PhotonSampler(kernel, frequencies, [550e-9], [1.0], screen_distance=1.0)
+#     result = run_photon_sampling(sampler, max_photons=5e7, target_noise=0.01, max_workers=4)
+#     print("Photons:", result["photons"], "Bruit:", result["noise"], "Convergé:", result["converged"])
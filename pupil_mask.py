@@ -0,0 +1,191 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# Formes de lentille prises en charge
+SHAPES = ("circular", "elliptical", "custom")
+
+
+def load_custom_mask(file_path):
+    """
+    Charge un masque personnalisé depuis un fichier tableau (.npy, .npz) ou image (PNG, JPEG...).
+
+    Les images sont lues avec matplotlib, importé uniquement dans ce cas. Un pixel est transparent
+    lorsque sa luminance (ou sa valeur) dépasse la moitié du maximum.
+
+    :param file_path: Chemin du fichier.
+    :return: Tableau 2D booléen (True là où la lumière passe).
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".npy":
+        values = np.load(file_path)
+    elif extension == ".npz":
+        with np.load(file_path) as archive:
+            values = archive[archive.files[0]]
+    else:
+        from matplotlib import image
+
+        values = image.imread(file_path)
+        if values.ndim == 3:
+            values = values[..., :3].mean(axis=2)
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2 or values.size == 0:
+        raise ValueError("Le masque personnalisé doit être un tableau 2D non vide.")
+    return values > values.max() / 2
+
+
+def _ellipse_quadrant(num_samples, pitch, semi_x, semi_y):
+    """
+    Échantillonne un quart d'ellipse centrée (lignes et colonnes d'indice >= num_samples // 2).
+    """
+    coords = (np.arange(num_samples // 2, num_samples) - (num_samples - 1) / 2) * pitch
+    return (coords[:, None] / semi_y) ** 2 + (coords[None, :] / semi_x) ** 2 <= 1
+
+
+def _mirror_quadrant(quadrant, num_samples):
+    """
+    Reconstruit un masque N×N symétrique par rapport aux deux axes à partir de son quart inférieur droit.
+    """
+    # Pour N impair, la ligne et la colonne centrales appartiennent au quart et ne sont pas dupliquées
+    skip = num_samples % 2
+    half = np.concatenate([quadrant[::-1, ::-1][:, :quadrant.shape[1] - skip], quadrant[::-1]], axis=1)
+    lower = np.concatenate([quadrant[:, ::-1][:, :quadrant.shape[1] - skip], quadrant], axis=1)
+    return np.concatenate([half[:half.shape[0] - skip], lower], axis=0)
+
+
+def _resample_mask(mask, num_samples):
+    """
+    Rééchantillonne un masque personnalisé (au plus proche voisin) sur la grille N×N de la pupille.
+    """
+    rows = (np.arange(num_samples) * mask.shape[0]) // num_samples
+    columns = (np.arange(num_samples) * mask.shape[1]) // num_samples
+    return mask[rows[:, None], columns[None, :]]
+
+
+class PupilMaskCache:
+    """
+    Cache LRU des masques de pupille, stockés sous forme compacte (bits empaquetés).
+
+    Les formes symétriques (cercle, ellipse) ne stockent qu'un quart du masque. Le dernier masque
+    demandé est aussi conservé déplié : des calculs répétés avec la même lentille ne régénèrent ni
+    ne réallouent le masque.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        """
+        Initialise une instance de la classe PupilMaskCache.
+
+        :param max_bytes: Taille maximale des masques compacts conservés (en octets).
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # Clé -> (bits empaquetés, forme du tableau stocké, symétrique)
+        self._bytes = 0
+        self._last_key = None
+        self._last_mask = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, num_samples, build):
+        """
+        Retourne le masque associé à une clé, en le construisant si nécessaire.
+
+        :param key: Clé hashable (paramètres de forme, taille de grille, pas).
+        :param num_samples: Nombre d'échantillons par côté du masque (N).
+        :param build: Fonction sans argument retournant (tableau booléen, symétrique), le tableau étant
+                      le quart inférieur droit du masque si symétrique, le masque complet sinon.
+        :return: Masque N×N booléen, en lecture seule.
+        """
+        if key == self._last_key:
+            self.hits += 1
+            return self._last_mask
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            packed, shape, symmetric = entry
+            stored = np.unpackbits(packed, count=shape[0] * shape[1]).reshape(shape).astype(bool)
+        else:
+            self.misses += 1
+            stored, symmetric = build()
+            packed = np.packbits(stored)
+            self._entries[key] = (packed, stored.shape, symmetric)
+            self._bytes += packed.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+        mask = _mirror_quadrant(stored, num_samples) if symmetric else stored
+        mask.setflags(write=False)
+        self._last_key = key
+        self._last_mask = mask
+        return mask
+
+    def clear(self):
+        """
+        Vide le cache.
+        """
+        self._entries.clear()
+        self._bytes = 0
+        self._last_key = None
+        self._last_mask = None
+
+    def stats(self):
+        """
+        Retourne les statistiques du cache.
+
+        :return: Dictionnaire (entries, bytes, hits, misses).
+        """
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+# Cache partagé par tous les moteurs
+pupil_mask_cache = PupilMaskCache()
+
+
+def pupil_mask(lens, num_samples, pitch, cache=None):
+    """
+    Génère le masque de la pupille de la lentille sur une grille N×N centrée.
+
+    - "circular" : disque de diamètre lens.aperture ;
+    - "elliptical" : ellipse de largeur lens.aperture et de hauteur lens.aperture * lens.aspect_ratio ;
+    - "custom" : masque chargé depuis lens.mask_file, étiré sur un carré de côté lens.aperture.
+
+    :param lens: Instance de Lens.
+    :param num_samples: Nombre d'échantillons par côté (N).
+    :param pitch: Pas d'échantillonnage (en mètres).
+    :param cache: Instance de PupilMaskCache (par défaut, le cache partagé).
+    :return: Masque N×N booléen, en lecture seule.
+    """
+    cache = pupil_mask_cache if cache is None else cache
+    shape = lens.shape
+    if shape not in SHAPES:
+        raise ValueError(f"Forme de lentille inconnue : {shape}.")
+
+    if shape == "custom":
+        if not lens.mask_file:
+            raise ValueError("Une lentille de forme personnalisée nécessite un fichier de masque.")
+        # La date de modification invalide le masque lorsque le fichier change
+        key = (shape, lens.aperture, lens.mask_file, os.path.getmtime(lens.mask_file), num_samples, pitch)
+        return cache.get(
+            key, num_samples, lambda: (_resample_mask(load_custom_mask(lens.mask_file), num_samples), False)
+        )
+
+    aspect_ratio = lens.aspect_ratio if shape == "elliptical" else 1.0
+    if not 0 < aspect_ratio <= 1:
+        raise ValueError("Le rapport d'aspect d'une lentille elliptique doit être compris entre 0 et 1.")
+    key = (shape, lens.aperture, aspect_ratio, num_samples, pitch)
+    semi_x = lens.aperture / 2
+    return cache.get(
+        key, num_samples, lambda: (_ellipse_quadrant(num_samples, pitch, semi_x, semi_x * aspect_ratio), True)
+    )
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     from lens import Lens
+
+#     lens = Lens(focal_length=0.1, curvature_radius=0.01, refractive_index=1.5, shape="elliptical", aspect_ratio=0.5)
+#     mask = pupil_mask(lens, num_samples=512, pitch=lens.aperture / 512)
+#     print("Fraction transparente:", mask.mean(), "Cache:", pupil_mask_cache.stats())
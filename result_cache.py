@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+from diffraction_pattern import ENGINE_VERSION
+from exporter import Exporter
+
+
+# Fichier témoin d'un répertoire de version créé par ResultCache (seuls ceux-ci sont supprimés)
+VERSION_MARKER = ".result_cache_version"
+
+
+def default_cache_directory():
+    """
+    Retourne le répertoire de cache par défaut de l'utilisateur ($XDG_CACHE_HOME ou ~/.cache).
+
+    :return: Chemin du répertoire.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "diffraction_simulation")
+
+
+def config_key(config):
+    """
+    Calcule une clé stable (SHA-256) d'une configuration : JSON canonique, clés triées.
+
+    :param config: Dictionnaire de configuration (valeurs JSON ou tableaux numpy).
+    :return: Chaîne hexadécimale.
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=lambda value: value.tolist())
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache disque des résultats de simulation, adressé par le contenu de la configuration.
+
+    Chaque entrée est un répertoire de fichiers .npy (relus avec mmap_mode='r', sans copie) et d'un
+    fichier metadata.json, écrits par Exporter.export_data_as_npy. Les entrées sont écrites dans un
+    répertoire temporaire puis renommées : plusieurs processus peuvent partager le cache sans jamais
+    lire une entrée incomplète. Les entrées sont rangées par version des moteurs, dans le
+    sous-répertoire versions/ ; les versions précédentes sont supprimées à l'ouverture. Au-delà de max_bytes, les entrées les moins récemment
+    utilisées sont évincées.
+    """
+
+    def __init__(self, directory=None, max_bytes=1024 ** 3, engine_version=ENGINE_VERSION):
+        """
+        Initialise une instance de la classe ResultCache.
+
+        :param directory: Répertoire du cache (par défaut, default_cache_directory()).
+        :param max_bytes: Taille maximale du cache sur disque (en octets).
+        :param engine_version: Version des moteurs de calcul dont les résultats sont conservés.
+        """
+        self.root = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+        versions = os.path.join(self.root, "versions")
+        self.directory = os.path.join(versions, f"v{int(engine_version)}")
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        open(os.path.join(self.directory, VERSION_MARKER), "a").close()
+
+        # Invalidation : les résultats des autres versions des moteurs ne sont plus valides. Seuls les
+        # répertoires v<entier> portant le fichier témoin sont supprimés, jamais ceux d'un autre programme.
+        for name in os.listdir(versions):
+            path = os.path.join(versions, name)
+            if (
+                name != os.path.basename(self.directory)
+                and re.fullmatch(r"v\d+", name)
+                and os.path.isfile(os.path.join(path, VERSION_MARKER))
+            ):
+                self._discard(path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """
+        Retourne les données d'une entrée, ou None si elle est absente.
+
+        :param key: Clé retournée par config_key.
+        :return: Dictionnaire (tableaux projetés en mémoire en lecture seule et métadonnées), ou None.
+        """
+        path = self._entry_path(key)
+        metadata_path = os.path.join(path, "metadata.json")
+        try:
+            with open(metadata_path, "r") as metadata_file:
+                data = json.load(metadata_file)
+            for name in data.pop("arrays"):
+                data[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            self._touch(metadata_path)
+        except (OSError, ValueError, KeyError):
+            # Entrée absente, ou évincée par un autre processus pendant la lecture
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """
+        Enregistre une entrée de manière atomique, puis évince les entrées les plus anciennes si nécessaire.
+
+        :param key: Clé retournée par config_key.
+        :param data: Dictionnaire de tableaux et de valeurs JSON.
+        """
+        path = self._entry_path(key)
+        temporary = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Exporter.export_data_as_npy(data, temporary)
+            self._touch(os.path.join(temporary, "metadata.json"))
+            os.rename(temporary, path)
+        except OSError:
+            # Un autre processus a déjà enregistré la même entrée (la sienne est conservée), ou le disque est plein
+            self._discard(temporary)
+            return
+        self.evict()
+
+    def entries(self):
+        """
+        Retourne les entrées du cache, de la moins récemment utilisée à la plus récente.
+
+        :return: Liste de tuples (date du dernier accès, taille en octets, chemin).
+        """
+        entries = []
+        for prefix in os.listdir(self.directory):
+            prefix_path = os.path.join(self.directory, prefix)
+            if prefix.startswith(".") or not os.path.isdir(prefix_path):
+                continue
+            for key in os.listdir(prefix_path):
+                path = os.path.join(prefix_path, key)
+                try:
+                    accessed = os.stat(os.path.join(path, "metadata.json")).st_mtime_ns
+                    size = sum(entry.stat().st_size for entry in os.scandir(path))
+                except OSError:
+                    continue
+                entries.append((accessed, size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """
+        Évince les entrées les moins récemment utilisées jusqu'à ce que le cache tienne dans max_bytes.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    def clear(self):
+        """
+        Supprime toutes les entrées du cache.
+        """
+        for _, _, path in self.entries():
+            self._discard(path)
+
+    def stats(self):
+        """
+        Retourne les statistiques du cache.
+
+        :return: Dictionnaire (entries, bytes, hits, misses).
+        """
+        entries = self.entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @staticmethod
+    def _touch(metadata_path):
+        """
+        Marque une entrée comme utilisée : la date de modification de ses métadonnées sert de date de dernier
+        accès pour l'éviction (fixée explicitement, l'horloge du système de fichiers étant trop grossière).
+        """
+        now = time.time_ns()
+        os.utime(metadata_path, ns=(now, now))
+
+    def _discard(self, path):
+        """
+        Supprime un répertoire après l'avoir renommé : les lecteurs ne voient jamais une entrée à moitié supprimée.
+        """
+        trash = os.path.join(os.path.dirname(path), f".trash-{uuid.uuid4().hex}")
+        try:
+            os.rename(path, trash)
+        except OSError:
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     cache = ResultCache("/tmp/diffraction_cache", max_bytes=64 * 1024 ** 2)
+#     key = config_key({"lens": {"aperture": 0.01}, "engine": "fft"})
+#     if cache.get(key) is None:
+#         cache.put(key, {"normalized_intensity": np.ones((4, 4)), "active_engine": "fft"})
+#     print(cache.get(key)["normalized_intensity"].shape, cache.stats())
@@ -1,11 +1,54 @@
-from diffraction_pattern import DiffractionPattern
-from wave_front import Wavefront
+import copy
+import os
+from functools import partial
+
+import numpy as np
+
+from advanced_options import AdvancedOptions
+from diffraction_pattern import DEFAULT_ORDERS, ENGINE_VERSION, DiffractionPattern, compute_order_positions
+from instrumentation import instrumentation, instrumented
+from lens import Lens
+from light_source import LightSource
+from optical_train import FreeSpace, OpticalTrain
+from phase_animation import PhaseAnimation
+from result_cache import config_key
+from wave_front import Wavefront, WavefrontBundle
 
 class Simulation:
     """
     Gère l'ensemble du processus de simulation de diffraction, y compris les composants optiques et les calculs physiques.
     """
 
+    # Nombre de rayons de l'éventail traversant la lentille
+    FAN_RAYS = 64
+
+    # Raffinement progressif : chaque niveau divise la taille de grille du suivant, jusqu'à une taille minimale
+    PROGRESSIVE_FACTOR = 4
+    PROGRESSIVE_MIN_SIZE = 16
+
+    # Étapes du calcul : celles du motif de diffraction, puis les fronts d'onde
+    STAGES = DiffractionPattern.STAGES + ("wavefronts",)
+
+    # Étapes invalidées par chaque paramètre ; les étapes du motif situées en aval sont aussi recalculées
+    PARAMETER_STAGES = {
+        "aperture": ("pupil", "wavefronts"),
+        "shape": ("pupil",),
+        "aspect_ratio": ("pupil",),
+        "mask_file": ("pupil",),
+        "focal_length": ("wavefronts",),
+        "curvature_radius": ("wavefronts",),
+        "refractive_index": ("wavefronts",),
+        "wavelength": ("field",),
+        "spectrum": ("field",),
+        "coherence": ("field",),
+        "advanced_options": ("field",),
+        "intensity": ("intensity",),
+        "screen_distance": ("screen", "wavefronts"),
+        "position": ("wavefronts",),
+        "source_distance": ("wavefronts",),
+        "optical_train": ("wavefronts",),
+    }
+
     def __init__(self):
         """
         Initialise une instance de la simulation avec des composants par défaut.
@@ -13,19 +56,54 @@ class Simulation:
         self.lens = None
         self.light_source = None
         self.diffraction_pattern = None
+        self.source_distance = None
+        self.optical_train = None  # Éléments traversés depuis la source (par défaut, la lentille à source_distance)
+        self.advanced_options = AdvancedOptions()
         self.wavefronts = []
+        self.last_stages = ()  # Étapes recalculées lors du dernier calcul
+        self.result_cache = None  # Instance de ResultCache (optionnel) consultée avant de calculer le champ
+        self._parameters = None  # Paramètres utilisés lors du dernier calcul
 
-    def configure_components(self, lens, light_source, screen_distance):
+    def configure_components(self, lens, light_source, screen_distance, source_distance=None, **pattern_options):
         """
         Configure les composants de la simulation.
 
         :param lens: Instance de la classe Lens.
         :param light_source: Instance de la classe LightSource.
         :param screen_distance: Distance entre la lentille et l'écran d'observation (en mètres).
+        :param source_distance: Distance entre la source et la lentille (en mètres). Par défaut, la moitié de screen_distance.
+        :param pattern_options: Options du moteur transmises à DiffractionPattern (engine, grid_size, padding, ...).
         """
         self.lens = lens
         self.light_source = light_source
-        self.diffraction_pattern = DiffractionPattern(screen_distance)
+        self.diffraction_pattern = DiffractionPattern(screen_distance, **pattern_options)
+        self.source_distance = source_distance if source_distance is not None else screen_distance / 2
+        self._parameters = None
+
+    @classmethod
+    def from_config(cls, config, **pattern_options):
+        """
+        Crée une simulation configurée à partir d'un dictionnaire au format de default_config.json.
+
+        La section "simulation" peut aussi contenir source_distance et les options du moteur
+        (engine, grid_size, padding) ; une section "advanced_options" optionnelle suit le format
+        de AdvancedOptions.get_advanced_settings. Les pattern_options donnés ici sont prioritaires.
+
+        :param config: Dictionnaire de configuration.
+        :param pattern_options: Options du moteur transmises à DiffractionPattern.
+        :return: Instance de Simulation prête à être lancée.
+        """
+        settings = dict(config["simulation"])
+        screen_distance = settings.pop("screen_distance")
+        source_distance = settings.pop("source_distance", None)
+        settings.update({key: value for key, value in pattern_options.items() if value is not None})
+
+        simulation = cls()
+        simulation.configure_components(
+            Lens(**config["lens"]), LightSource(**config["light_source"]), screen_distance, source_distance, **settings
+        )
+        simulation.advanced_options.apply_settings(config.get("advanced_options", {}))
+        return simulation
 
     def start_simulation(self):
         """
@@ -34,15 +112,212 @@ class Simulation:
         if not self.lens or not self.light_source:
             raise ValueError("La lentille et la source lumineuse doivent être configurées avant de lancer la simulation.")
 
-        # Calcul du motif de diffraction
-        self.diffraction_pattern.calculate_pattern(self.light_source, self.lens)
+        self._recompute(self.STAGES)
+
+    def _current_parameters(self):
+        """
+        Retourne les paramètres dont dépendent les étapes du calcul (voir PARAMETER_STAGES).
+        """
+        parameters = dict(self.lens.get_lens_profile())
+        parameters.update(self.light_source.propagate())
+        parameters["position"] = tuple(np.ravel(parameters["position"]))
+        parameters["advanced_options"] = self.advanced_options.get_advanced_settings()
+        parameters["screen_distance"] = self.diffraction_pattern.screen_distance
+        parameters["source_distance"] = self.source_distance
+        parameters["optical_train"] = (
+            None if self.optical_train is None
+            else tuple((type(element).__name__, tuple(sorted(vars(element).items()))) for element in self.optical_train)
+        )
+        return parameters
+
+    def build_optical_train(self):
+        """
+        Construit le train optique traversé par les rayons, dont le plan d'entrée est celui de la source.
+
+        Sans éléments configurés (optical_train), le train est la lentille placée à source_distance.
+
+        :return: Instance de OpticalTrain.
+        """
+        elements = self.optical_train
+        if elements is None:
+            elements = [FreeSpace(self.source_distance), self.lens]
+        return OpticalTrain(elements)
+
+    def optical_properties(self):
+        """
+        Retourne les grandeurs paraxiales du train optique, déduites de sa matrice de transfert (sans calcul du champ).
+
+        :return: Dictionnaire (effective_focal_length, back_focal_distance, image_distance, magnification),
+                 les deux dernières pour un objet placé à la source.
+        """
+        if not self.lens or not self.light_source:
+            raise ValueError("La lentille et la source lumineuse doivent être configurées avant de lancer la simulation.")
+        train = self.build_optical_train()
+        return {
+            "effective_focal_length": train.effective_focal_length(),
+            "back_focal_distance": train.back_focal_distance(),
+            "image_distance": train.image_distance(0.0),
+            "magnification": train.magnification(0.0),
+        }
 
-        # Génération des fronts d'onde
+    def cache_config(self):
+        """
+        Retourne la configuration dont dépend l'étape "field", servant de clé au cache des résultats.
+
+        Seuls les paramètres lus par l'étape "field" y figurent : géométrie de la pupille, spectre,
+        cohérence, position de la source sur l'axe ou non (choix du moteur), distance de l'écran,
+        options du moteur et des fentes, date de modification du masque personnalisé et version des
+        moteurs. L'intensité, la position, la focale ou le rayon de courbure ne changent pas la clé.
+
+        :return: Dictionnaire sérialisable en JSON.
+        """
+        pattern = self.diffraction_pattern
+        lens_profile = self.lens.get_lens_profile()
+        lens = {name: lens_profile[name] for name in ("shape", "aperture", "aspect_ratio", "mask_file")}
+        if lens["mask_file"]:
+            lens["mask_mtime"] = os.path.getmtime(lens["mask_file"])
+        light = self.light_source.propagate()
+        options = self.advanced_options.get_advanced_settings()
+        del options["phase_shift"]
+        return {
+            "lens": lens,
+            "light_source": {
+                "wavelength": light["wavelength"],
+                "spectrum": light["spectrum"],
+                "coherence": light["coherence"],
+                "on_axis": bool(np.ravel(self.light_source.position)[1] == 0),
+            },
+            "simulation": {
+                "screen_distance": pattern.screen_distance,
+                "engine": pattern.engine,
+                "grid_size": pattern.grid_size,
+                "padding": pattern.padding,
+            },
+            "advanced_options": options,
+            "engine_version": ENGINE_VERSION,
+        }
+
+    def _recompute(self, stages):
+        """
+        Recalcule les étapes données, ainsi que les étapes du motif situées en aval.
+
+        :param stages: Ensemble de noms d'étapes (voir STAGES).
+        """
+        parameters = self._current_parameters()
+        pattern_stages = [stage for stage in DiffractionPattern.STAGES if stage in stages]
+        if pattern_stages:
+            start = pattern_stages[0]
+            key = None
+            if self.result_cache is not None and start in ("pupil", "field"):
+                # Les résultats de l'étape "field" sont repris du cache disque s'ils y sont
+                key = config_key(self.cache_config())
+                state = self.result_cache.get(key)
+                if state is not None:
+                    if start == "pupil":
+                        # L'étape "pupil" n'est pas rejouée : la pupille de l'ancienne lentille est périmée
+                        self.diffraction_pattern.pupil = None
+                    self.diffraction_pattern.restore_field_state(
+                        state, self.light_source, self.lens, self.advanced_options
+                    )
+                    start, key = "intensity", None
+
+            # Calcul du motif de diffraction
+            self.diffraction_pattern.run_stages(self.light_source, self.lens, self.advanced_options, start=start)
+            if key is not None:
+                self.result_cache.put(key, self.diffraction_pattern.field_state())
+            pattern_stages = DiffractionPattern.STAGES[DiffractionPattern.STAGES.index(start):]
+        if "wavefronts" in stages:
+            self._build_wavefronts()
+
+        self.last_stages = tuple(pattern_stages) + (("wavefronts",) if "wavefronts" in stages else ())
+        self._parameters = parameters
+
+    @instrumented("simulation.wavefronts")
+    def _build_wavefronts(self):
+        """
+        Étape "wavefronts" : génère le front d'onde sur l'axe et l'éventail de rayons traversant le train optique.
+        """
         self.wavefronts.clear()
         wavefront = Wavefront(origin=self.light_source.position, angle=0, phase=0)
         wavefront.propagate(self.diffraction_pattern.screen_distance)
         self.wavefronts.append(wavefront)
 
+        # Éventail de rayons remplissant l'ouverture, pour visualiser l'effet de la courbure de la lentille
+        half_angle = np.arctan(self.lens.aperture / 2 / self.source_distance)
+        bundle = WavefrontBundle.fan(self.light_source.position, half_angle, self.FAN_RAYS)
+        train = self.build_optical_train()
+        bundle.trace(train, max(train.length, self.source_distance) + self.diffraction_pattern.screen_distance)
+        self.wavefronts.append(bundle)
+
+    @staticmethod
+    def sweep(wavelengths, screen_distances, apertures, focal_lengths, mode="spots", intensity=1.0,
+              orders=DEFAULT_ORDERS, engine="auto", grid_size=256, padding=2, max_workers=None, chunk_size=32):
+        """
+        Évalue un balayage de configurations (longueur d'onde, distance, ouverture, focale) en un seul appel.
+
+        Les tableaux de paramètres sont combinés par diffusion numpy ; le résultat a la forme diffusée.
+        En mode "spots", les positions et intensités des ordres sont calculées analytiquement par diffusion.
+        En mode "field", chaque configuration calcule son champ 2D et en résume les statistiques ; les
+        configurations sont réparties par blocs sur un ProcessPoolExecutor lorsque max_workers > 1.
+
+        Les moteurs de champ modélisent la lentille par sa seule pupille : la focale ne modifie aucun
+        résultat, elle est seulement reportée dans chaque enregistrement pour repérer la configuration.
+
+        :param wavelengths: Longueur(s) d'onde (en mètres).
+        :param screen_distances: Distance(s) lentille-écran (en mètres).
+        :param apertures: Ouverture(s) de la lentille (en mètres).
+        :param focal_lengths: Longueur(s) focale(s) (en mètres), sans effet sur les résultats (voir ci-dessus).
+        :param mode: "spots" (analytique) ou "field" (champ 2D).
+        :param intensity: Intensité de la source (de 0 à 1).
+        :param orders: Ordres de diffraction calculés en mode "spots".
+        :param engine: Moteur de DiffractionPattern utilisé en mode "field" (tout moteur de champ, pas "analytic").
+        :param grid_size: Taille de grille utilisée en mode "field".
+        :param padding: Facteur de bourrage utilisé en mode "field".
+        :param max_workers: Nombre de processus en mode "field" (None ou 1 : calcul dans le processus courant).
+        :param chunk_size: Nombre de configurations par tâche envoyée aux processus.
+        :return: Tableau structuré numpy, un enregistrement par configuration.
+        """
+        params = np.broadcast_arrays(
+            *(np.asarray(p, dtype=np.float64) for p in (wavelengths, screen_distances, apertures, focal_lengths))
+        )
+        shape = params[0].shape
+        wavelengths, screen_distances, apertures, focal_lengths = (p.ravel() for p in params)
+        orders = np.asarray(orders)
+
+        if mode == "spots":
+            result = np.empty(len(wavelengths), dtype=_sweep_dtype(mode, len(orders)))
+            positions = compute_order_positions(wavelengths, apertures, screen_distances, orders)
+            result["positions"] = positions
+            result["intensities"] = np.where(np.isnan(positions), np.nan, intensity * np.cos(np.pi * orders) ** 2)
+        elif mode == "field":
+            if engine == "analytic":
+                raise ValueError("Le moteur analytique ne calcule pas de champ : il ne peut pas servir au mode \"field\".")
+            result = np.empty(len(wavelengths), dtype=_sweep_dtype(mode))
+            configs = np.stack([wavelengths, screen_distances, apertures, focal_lengths], axis=1)
+            chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+            compute_chunk = partial(
+                _sweep_field_chunk, intensity=intensity, engine=engine, grid_size=grid_size, padding=padding
+            )
+
+            if max_workers is None or max_workers <= 1 or len(chunks) <= 1:
+                stats = [compute_chunk(chunk) for chunk in chunks]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    stats = list(executor.map(compute_chunk, chunks))
+
+            stats = np.concatenate(stats) if stats else np.empty((0, 3))
+            result["peak"], result["power"], result["central_radius"] = stats.T
+        else:
+            raise ValueError(f"Mode de balayage inconnu : {mode}.")
+
+        result["wavelength"] = wavelengths
+        result["screen_distance"] = screen_distances
+        result["aperture"] = apertures
+        result["focal_length"] = focal_lengths
+        return result.reshape(shape)
+
     def reset_simulation(self):
         """
         Réinitialise la simulation à son état initial.
@@ -51,14 +326,40 @@ class Simulation:
         self.light_source = None
         self.diffraction_pattern = None
         self.wavefronts.clear()
+        self._parameters = None
 
-    def update_parameters(self, lens=None, light_source=None, screen_distance=None):
+    def update_parameters(self, lens=None, light_source=None, screen_distance=None, source_distance=None):
         """
-        Met à jour les paramètres de la simulation et recalcule les résultats.
+        Met à jour les paramètres de la simulation et ne recalcule que les étapes qui en dépendent.
+
+        Les paramètres sont comparés à ceux du dernier calcul : par exemple, un changement d'intensité
+        ne fait que remettre à l'échelle le champ, et un changement de distance en champ lointain ne
+        fait que remettre à l'échelle les axes de l'écran. Les étapes recalculées sont dans last_stages.
+
+        :param lens: Nouvelle instance de Lens (optionnel).
+        :param light_source: Nouvelle instance de LightSource (optionnel).
+        :param screen_distance: Nouvelle distance entre la lentille et l'écran (optionnel).
+        :param source_distance: Nouvelle distance entre la source et la lentille (optionnel).
+        """
+        for _ in self.iter_update(lens, light_source, screen_distance, source_distance, progressive=False):
+            pass
+
+    def iter_update(self, lens=None, light_source=None, screen_distance=None, source_distance=None,
+                    progressive=True):
+        """
+        Met à jour les paramètres comme update_parameters, en produisant des résultats de plus en plus fins.
+
+        Lorsque le champ doit être recalculé, il l'est d'abord sur des grilles réduites (voir
+        refinement_levels), puis à la taille configurée ; la simulation est produite après chaque niveau
+        et reflète alors le niveau qui vient d'être calculé. Fermer le générateur avant la fin (paramètres
+        modifiés entre-temps) annule le raffinement : le calcul suivant repartira de zéro.
 
         :param lens: Nouvelle instance de Lens (optionnel).
         :param light_source: Nouvelle instance de LightSource (optionnel).
         :param screen_distance: Nouvelle distance entre la lentille et l'écran (optionnel).
+        :param source_distance: Nouvelle distance entre la source et la lentille (optionnel).
+        :param progressive: Calcule les niveaux grossiers avant la taille configurée.
+        :return: Générateur produisant la simulation après chaque niveau.
         """
         if lens:
             self.lens = lens
@@ -66,28 +367,192 @@ class Simulation:
             self.light_source = light_source
         if screen_distance and self.diffraction_pattern:
             self.diffraction_pattern.screen_distance = screen_distance
+        if source_distance:
+            self.source_distance = source_distance
+        if not self.lens or not self.light_source:
+            raise ValueError("La lentille et la source lumineuse doivent être configurées avant de lancer la simulation.")
+
+        stages = set(self.STAGES) if self._parameters is None else self._dirty_stages()
+        pattern = self.diffraction_pattern
+        if not progressive or not stages & {"pupil", "field"}:
+            self._recompute(stages)
+            yield self
+            return
+
+        grid_size = pattern.grid_size
+        completed = False
+        try:
+            for level in self.refinement_levels(grid_size):
+                pattern.grid_size = level
+                self._recompute(stages | {"field"})
+                # Les fronts d'onde ne dépendent pas de la taille de grille : ils ne sont calculés qu'une fois
+                stages -= {"wavefronts"}
+                completed = level == grid_size
+                yield self
+        finally:
+            pattern.grid_size = grid_size
+            if not completed:
+                # Le champ d'un niveau intermédiaire ne doit pas servir de base au calcul incrémental suivant
+                self._parameters = None
+
+    def refinement_levels(self, grid_size):
+        """
+        Retourne les tailles de grille successives du raffinement progressif, jusqu'à grid_size inclus.
+
+        Chaque niveau divise la taille du suivant par PROGRESSIVE_FACTOR, tant qu'elle reste au moins
+        égale à PROGRESSIVE_MIN_SIZE.
+
+        :param grid_size: Taille de grille finale.
+        :return: Liste croissante de tailles de grille.
+        """
+        levels = [grid_size]
+        while levels[0] // self.PROGRESSIVE_FACTOR >= self.PROGRESSIVE_MIN_SIZE:
+            levels.insert(0, levels[0] // self.PROGRESSIVE_FACTOR)
+        return levels
+
+    def _dirty_stages(self):
+        """
+        Compare les paramètres actuels à ceux du dernier calcul et retourne les étapes à recalculer.
+        """
+        parameters = self._current_parameters()
+        changed = [key for key, value in parameters.items() if value != self._parameters.get(key)]
+        stages = {stage for key in changed for stage in self.PARAMETER_STAGES.get(key, self.STAGES)}
+        pattern = self.diffraction_pattern
+        if "screen_distance" in changed and pattern.field_depends_on_distance(self.light_source, self.lens):
+            stages.add("field")
+        elif pattern.engine_changed(self.light_source, self.lens):
+            # Par exemple, une source décalée de l'axe ne permet plus d'utiliser le moteur de Hankel
+            stages.add("field")
+        return stages
+
+    def phase_animation(self, num_frames=60, capacity=None, max_side=None):
+        """
+        Prépare l'animation de phase du champ complexe sur l'écran (voir PhaseAnimation).
+
+        Le champ complexe est calculé une seule fois ; la première trame a la phase AdvancedOptions.phase_shift.
+
+        :param num_frames: Nombre de trames par cycle de 2π.
+        :param capacity: Nombre de trames conservées en mémoire (par défaut, le cycle entier dans une limite de mémoire).
+        :param max_side: Nombre maximal de points par côté des trames (par exemple la taille d'affichage).
+        :return: Instance de PhaseAnimation.
+        """
+        if not self.lens or not self.light_source:
+            raise ValueError("La lentille et la source lumineuse doivent être configurées avant de lancer la simulation.")
+        field, _ = self.diffraction_pattern.compute_complex_field(self.light_source, self.lens, self.advanced_options)
+        return PhaseAnimation(
+            field, num_frames, initial_phase=self.advanced_options.phase_shift, capacity=capacity, max_side=max_side
+        )
+
+    def sample_photons(self, max_photons=10_000_000, target_noise=None, seed=0, max_workers=1, **sampling_options):
+        """
+        Calcule l'intensité sur l'écran par tirage Monte-Carlo de photons (voir DiffractionPattern.sample_photons).
+
+        :param max_photons: Nombre maximal de photons tirés.
+        :param target_noise: Bruit visé sur l'intensité normalisée (optionnel ; arrêt anticipé une fois atteint).
+        :param seed: Graine du tirage.
+        :param max_workers: Nombre de processus.
+        :param sampling_options: Autres options de run_photon_sampling (chunk_size, chunks_per_round).
+        :return: Dictionnaire (counts, intensity, screen_x, screen_y, photons, noise, converged, history).
+        """
+        if not self.lens or not self.light_source:
+            raise ValueError("La lentille et la source lumineuse doivent être configurées avant de lancer la simulation.")
+        return self.diffraction_pattern.sample_photons(
+            self.light_source, self.lens, self.advanced_options, self.source_distance, max_photons=max_photons,
+            target_noise=target_noise, seed=seed, max_workers=max_workers, **sampling_options
+        )
+
+    @staticmethod
+    def stats():
+        """
+        Retourne les mesures par étape (durée, nombre d'appels, pic mémoire) de la simulation, de l'exportateur et du canvas.
+
+        Les mesures ne sont enregistrées qu'après instrumentation.enable() ; le registre est partagé par
+        toutes les simulations du processus.
+
+        :return: Dictionnaire nom de l'étape -> (calls, total_s, mean_s, max_s, peak_bytes).
+        """
+        return instrumentation.stats()
+
+    def snapshot(self):
+        """
+        Retourne une copie superficielle de la simulation, que les mises à jour suivantes ne modifient pas.
 
-        # Recalculer la simulation
-        self.start_simulation()
+        Les étapes remplacent leurs résultats au lieu de les modifier sur place : les tableaux sont partagés sans copie.
 
-    def export_data(self):
+        :return: Instance de Simulation.
+        """
+        snapshot = copy.copy(self)
+        snapshot.diffraction_pattern = copy.copy(self.diffraction_pattern)
+        snapshot.wavefronts = list(self.wavefronts)
+        return snapshot
+
+    def export_data(self, include_field=False):
         """
         Exporte les données de la simulation (motif de diffraction et fronts d'onde).
 
+        Les fronts d'onde sont retournés sous forme de tableaux numpy (convertis par l'exportateur).
+
+        :param include_field: Inclut la carte d'intensité et ses axes (pour les formats binaires).
         :return: Dictionnaire contenant les données exportées.
         """
-        return {
+        data = {
             "lens_profile": self.lens.get_lens_profile() if self.lens else None,
             "light_source": self.light_source.propagate() if self.light_source else None,
             "diffraction_pattern": self.diffraction_pattern.display_pattern() if self.diffraction_pattern else None,
+            "field_statistics": self.diffraction_pattern.field_statistics() if self.diffraction_pattern else None,
             "wavefronts": [wavefront.draw() for wavefront in self.wavefronts],
         }
+        pattern = self.diffraction_pattern
+        if include_field and pattern is not None and pattern.radial_profile is not None:
+            data["radial_profile"] = pattern.radial_profile
+            data["radial_positions"] = pattern.radial_positions
+        if include_field and pattern is not None and pattern.intensity_map is not None:
+            data["intensity_map"] = pattern.intensity_map
+            data["screen_x"] = pattern.screen_x
+            data["screen_y"] = pattern.screen_y
+        return data
+
+def _sweep_dtype(mode, num_orders=0):
+    """
+    Retourne le type structuré des résultats de Simulation.sweep.
+    """
+    fields = [
+        ("wavelength", np.float64),
+        ("screen_distance", np.float64),
+        ("aperture", np.float64),
+        ("focal_length", np.float64),
+    ]
+    if mode == "spots":
+        fields += [("positions", np.float64, (num_orders,)), ("intensities", np.float64, (num_orders,))]
+    else:
+        fields += [("peak", np.float64), ("power", np.float64), ("central_radius", np.float64)]
+    return np.dtype(fields)
+
+
+def _sweep_field_chunk(configs, intensity, engine, grid_size, padding):
+    """
+    Calcule les statistiques du champ 2D d'un bloc de configurations (exécuté éventuellement dans un processus fils).
+
+    :param configs: Tableau (n, 4) des configurations (longueur d'onde, distance, ouverture, focale).
+    :return: Tableau (n, 3) des statistiques (peak, power, central_radius).
+    """
+    stats = np.empty((len(configs), 3))
+    for i, (wavelength, screen_distance, aperture, focal_length) in enumerate(configs):
+        # Rayon de courbure déduit de la focale pour un indice de 1.5 (f = R / (n - 1))
+        lens = Lens(focal_length, curvature_radius=focal_length * 0.5, refractive_index=1.5, aperture=aperture)
+        light_source = LightSource(wavelength=wavelength, intensity=intensity)
+        pattern = DiffractionPattern(screen_distance, engine=engine, grid_size=grid_size, padding=padding)
+        pattern.calculate_pattern(light_source, lens)
+        field_stats = pattern.field_statistics()
+        stats[i] = (field_stats["peak"], field_stats["power"], field_stats["central_radius"])
+    return stats
 
 # Exemple d'utilisation
 # if __name__ == "__main__":
 #     from lens import Lens
 #     from light_source import LightSource
-#     from diffraction_pattern import DiffractionPattern
+#     from advanced_options import AdvancedOptions
+#     from diffraction_pattern import DEFAULT_ORDERS, DiffractionPattern, compute_order_positions
 #     from wavefront import Wavefront
 
 #     # Configuration de la simulation
@@ -101,3 +566,12 @@ class Simulation:
 #     # Exportation des résultats
 #     results = simulation.export_data()
 #     print("Résultats de la simulation:", results)
+
+#     # Balayage de paramètres
+#     sweep = Simulation.sweep(
+#         wavelengths=np.linspace(400e-9, 700e-9, 31)[:, None],
+#         screen_distances=1.0,
+#         apertures=np.linspace(1e-3, 1e-2, 10)[None, :],
+#         focal_lengths=0.1,
+#     )
+#     print("Positions du premier ordre:", sweep["positions"][..., 11])
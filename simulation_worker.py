@@ -0,0 +1,189 @@
+import copy
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from simulation import Simulation
+
+
+class _JobSignals(QObject):
+    """
+    Signaux émis par une tâche de simulation (un QRunnable ne peut pas porter de signaux).
+    """
+
+    finished = pyqtSignal(int, object)
+    progress = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _SimulationJob(QRunnable):
+    """
+    Tâche exécutant une simulation hors du thread de l'interface.
+
+    La simulation est partagée entre les tâches successives (exécutées une à une) : seules les
+    étapes dépendant des paramètres modifiés sont recalculées, et un instantané est livré. Lorsque
+    le champ est recalculé, un instantané est aussi livré après chaque niveau grossier ; la tâche
+    s'arrête entre deux niveaux si elle devient obsolète.
+    """
+
+    def __init__(self, simulation, generation, parameters, cancel_event, progressive=True, animate=False):
+        super().__init__()
+        self.simulation = simulation
+        self.generation = generation
+        self.parameters = parameters
+        self.cancel_event = cancel_event
+        self.progressive = progressive
+        self.animate = animate
+        self.signals = _JobSignals()
+
+    def run(self):
+        # Une tâche devenue obsolète avant son démarrage n'est pas exécutée
+        if self.cancel_event.is_set():
+            self.signals.finished.emit(self.generation, None)
+            return
+        try:
+            lens, light_source, screen_distance, options = self.parameters
+            simulation = self.simulation
+            if simulation.diffraction_pattern is None:
+                simulation.configure_components(lens, light_source, screen_distance)
+            if options is not None:
+                simulation.advanced_options = options
+            grid_size = simulation.diffraction_pattern.grid_size
+            stream = simulation.iter_update(
+                lens, light_source, screen_distance, source_distance=screen_distance / 2, progressive=self.progressive
+            )
+            for result in stream:
+                if result.diffraction_pattern.grid_size == grid_size:
+                    break
+                self.signals.progress.emit(self.generation, self._deliverable(result, self.animate))
+                if self.cancel_event.is_set():
+                    stream.close()
+                    self.signals.finished.emit(self.generation, None)
+                    return
+            stream.close()
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, self._deliverable(simulation, self.animate))
+
+    @staticmethod
+    def _deliverable(simulation, animate=False):
+        """
+        Prépare dans le thread de travail tout ce que l'interface lit du résultat, puis en retourne un instantané.
+
+        L'image 2D du moteur de Hankel (développée à la première lecture de intensity_map) et, pendant
+        une animation, le champ complexe (conservé dans complex_field) sont calculés ici plutôt que
+        dans le thread de l'interface.
+        """
+        pattern = simulation.diffraction_pattern
+        if pattern is not None:
+            pattern.intensity_map
+            if animate:
+                try:
+                    pattern.compute_complex_field(simulation.light_source, simulation.lens, simulation.advanced_options)
+                except ValueError:
+                    # Configuration sans champ complexe : l'interface signale l'erreur en préparant l'animation
+                    pass
+        return simulation.snapshot()
+
+
+class SimulationWorker(QObject):
+    """
+    Exécute les simulations dans un thread de travail, en regroupant les demandes rapprochées.
+
+    Chaque demande annule la précédente ; seule la plus récente est calculée puis livrée. Les
+    résultats intermédiaires du raffinement progressif sont livrés par partial_ready.
+    """
+
+    result_ready = pyqtSignal(object)
+    partial_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, debounce_ms=50, progressive=True, result_cache=None, parent=None):
+        """
+        Initialise une instance de la classe SimulationWorker.
+
+        :param debounce_ms: Délai de regroupement des demandes successives (en millisecondes).
+        :param progressive: Livre des résultats grossiers avant le résultat à la taille configurée.
+        :param result_cache: Instance de ResultCache consultée avant chaque calcul du champ (optionnel).
+        :param parent: QObject parent (optionnel).
+        """
+        super().__init__(parent)
+        self.progressive = progressive
+        self.animate = False  # Calcule aussi le champ complexe de chaque résultat (animation de phase en cours)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._launch)
+
+        self._simulation = Simulation()  # Utilisée uniquement par le thread de travail
+        self._simulation.result_cache = result_cache
+        self._generation = 0
+        self._pending = None
+        self._cancel_event = threading.Event()
+        self._jobs = {}
+
+    def request(self, lens, light_source, screen_distance, options=None):
+        """
+        Demande une nouvelle simulation ; les demandes précédentes non livrées sont abandonnées.
+
+        :param lens: Instance de Lens.
+        :param light_source: Instance de LightSource.
+        :param screen_distance: Distance entre la lentille et l'écran (en mètres).
+        :param options: Instance de AdvancedOptions (copiée pour ne pas être partagée entre threads).
+        """
+        self.cancel()
+        self._pending = (lens, light_source, screen_distance, copy.deepcopy(options))
+        self._timer.start()
+
+    def cancel(self):
+        """
+        Annule la demande en attente et rend obsolète la simulation en cours.
+        """
+        self._timer.stop()
+        self._pending = None
+        self._generation += 1
+        self._cancel_event.set()
+
+    def wait(self, timeout_ms=-1):
+        """
+        Attend la fin des tâches en cours (utile à la fermeture de l'application).
+
+        :param timeout_ms: Délai maximal d'attente (en millisecondes), -1 pour attendre indéfiniment.
+        :return: True si toutes les tâches sont terminées.
+        """
+        return self._pool.waitForDone(timeout_ms)
+
+    def _launch(self):
+        if self._pending is None:
+            return
+        self._cancel_event = threading.Event()
+        job = _SimulationJob(
+            self._simulation, self._generation, self._pending, self._cancel_event, self.progressive, self.animate
+        )
+        self._pending = None
+
+        # Les signaux sont reçus dans le thread de l'interface (connexion mise en file d'attente)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.progress.connect(self._on_progress)
+        job.signals.failed.connect(self._on_failed)
+        job.setAutoDelete(False)
+        self._jobs[job.generation] = job
+        self._pool.start(job)
+
+    def _on_finished(self, generation, simulation):
+        self._jobs.pop(generation, None)
+        if simulation is not None and generation == self._generation:
+            self.result_ready.emit(simulation)
+
+    def _on_progress(self, generation, simulation):
+        if generation == self._generation:
+            self.partial_ready.emit(simulation)
+
+    def _on_failed(self, generation, message):
+        self._jobs.pop(generation, None)
+        if generation == self._generation:
+            self.error.emit(message)
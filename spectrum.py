@@ -0,0 +1,149 @@
+import numpy as np
+
+# Constantes physiques (SI)
+PLANCK_CONSTANT = 6.62607015e-34
+SPEED_OF_LIGHT = 299792458.0
+BOLTZMANN_CONSTANT = 1.380649e-23
+
+
+class Spectrum:
+    """
+    Représente le spectre d'une source lumineuse sous forme de K longueurs d'onde pondérées.
+    """
+
+    def __init__(self, wavelengths, weights=None):
+        """
+        Initialise une instance de la classe Spectrum.
+
+        :param wavelengths: Longueurs d'onde des K intervalles (en mètres).
+        :param weights: Poids relatifs de chaque longueur d'onde (normalisés à une somme de 1). Par défaut, uniformes.
+        """
+        wavelengths = np.atleast_1d(np.asarray(wavelengths, dtype=np.float64))
+        if weights is None:
+            weights = np.ones_like(wavelengths)
+        weights = np.atleast_1d(np.asarray(weights, dtype=np.float64))
+
+        if wavelengths.ndim != 1 or wavelengths.shape != weights.shape or len(wavelengths) == 0:
+            raise ValueError("Les longueurs d'onde et les poids doivent être deux listes non vides de même taille.")
+        if np.any(wavelengths <= 0):
+            raise ValueError("La longueur d'onde doit être positive.")
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("Les poids du spectre doivent être positifs et non tous nuls.")
+
+        self.wavelengths = wavelengths
+        self.weights = weights / weights.sum()
+
+    def __len__(self):
+        return len(self.wavelengths)
+
+    @property
+    def mean_wavelength(self):
+        """
+        Longueur d'onde moyenne pondérée du spectre (en mètres).
+        """
+        return float(np.dot(self.weights, self.wavelengths))
+
+    @classmethod
+    def monochromatic(cls, wavelength):
+        """
+        Crée un spectre à une seule longueur d'onde.
+
+        :param wavelength: Longueur d'onde (en mètres).
+        :return: Instance de Spectrum.
+        """
+        return cls([wavelength], [1.0])
+
+    @classmethod
+    def blackbody(cls, temperature, wavelength_min=380e-9, wavelength_max=780e-9, bins=32):
+        """
+        Échantillonne la loi de Planck d'un corps noir sur K intervalles.
+
+        :param temperature: Température du corps noir (en kelvins).
+        :param wavelength_min: Borne inférieure du domaine spectral (en mètres).
+        :param wavelength_max: Borne supérieure du domaine spectral (en mètres).
+        :param bins: Nombre d'intervalles K.
+        :return: Instance de Spectrum.
+        """
+        if temperature <= 0:
+            raise ValueError("La température du corps noir doit être positive.")
+        wavelengths = _bin_centers(wavelength_min, wavelength_max, bins)
+        exponent = PLANCK_CONSTANT * SPEED_OF_LIGHT / (wavelengths * BOLTZMANN_CONSTANT * temperature)
+        radiance = 1.0 / (wavelengths ** 5 * np.expm1(exponent))
+        return cls(wavelengths, radiance)
+
+    @classmethod
+    def led(cls, center_wavelength, fwhm, bins=32, span=3.0):
+        """
+        Échantillonne un spectre de LED modélisé par une gaussienne sur K intervalles.
+
+        :param center_wavelength: Longueur d'onde centrale (en mètres).
+        :param fwhm: Largeur à mi-hauteur du spectre (en mètres).
+        :param bins: Nombre d'intervalles K.
+        :param span: Largeur du domaine échantillonné, en multiples de la largeur à mi-hauteur.
+        :return: Instance de Spectrum.
+        """
+        if fwhm <= 0:
+            raise ValueError("La largeur à mi-hauteur doit être positive.")
+        half_span = span * fwhm / 2
+        wavelengths = _bin_centers(center_wavelength - half_span, center_wavelength + half_span, bins)
+        sigma = fwhm / (2 * np.sqrt(2 * np.log(2)))
+        return cls(wavelengths, np.exp(-0.5 * ((wavelengths - center_wavelength) / sigma) ** 2))
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Crée un spectre à partir d'un dictionnaire de configuration.
+
+        Formats acceptés : {"wavelengths": [...], "weights": [...]},
+        {"type": "blackbody", "temperature": ..., ...} ou {"type": "led", "center_wavelength": ..., "fwhm": ..., ...}.
+
+        :param config: Dictionnaire de configuration du spectre.
+        :return: Instance de Spectrum.
+        """
+        config = dict(config)
+        spectrum_type = config.pop("type", "discrete")
+        if spectrum_type == "discrete":
+            return cls(config["wavelengths"], config.get("weights"))
+        if spectrum_type == "blackbody":
+            return cls.blackbody(**config)
+        if spectrum_type == "led":
+            return cls.led(**config)
+        raise ValueError(f"Type de spectre inconnu : {spectrum_type}.")
+
+    def to_dict(self):
+        """
+        Retourne le spectre sous forme de dictionnaire sérialisable.
+
+        :return: Dictionnaire {"wavelengths": [...], "weights": [...]}.
+        """
+        return {"wavelengths": self.wavelengths.tolist(), "weights": self.weights.tolist()}
+
+    def chunks(self, chunk_size):
+        """
+        Itère sur le spectre par blocs de longueurs d'onde.
+
+        :param chunk_size: Nombre maximal de longueurs d'onde par bloc.
+        :return: Générateur de tuples (longueurs d'onde, poids).
+        """
+        chunk_size = max(1, int(chunk_size))
+        for start in range(0, len(self), chunk_size):
+            yield self.wavelengths[start:start + chunk_size], self.weights[start:start + chunk_size]
+
+
+def _bin_centers(start, stop, bins):
+    """
+    Retourne les centres de K intervalles réguliers entre start et stop.
+    """
+    if bins < 1 or stop <= start or start <= 0:
+        raise ValueError("Le domaine spectral ou le nombre d'intervalles est invalide.")
+    edges = np.linspace(start, stop, int(bins) + 1)
+    return (edges[:-1] + edges[1:]) / 2
+
+# Exemple d'utilisation
+# if __name__ == "__main__":
+#     sun = Spectrum.blackbody(temperature=5800, bins=64)
+#     led = Spectrum.led(center_wavelength=630e-9, fwhm=20e-9, bins=16)
+
+#     print("Longueur d'onde moyenne (soleil):", sun.mean_wavelength)
+#     for wavelengths, weights in led.chunks(4):
+#         print(wavelengths, weights)
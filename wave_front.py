@@ -16,7 +16,7 @@ class Wavefront:
         self.origin = origin
         self.angle = angle
         self.phase = phase
-        self.propagation_path = []  # Liste des points suivis par le front d'onde
+        self.propagation_path = np.empty((0, 2))  # Tableau (n, 2) des points suivis par le front d'onde
 
     def propagate(self, distance, step_size=0.01):
         """
@@ -26,18 +26,18 @@ class Wavefront:
         :param step_size: Taille des pas de simulation (en mètres).
         """
         num_steps = int(distance / step_size)
-        x, y = self.origin
+        steps = step_size * np.arange(1, num_steps + 1)
 
-        for _ in range(num_steps):
-            x += step_size * np.cos(self.angle)
-            y += step_size * np.sin(self.angle)
-            self.propagation_path.append((x, y))
+        path = np.empty((num_steps, 2))
+        path[:, 0] = self.origin[0] + steps * np.cos(self.angle)
+        path[:, 1] = self.origin[1] + steps * np.sin(self.angle)
+        self.propagation_path = path
 
     def draw(self):
         """
-        Génère une représentation textuelle du chemin du front d'onde.
+        Génère une représentation du chemin du front d'onde.
 
-        :return: Liste des points visités par le front d'onde.
+        :return: Tableau (n, 2) des points visités par le front d'onde.
         """
         return self.propagation_path
 
@@ -49,6 +49,114 @@ class Wavefront:
         """
         self.phase = (self.phase + increment) % (2 * np.pi)
 
+
+class WavefrontBundle:
+    """
+    Représente un faisceau de fronts d'onde (éventail d'angles) propagés ensemble sous forme de tableau 2D.
+    """
+
+    def __init__(self, origin=(0, 0), angles=(0.0,), phase=0.0):
+        """
+        Initialise une instance de la classe WavefrontBundle.
+
+        :param origin: Point d'origine commun des fronts d'onde (x, y en mètres).
+        :param angles: Angles de propagation des fronts d'onde (en radians).
+        :param phase: Phase initiale commune (en radians).
+        """
+        self.origin = origin
+        self.angles = np.asarray(angles, dtype=np.float64)
+        self.phase = phase
+        self.paths = np.empty((len(self.angles), 0, 2))  # Tableau (rayons, pas, 2) des chemins
+
+    @classmethod
+    def fan(cls, origin, half_angle, num_rays, phase=0.0):
+        """
+        Crée un éventail de fronts d'onde répartis uniformément entre -half_angle et +half_angle.
+
+        :param origin: Point d'origine commun (x, y en mètres).
+        :param half_angle: Demi-angle d'ouverture de l'éventail (en radians).
+        :param num_rays: Nombre de fronts d'onde.
+        :param phase: Phase initiale commune (en radians).
+        :return: Instance de WavefrontBundle.
+        """
+        return cls(origin, np.linspace(-half_angle, half_angle, num_rays), phase)
+
+    def __len__(self):
+        return len(self.angles)
+
+    def propagate(self, distance, step_size=0.01, lens=None, lens_distance=None):
+        """
+        Propage tous les fronts d'onde en une seule opération vectorisée, le long de l'axe x.
+
+        Si une lentille est fournie, elle est traitée comme une lentille mince placée à lens_distance
+        de l'origine : la pente de chaque rayon y devient tan(θ) - h / f, h étant sa hauteur sur la lentille.
+
+        :param distance: Distance totale de propagation le long de l'axe (en mètres).
+        :param step_size: Taille des pas de simulation (en mètres).
+        :param lens: Instance de Lens (optionnel).
+        :param lens_distance: Distance entre l'origine et la lentille (en mètres).
+        """
+        num_steps = int(distance / step_size)
+        steps = step_size * np.arange(1, num_steps + 1)
+        x0, y0 = self.origin
+
+        slopes = np.tan(self.angles)[:, None]
+        heights = steps[None, :] * slopes
+
+        if lens is not None and lens_distance is not None:
+            after_lens = steps > lens_distance
+            lens_heights = lens_distance * slopes
+            refracted_slopes = slopes - lens_heights / lens.focal_length
+            heights[:, after_lens] = lens_heights + (steps[after_lens] - lens_distance) * refracted_slopes
+
+        paths = np.empty((len(self.angles), num_steps, 2))
+        paths[:, :, 0] = x0 + steps
+        paths[:, :, 1] = y0 + heights
+        self.paths = paths
+
+    def trace(self, train, distance, step_size=0.01):
+        """
+        Propage tous les fronts d'onde à travers un train optique, par ses matrices de transfert précomposées.
+
+        Le plan d'entrée du train est à l'origine du faisceau ; les hauteurs sont mesurées depuis l'axe
+        optique (y = 0). Un rayon arrêté par une ouverture reste à sa position d'arrêt pour la suite du chemin.
+
+        :param train: Instance de OpticalTrain.
+        :param distance: Distance totale de propagation le long de l'axe (en mètres).
+        :param step_size: Taille des pas de simulation (en mètres).
+        """
+        num_steps = int(distance / step_size)
+        steps = step_size * np.arange(1, num_steps + 1)
+        x0, y0 = self.origin
+
+        rays = np.column_stack([np.full(len(self.angles), float(y0)), np.tan(self.angles)])
+        heights = train.heights(rays, steps)
+
+        # Chaque rayon arrêté répète son dernier point avant le diaphragme
+        last_step = np.searchsorted(steps, train.blocking_positions(rays), side="right") - 1
+        indices = np.minimum(np.arange(num_steps)[None, :], np.maximum(last_step, 0)[:, None])
+
+        paths = np.empty((len(self.angles), num_steps, 2))
+        paths[:, :, 0] = x0 + steps[indices]
+        paths[:, :, 1] = np.take_along_axis(heights, indices, axis=1)
+        self.paths = paths
+
+    def draw(self):
+        """
+        Génère une représentation des chemins des fronts d'onde.
+
+        :return: Tableau (rayons, pas, 2) des points visités.
+        """
+        return self.paths
+
+    def update_phase(self, increment):
+        """
+        Met à jour la phase commune des fronts d'onde.
+
+        :param increment: Incrément à ajouter à la phase actuelle (en radians).
+        """
+        self.phase = (self.phase + increment) % (2 * np.pi)
+
 # Exemple d'utilisation
 # if __name__ == "__main__":
 #     # Création d'un front d'onde